@@ -0,0 +1,165 @@
+# answer_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+# ---------------------------
+# Paths & settings
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+ANSWER_CACHE_FILE = BASE_DIR / "RAG_data" / "answer_cache.sqlite"
+
+# Cosine similarity two (normalized) query embeddings need to share an answer
+ANSWER_CACHE_THRESHOLD = float(os.environ.get("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_TTL_S = float(os.environ.get("ANSWER_CACHE_TTL_S", str(7 * 24 * 3600)))
+ANSWER_CACHE_MAX_ENTRIES = int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+
+
+def answer_scope(results, **params) -> str:
+    """
+    Cache partition for an answer: retrieved College+Branch set plus filters.
+
+    Two queries only share an answer when retrieval handed the LLM the same
+    colleges under the same settings, so a paraphrase can never pick up an
+    answer written for different context.
+
+    Args:
+        results (pd.DataFrame): search_colleges output (College, Branch columns).
+        **params: Filters / generation settings (max_rank, min_package, max_tokens, ...).
+
+    Returns:
+        str: Hex digest identifying the scope.
+    """
+    pairs = sorted({f"{c}|{b}" for c, b in zip(results["College"], results["Branch"])})
+    payload = json.dumps({"pairs": pairs, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------
+# Persistent semantic cache
+# ---------------------------
+class SemanticAnswerCache:
+    """
+    LLM answers looked up by nearest query embedding within a scope.
+
+    Stored in SQLite (WAL) next to the embedding cache so every worker
+    process shares it and it survives restarts. Entries expire after
+    `ttl_s` seconds; beyond `max_entries` the least recently used go first.
+    """
+
+    def __init__(self, path=ANSWER_CACHE_FILE, threshold: float = ANSWER_CACHE_THRESHOLD,
+                 ttl_s: float = ANSWER_CACHE_TTL_S, max_entries: int = ANSWER_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "id INTEGER PRIMARY KEY, scope TEXT NOT NULL, query TEXT NOT NULL, "
+                "vector BLOB NOT NULL, answer TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS answers_scope ON answers (scope, created)")
+            conn.execute("CREATE INDEX IF NOT EXISTS answers_lru ON answers (last_used)")
+            self._conn = conn
+        return self._conn
+
+    def lookup(self, query_vec: np.ndarray, scope: str):
+        """
+        Best cached answer for a query in this scope, or None.
+
+        Args:
+            query_vec (np.ndarray): Normalized query embedding.
+            scope (str): Key from `answer_scope`.
+
+        Returns:
+            str | None: Cached answer if the nearest past query is within the threshold.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT id, vector, answer FROM answers WHERE scope = ? AND created >= ?",
+                (scope, now - self.ttl_s),
+            ).fetchall()
+            if not rows:
+                return None
+
+            vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob, _ in rows])
+            scores = vectors @ np.asarray(query_vec, dtype=np.float32).ravel()
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            entry_id, _, answer = rows[best]
+            conn.execute("UPDATE answers SET last_used = ? WHERE id = ?", (now, entry_id))
+            conn.commit()
+            return answer
+
+    def put(self, query: str, query_vec: np.ndarray, scope: str, answer: str):
+        """Store an answer, then drop expired and least recently used entries."""
+        now = time.time()
+        blob = np.asarray(query_vec, dtype=np.float32).ravel().tobytes()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO answers (scope, query, vector, answer, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, query, blob, answer, now, now),
+            )
+            conn.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl_s,))
+            conn.execute(
+                "DELETE FROM answers WHERE id IN ("
+                "SELECT id FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+
+@st.cache_resource(show_spinner=False)
+def get_answer_cache() -> SemanticAnswerCache:
+    """One cache handle per process."""
+    return SemanticAnswerCache()
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    import tempfile
+
+    import pandas as pd
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticAnswerCache(Path(tmp) / "answers.sqlite", threshold=0.9, max_entries=2)
+        results = pd.DataFrame({"College": ["RVCE", "BMSCE"], "Branch": ["CSE", "CSE"]})
+        scope = answer_scope(results, max_rank=10000, min_package=5.0)
+
+        rng = np.random.default_rng(0)
+        vec = rng.standard_normal(8).astype(np.float32)
+        vec /= np.linalg.norm(vec)
+        near = vec + 0.05 * rng.standard_normal(8).astype(np.float32)
+        near /= np.linalg.norm(near)
+
+        cache.put("best CSE colleges under 10k", vec, scope, "💡 Answer:\nRVCE, BMSCE")
+        print("Paraphrase hit:", cache.lookup(near, scope))
+        print("Other scope:", cache.lookup(near, answer_scope(results, max_rank=5000, min_package=5.0)))
+        print("Opposite query:", cache.lookup(-vec, scope))
@@ -0,0 +1,146 @@
+# context_builder.py
+import math
+import os
+
+import pandas as pd
+
+try:  # optional: exact token counts for OpenAI-family models
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# ---------------------------
+# Budgets
+# ---------------------------
+# Context window of the models we call through OpenRouter (tokens)
+MODEL_CONTEXT_WINDOWS = {
+    "openai/gpt-4o-mini": 128000,
+    "openai/gpt-4o": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Upper bound on context tokens even when the window allows more:
+# the answer only needs a few dozen well-chosen lines
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", "1200"))
+
+# System prompt, question and chat-format overhead
+PROMPT_RESERVE_TOKENS = 256
+
+CHARS_PER_TOKEN = 4
+
+
+# ---------------------------
+# Token counting
+# ---------------------------
+_encodings = {}
+
+
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    name = model.split("/")[-1]
+    if name not in _encodings:
+        try:
+            _encodings[name] = tiktoken.encoding_for_model(name)
+        except KeyError:
+            _encodings[name] = tiktoken.get_encoding("cl100k_base")
+    return _encodings[name]
+
+
+def count_tokens(texts, model: str = "openai/gpt-4o-mini") -> list:
+    """
+    Token count for each text.
+
+    Uses tiktoken when installed, otherwise ~4 characters per token
+    (slightly pessimistic for the English/number mix in our lines).
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return [math.ceil(len(t) / CHARS_PER_TOKEN) for t in texts]
+    return [len(tokens) for tokens in encoding.encode_batch(list(texts))]
+
+
+def context_budget(max_tokens: int, model: str = "openai/gpt-4o-mini", budget: int = CONTEXT_TOKEN_BUDGET) -> int:
+    """Tokens available for context once the answer and prompt are reserved."""
+    window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    return max(0, min(budget, window - max_tokens - PROMPT_RESERVE_TOKENS))
+
+
+# ---------------------------
+# Summary lines
+# ---------------------------
+def summary_lines(results: pd.DataFrame, cities: dict = None) -> pd.Series:
+    """
+    One compact line per College+Branch, built with column-wise string ops.
+
+    Args:
+        results (pd.DataFrame): enrich_results output (summary columns attached).
+        cities (dict, optional): College -> city.
+
+    Returns:
+        pd.Series: Context lines in result order.
+    """
+    college = results["College"].astype(str)
+    if cities:
+        city = results["College"].map(cities)
+        college = college.where(city.isna(), college + " (" + city.fillna("").astype(str) + ")")
+
+    lines = (
+        "- 🏫 " + college
+        + " | " + results["Branch"].astype(str)
+        + " | Exams: " + results["Exams"].astype(str)
+        + " | Best cutoff: " + results["Min_Cutoff"].round(0).astype(int).astype(str)
+        + " | Avg package: " + results["Avg_Package_LPA"].map("{:.2f}".format) + " LPA"
+        + " | Max package: " + results["Max_Package_LPA"].map("{:.1f}".format) + " LPA"
+        + " | Annual fee: ₹" + (results["Total_Annual"] / 1e5).map("{:.2f}".format) + "L"
+    )
+    nirf = results["NIRF_Rank"].where(results["NIRF_Rank"] > 0)  # 0 = not ranked
+    lines = lines.where(nirf.isna(), lines + " | NIRF: " + nirf.fillna(0).astype(int).astype(str))
+    return lines.reset_index(drop=True)
+
+
+def build_context(results: pd.DataFrame, max_tokens: int = 256, model: str = "openai/gpt-4o-mini",
+                  cities: dict = None, budget: int = CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    Context for the LLM that fits the token budget.
+
+    Lines are kept in retrieval order (best match first) until the next
+    one would exceed the budget left after reserving `max_tokens` for the
+    answer.
+
+    Args:
+        results (pd.DataFrame): enrich_results output.
+        max_tokens (int): Tokens reserved for the answer.
+        model (str): Model identifier (window size and tokenizer).
+        cities (dict, optional): College -> city.
+        budget (int): Upper bound on context tokens.
+
+    Returns:
+        str: Newline-joined context lines ("" when there are no results).
+    """
+    if results.empty:
+        return ""
+    lines = summary_lines(results, cities)
+    # +1 for the newline joining each line
+    used = pd.Series(count_tokens(lines, model)).add(1).cumsum()
+    return "\n".join(lines[used <= context_budget(max_tokens, model, budget)])
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    sample = pd.DataFrame({
+        "College": ["RVCE", "BMSCE"],
+        "Branch": ["COMPUTER SCIENCE AND ENGINEERING"] * 2,
+        "Exams": ["COMEDK/KCET", "KCET"],
+        "Min_Cutoff": [312, 1450],
+        "Avg_Package_LPA": [11.253, 8.4],
+        "Max_Package_LPA": [45.0, 32.5],
+        "Total_Annual": [164009.0, 151000.0],
+        "NIRF_Rank": [92.0, float("nan")],
+    })
+    context = build_context(sample, cities={"RVCE": "Bangalore"})
+    print(context)
+    print("Tokens:", sum(count_tokens(context.splitlines())), "| tiktoken:", tiktoken is not None)
+    print("Tight budget:", build_context(sample, budget=60))
@@ -0,0 +1,292 @@
+# embed_corpus.py
+"""
+Embed final_rag.csv and build the FAISS index outside the notebook.
+
+Usage (from the Streamlit/ folder):
+    python -m RAG_utils.embed_corpus                 # embed new rows, append
+    python -m RAG_utils.embed_corpus --workers 4     # spread over 4 processes
+    python -m RAG_utils.embed_corpus --full          # re-embed everything
+
+The CSV is streamed in chunks and encoded in large batches, optionally
+across a process pool. Vectors land in a memory-mapped .npy and every
+finished chunk is checkpointed, so an interrupted run resumes where it
+stopped. Rows already embedded (matched by their content text) are kept:
+adding a new admission year only encodes the new rows and appends them
+to the vectors, the metadata and the flat index.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Make the RAG_utils package importable when run as a script
+if str(Path(__file__).resolve().parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from RAG_utils.index_builder import FLAT_INDEX_FILE, build_index, corpus_texts
+from RAG_utils.rag_store import RAG_META_FILE, read_rag_meta, write_rag_meta
+
+# ---------------------------
+# Paths
+# ---------------------------
+DATA_DIR = Path(__file__).resolve().parent / "RAG_data"
+RAW_CSV_FILE = DATA_DIR / "final_rag.csv"
+VECTORS_FILE = DATA_DIR / "final_rag_vectors.npy"
+MANIFEST_FILE = DATA_DIR / "embed_manifest.json"
+
+# In-progress run (removed once its results are merged)
+PARTIAL_VECTORS_FILE = DATA_DIR / "final_rag_vectors.partial.npy"
+CHECKPOINT_FILE = DATA_DIR / "embed_checkpoint.json"
+
+EMBED_MODEL = "all-mpnet-base-v2"
+
+
+# ---------------------------
+# Small helpers
+# ---------------------------
+def row_keys(texts: list) -> list:
+    """Stable key per row: hash of its content text plus its duplicate number."""
+    seen = {}
+    keys = []
+    for text in texts:
+        n = seen.get(text, 0)
+        seen[text] = n + 1
+        keys.append(hashlib.sha1(f"{text}#{n}".encode("utf-8")).hexdigest())
+    return keys
+
+
+def write_json(path: Path, data: dict):
+    """Atomic JSON write (a crash never leaves a half-written checkpoint)."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def read_json(path: Path):
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+# ---------------------------
+# Workers
+# ---------------------------
+_worker_encoder = None
+
+
+def _init_worker(model_name: str, backend: str, threads: int):
+    """Load the encoder once per worker process."""
+    global _worker_encoder
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from RAG_utils.model_registry import get_encoder
+
+    _worker_encoder = get_encoder(model_name, device="cpu", backend=backend)
+
+
+def _encode_chunk(chunk_id: int, texts: list, batch_size: int):
+    vectors = _worker_encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False)
+    return chunk_id, np.asarray(vectors, dtype=np.float32)
+
+
+# ---------------------------
+# Pipeline
+# ---------------------------
+def scan_csv(csv_file: Path, chunk_size: int):
+    """Stream the CSV; return (metadata frame, content texts) in file order."""
+    frames, texts = [], []
+    for chunk in pd.read_csv(csv_file, chunksize=chunk_size):
+        frames.append(chunk)
+        texts.extend(corpus_texts(chunk))
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return df, texts
+
+
+def embed_rows(texts: list, job: dict, chunk_size: int, batch_size: int, workers: int, model_name: str,
+               backend: str) -> np.ndarray:
+    """
+    Encode `texts` into PARTIAL_VECTORS_FILE chunk by chunk, resuming from
+    CHECKPOINT_FILE. Returns the finished memmap.
+    """
+    n_chunks = (len(texts) + chunk_size - 1) // chunk_size
+    done = set(job["done_chunks"])
+    todo = [c for c in range(n_chunks) if c not in done]
+    if done:
+        print(f"↩️ Resuming: {len(done)}/{n_chunks} chunks already embedded")
+
+    if not todo:
+        return np.load(PARTIAL_VECTORS_FILE, mmap_mode="r+")
+
+    def chunk_texts(c):
+        return texts[c * chunk_size:(c + 1) * chunk_size]
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    if workers == 1:
+        _init_worker(model_name, backend, threads)
+
+    # Dimension is known after the first chunk; the memmap is created then
+    vectors = np.load(PARTIAL_VECTORS_FILE, mmap_mode="r+") if PARTIAL_VECTORS_FILE.exists() else None
+
+    def store(chunk_id, chunk_vectors):
+        nonlocal vectors
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(
+                PARTIAL_VECTORS_FILE, mode="w+", dtype=np.float32, shape=(len(texts), chunk_vectors.shape[1])
+            )
+            job["dim"] = int(chunk_vectors.shape[1])
+        start = chunk_id * chunk_size
+        vectors[start:start + len(chunk_vectors)] = chunk_vectors
+        vectors.flush()
+        job["done_chunks"].append(chunk_id)
+        write_json(CHECKPOINT_FILE, job)
+        print(f"✅ chunk {chunk_id + 1}/{n_chunks} ({len(job['done_chunks'])} done)")
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        for c in todo:
+            store(*_encode_chunk(c, chunk_texts(c), batch_size))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_name, backend, threads)) as pool:
+            futures = [pool.submit(_encode_chunk, c, chunk_texts(c), batch_size) for c in todo]
+            for future in futures:
+                store(*future.result())
+    print(f"⏱️ Embedded {len(texts)} rows in {time.perf_counter() - start_time:.1f}s")
+    return vectors
+
+
+def append_vectors(new_vectors: np.ndarray, n_keep: int) -> np.ndarray:
+    """Write VECTORS_FILE = its first `n_keep` vectors followed by the new ones."""
+    old = np.load(VECTORS_FILE, mmap_mode="r")[:n_keep] if n_keep else None
+    n_old = n_keep
+    tmp = VECTORS_FILE.with_suffix(".tmp.npy")
+    merged = np.lib.format.open_memmap(
+        tmp, mode="w+", dtype=np.float32, shape=(n_old + len(new_vectors), new_vectors.shape[1])
+    )
+    step = 65536
+    for i in range(0, n_old, step):
+        block = old[i:i + step]
+        merged[i:i + len(block)] = block
+    for i in range(0, len(new_vectors), step):
+        block = new_vectors[i:i + step]
+        merged[n_old + i:n_old + i + len(block)] = block
+    merged.flush()
+    del merged, old
+    os.replace(tmp, VECTORS_FILE)
+    return np.load(VECTORS_FILE, mmap_mode="r")
+
+
+def update_index(vectors: np.ndarray, n_new: int):
+    """Append the new rows to the flat index, or rebuild it from all vectors."""
+    import faiss
+
+    if n_new < len(vectors) and FLAT_INDEX_FILE.exists():
+        index = faiss.read_index(str(FLAT_INDEX_FILE))
+        if index.ntotal == len(vectors) - n_new:
+            index.add(np.ascontiguousarray(vectors[len(vectors) - n_new:]))
+            faiss.write_index(index, str(FLAT_INDEX_FILE))
+            return index
+        print(f"⚠️ Index has {index.ntotal} rows, expected {len(vectors) - n_new}; rebuilding")
+    index = build_index(np.asarray(vectors), "flat")
+    faiss.write_index(index, str(FLAT_INDEX_FILE))
+    return index
+
+
+def run(csv_file: Path = RAW_CSV_FILE, model_name: str = EMBED_MODEL, backend: str = "torch", chunk_size: int = 2048,
+        batch_size: int = 256, workers: int = 1, full: bool = False) -> dict:
+    """
+    Embed rows not embedded yet and append them to vectors, metadata and index.
+
+    Returns:
+        dict: {"total": rows in the corpus, "embedded": rows encoded this run}.
+    """
+    df, texts = scan_csv(csv_file, chunk_size)
+    keys = row_keys(texts)
+
+    manifest = read_json(MANIFEST_FILE)
+    keep_existing = (
+        not full and manifest is not None
+        and manifest["model"] == model_name and manifest["backend"] == backend
+        and VECTORS_FILE.exists() and RAG_META_FILE.exists()
+    )
+    if keep_existing and not set(manifest["keys"]) <= set(keys):
+        # Rows were edited or removed: vectors/index rows would no longer line up
+        print("⚠️ Rows changed or were removed since the last run; re-embedding everything")
+        keep_existing = False
+
+    known = set(manifest["keys"]) if keep_existing else set()
+    new_rows = [i for i, key in enumerate(keys) if key not in known]
+    if not new_rows:
+        print(f"✅ All {len(keys)} rows already embedded")
+        return {"total": len(keys), "embedded": 0}
+
+    # Resume only a checkpoint for exactly this batch of rows
+    new_keys = [keys[i] for i in new_rows]
+    fingerprint = hashlib.sha1("".join(new_keys).encode("utf-8")).hexdigest()
+    job = read_json(CHECKPOINT_FILE)
+    if not (job and job["fingerprint"] == fingerprint and job["model"] == model_name and job["backend"] == backend
+            and job["chunk_size"] == chunk_size and PARTIAL_VECTORS_FILE.exists()):
+        job = {"fingerprint": fingerprint, "model": model_name, "backend": backend,
+               "chunk_size": chunk_size, "done_chunks": []}
+        PARTIAL_VECTORS_FILE.unlink(missing_ok=True)
+        write_json(CHECKPOINT_FILE, job)
+
+    print(f"🧮 Embedding {len(new_rows)} of {len(keys)} rows with {model_name} ({backend}), {workers} worker(s)")
+    new_vectors = embed_rows([texts[i] for i in new_rows], job, chunk_size, batch_size, workers, model_name, backend)
+
+    # Merge: vectors, index, then metadata and manifest. The manifest is
+    # written last and only its rows are kept from earlier files, so a crash
+    # mid-merge simply redoes the merge from the checkpoint on the next run.
+    n_keep = len(manifest["keys"]) if keep_existing else 0
+    vectors = append_vectors(new_vectors, n_keep)
+    index = update_index(vectors, len(new_rows))
+
+    new_meta = df.iloc[new_rows].reset_index(drop=True)
+    if n_keep:
+        old_meta = read_rag_meta(RAG_META_FILE).slice(0, n_keep).to_pandas()
+        meta = pd.concat([old_meta.astype(new_meta.dtypes.to_dict()), new_meta], ignore_index=True)
+    else:
+        meta = new_meta
+    write_rag_meta(meta, RAG_META_FILE)
+    write_json(MANIFEST_FILE, {
+        "model": model_name, "backend": backend, "dim": int(vectors.shape[1]),
+        "keys": (manifest["keys"] if keep_existing else []) + new_keys,
+    })
+
+    del new_vectors
+    PARTIAL_VECTORS_FILE.unlink(missing_ok=True)
+    CHECKPOINT_FILE.unlink(missing_ok=True)
+    print(f"📦 {index.ntotal} vectors in {FLAT_INDEX_FILE.name}, metadata -> {RAG_META_FILE.name}")
+    return {"total": len(keys), "embedded": len(new_rows)}
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    from RAG_utils.model_registry import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Embed final_rag.csv and build the FAISS index.")
+    parser.add_argument("--csv", type=Path, default=RAW_CSV_FILE)
+    parser.add_argument("--model", default=EMBED_MODEL)
+    parser.add_argument("--backend", default="torch", choices=BACKENDS)
+    parser.add_argument("--chunk-size", type=int, default=2048, help="Rows per checkpointed chunk.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Encoder batch size.")
+    parser.add_argument("--workers", type=int, default=1, help="Encoder processes.")
+    parser.add_argument("--full", action="store_true", help="Ignore existing vectors and re-embed every row.")
+    args = parser.parse_args(argv)
+
+    run(args.csv, args.model, args.backend, args.chunk_size, args.batch_size, args.workers, args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
 # embedding_utils.py
+import hashlib
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
 import numpy as np
 import streamlit as st
-from sentence_transformers import SentenceTransformer
-from sentence_transformers.util import normalize_embeddings
 
 # ---------------------------
-# Cache the model to load only once per session
+# Paths
 # ---------------------------
-@st.cache_resource(show_spinner=False)
-def load_model(model_name: str = "all-mpnet-base-v2") -> SentenceTransformer:
+BASE_DIR = Path(__file__).resolve().parent
+EMBED_CACHE_FILE = BASE_DIR / "RAG_data" / "embedding_cache.sqlite"
+
+# Make the RAG_utils package importable when run as a script
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR.parent))
+
+from RAG_utils.model_registry import DEFAULT_MODEL, encoder_id, get_encoder
+from perf_utils.tracing import count_cache, span
+
+# ---------------------------
+# Shared model (one instance per process via the registry)
+# ---------------------------
+def load_model(model_name: str = DEFAULT_MODEL):
     """
-    Load SentenceTransformer model and cache it for efficiency.
+    Return the process-wide SentenceTransformer for this model.
 
     Args:
         model_name (str): Name of the sentence-transformers model to load.
@@ -18,14 +34,129 @@ def load_model(model_name: str = "all-mpnet-base-v2") -> SentenceTransformer:
     Returns:
         SentenceTransformer: Loaded embedding model.
     """
-    return SentenceTransformer(model_name)
+    return get_encoder(model_name)
+
+
+# ---------------------------
+# Persistent on-disk vector cache
+# ---------------------------
+class EmbeddingCache:
+    """
+    SQLite key-value store of embeddings keyed by (model name, text hash).
+
+    SQLite in WAL mode lets several worker processes read and write the
+    same file, so embeddings survive restarts and deploys.
+    """
+
+    def __init__(self, path=EMBED_CACHE_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, key TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, key))"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """Stable hash of the input text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name: str, keys: list) -> dict:
+        """Return {key: vector} for the keys already cached."""
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    [model_name, *chunk],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model_name: str, items: dict):
+        """Store {key: vector} pairs, replacing existing entries."""
+        if not items:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, dim, vector) VALUES (?, ?, ?, ?)",
+                [(model_name, key, len(vec), np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in items.items()],
+            )
+            conn.commit()
+
+
+@st.cache_resource(show_spinner=False)
+def get_embedding_cache() -> EmbeddingCache:
+    """One cache handle per process."""
+    return EmbeddingCache()
+
+
+# ---------------------------
+# Batch embeddings with disk cache
+# ---------------------------
+def get_embeddings(texts, model_name: str = DEFAULT_MODEL, batch_size: int = 64) -> np.ndarray:
+    """
+    Embed a list of texts, encoding only the cache misses in one batch.
+
+    Args:
+        texts (list[str]): Texts to embed.
+        model_name (str): Model name to match FAISS index dimension.
+        batch_size (int): Batch size passed to SentenceTransformer.encode.
+
+    Returns:
+        np.ndarray: (len(texts), dim) float32 array of normalized embeddings.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    cache = get_embedding_cache()
+    # Vectors from the ONNX / int8 backends are cached apart from fp32 ones
+    cache_name = encoder_id(model_name)
+    keys = [EmbeddingCache.text_key(t) for t in texts]
+    found = cache.get_many(cache_name, list(set(keys)))
+
+    # Encode each distinct missing text once, in a single call
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    count_cache("embedding", hits=len(found), misses=len(missing))
+
+    if missing:
+        model = load_model(model_name)
+        with span("embed"):
+            vectors = model.encode(list(missing.values()), batch_size=batch_size, normalize_embeddings=True)
+            vectors = np.asarray(vectors, dtype=np.float32)
+        fresh = dict(zip(missing.keys(), vectors))
+        cache.put_many(cache_name, fresh)
+        found.update(fresh)
+
+    return np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
 
 
 # ---------------------------
 # Compute embedding with caching
 # ---------------------------
 @st.cache_data(show_spinner=False)
-def get_embedding(text: str, model_name: str = "all-mpnet-base-v2") -> np.ndarray:
+def get_embedding(text: str, model_name: str = DEFAULT_MODEL) -> np.ndarray:
     """
     Get vector embedding for input text using cached SentenceTransformer model.
 
@@ -36,16 +167,33 @@ def get_embedding(text: str, model_name: str = "all-mpnet-base-v2") -> np.ndarra
     Returns:
         np.ndarray: Embedding vector as float32 numpy array.
     """
-    model = load_model(model_name)
-
     # Ensure input is a list
     texts = [text] if isinstance(text, str) else text
 
-    # Compute normalized embeddings
-    embedding = model.encode(texts, batch_size=32, normalize_embeddings=True)
+    embedding = get_embeddings(texts, model_name=model_name)
 
     # Return first embedding if single text, else all
-    return np.array(embedding[0], dtype=np.float32) if isinstance(text, str) else np.array(embedding, dtype=np.float32)
+    return embedding[0] if isinstance(text, str) else embedding
+
+
+# ---------------------------
+# Encoder wrapper for search_colleges
+# ---------------------------
+class CachedEncoder:
+    """
+    Drop-in for `model.encode(...)` that routes through the batch cache.
+
+    Extra keyword arguments (normalize_embeddings, batch_size, ...) are
+    accepted for compatibility; embeddings are always normalized.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        self.model_name = model_name
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        return get_embeddings(texts, model_name=self.model_name)
 
 
 # ---------------------------
@@ -60,3 +208,6 @@ if __name__ == "__main__":
     print("✅ Embedding computed successfully!")
     print(f"Embedding shape: {embedding_vector.shape}")
     print(f"First 5 values: {embedding_vector[:5]}")
+
+    batch = get_embeddings([sample_text, "Best ECE colleges in Mysore", sample_text])
+    print(f"Batch shape: {batch.shape}")
@@ -0,0 +1,145 @@
+# encoder_check.py
+"""
+Check that a faster query encoder keeps retrieval quality.
+
+Re-embeds a sample of the RAG corpus with a candidate backend (ONNX,
+ONNX int8) or a smaller model, and compares its top-k neighbours with the
+fp32 PyTorch reference. Also reports query latency and model size.
+
+Usage (from the Streamlit/ folder):
+    python -m RAG_utils.encoder_check --backend onnx-int8
+    python -m RAG_utils.encoder_check --model all-MiniLM-L6-v2 --backend torch
+
+Exits with status 1 when recall@k drops more than --tolerance below 1.0.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Make the RAG_utils package importable when run as a script
+if str(Path(__file__).resolve().parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from RAG_utils.index_builder import corpus_texts, overlap
+from RAG_utils.model_registry import BACKENDS, DEFAULT_MODEL, encoder_memory, get_encoder
+
+RAW_CSV_FILE = Path(__file__).resolve().parent / "RAG_data" / "final_rag.csv"
+
+# Typical FAQ questions; corpus rows are used as extra queries
+QUERIES = [
+    "Best colleges for computer science under KCET rank 6000",
+    "Top CSE colleges in Bangalore with good placements",
+    "ECE colleges with average package above 8 LPA",
+    "Colleges with low fees and good placements for mechanical engineering",
+    "RVCE CSE GM cutoff 2024",
+    "Which colleges offer artificial intelligence and data science?",
+    "COMEDK cutoff for information science at BMSCE",
+    "Civil engineering colleges in Mysore",
+    "Good colleges for SC category under 20000 rank",
+    "Robotics and automation engineering colleges with high packages",
+]
+
+
+def encode(encoder, texts, batch_size: int = 64) -> np.ndarray:
+    vectors = encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def query_latency_ms(encoder, queries, repeats: int = 3) -> float:
+    """Median single-query encode time (the per-request cost in the app)."""
+    encode(encoder, queries[:1])  # warm-up
+    timings = []
+    for _ in range(repeats):
+        for query in queries:
+            start = time.perf_counter()
+            encode(encoder, [query])
+            timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def neighbours(doc_vectors: np.ndarray, query_vectors: np.ndarray, k: int) -> np.ndarray:
+    """Exact top-k by inner product (vectors are normalized)."""
+    import faiss
+
+    index = faiss.IndexFlatIP(doc_vectors.shape[1])
+    index.add(doc_vectors)
+    return index.search(query_vectors, k)[1]
+
+
+def check(backend: str, model_name: str = DEFAULT_MODEL, sample: int = 3000, n_row_queries: int = 200,
+          k: int = 10, seed: int = 0) -> dict:
+    """
+    Recall@k of a candidate encoder against the fp32 PyTorch reference.
+
+    Args:
+        backend (str): Candidate backend (see model_registry.BACKENDS).
+        model_name (str): Candidate model (defaults to the production model).
+        sample (int): Corpus rows to re-embed.
+        n_row_queries (int): Corpus rows reused as queries, besides QUERIES.
+        k (int): Neighbours compared.
+        seed (int): Sampling seed.
+
+    Returns:
+        dict: recall@k (re-embedded corpus), recall@k of candidate queries
+        against the fp32 corpus (same model only), latencies and sizes.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(RAW_CSV_FILE)
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(df), size=min(sample, len(df)), replace=False)
+    docs = corpus_texts(df.iloc[rows])
+    queries = QUERIES + [docs[i] for i in rng.choice(len(docs), size=min(n_row_queries, len(docs)), replace=False)]
+
+    reference = get_encoder(DEFAULT_MODEL, device="cpu", backend="torch")
+    candidate = get_encoder(model_name, device="cpu", backend=backend)
+
+    ref_docs, ref_queries = encode(reference, docs), encode(reference, queries)
+    cand_docs, cand_queries = encode(candidate, docs), encode(candidate, queries)
+
+    truth = neighbours(ref_docs, ref_queries, k)
+    report = {
+        "model": model_name,
+        "backend": backend,
+        f"recall@{k}": round(overlap(truth, neighbours(cand_docs, cand_queries, k)), 4),
+    }
+    if model_name == DEFAULT_MODEL:
+        # Serving the candidate against the existing fp32 index, without re-embedding
+        report[f"recall@{k}_fp32_index"] = round(overlap(truth, neighbours(ref_docs, cand_queries, k)), 4)
+
+    report["ref_query_ms"] = round(query_latency_ms(reference, QUERIES), 2)
+    report["query_ms"] = round(query_latency_ms(candidate, QUERIES), 2)
+    report["speedup"] = round(report["ref_query_ms"] / report["query_ms"], 2)
+    report["model_mb"] = {name: round(size / 1e6, 1) for name, size in encoder_memory().items()}
+    return report
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare a query encoder backend with the fp32 reference.")
+    parser.add_argument("--backend", default="onnx-int8", choices=BACKENDS)
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Candidate model (e.g. a distilled one).")
+    parser.add_argument("--sample", type=int, default=3000, help="Corpus rows to re-embed.")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Allowed recall@k drop below 1.0.")
+    args = parser.parse_args(argv)
+
+    report = check(args.backend, args.model, sample=args.sample, k=args.k)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+    recall = report[f"recall@{args.k}"]
+    if recall < 1.0 - args.tolerance:
+        print(f"❌ recall@{args.k} {recall:.3f} is below {1.0 - args.tolerance:.3f}")
+        return 1
+    print(f"✅ recall@{args.k} {recall:.3f} within tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# index_builder.py
+"""
+Build compressed FAISS variants of the college RAG index and check recall.
+
+Usage (from the Streamlit/ folder):
+    python -m RAG_utils.index_builder --kinds sq8 fp16 hnsw ivfpq --eval
+
+The app picks a variant with the RAG_INDEX_KIND env var / Streamlit secret
+(default "flat", the index built by notebooks/Embed_Faiss.ipynb).
+"""
+import argparse
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+# ---------------------------
+# Paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "RAG_data"
+FLAT_INDEX_FILE = DATA_DIR / "final_rag_index.faiss"
+
+INDEX_KINDS = ("flat", "fp16", "sq8", "hnsw", "ivfpq")
+
+# Text embedded for each RAG row (also shown as `content` in search results)
+CONTENT_FIELDS = ["College", "Branch", "Category", "Cutoff_rank", "Exam", "Year", "Avg_Package_LPA"]
+CONTENT_TEMPLATE = "{} | {} | {} | Cutoff: {} | Exam: {} | Year: {} | Avg Package: {}"
+
+
+def corpus_texts(df) -> list:
+    """Content string for every row of a RAG metadata frame."""
+    return [CONTENT_TEMPLATE.format(*values) for values in zip(*(df[c] for c in CONTENT_FIELDS))]
+
+
+def index_file_for(kind: str = "flat") -> Path:
+    """Path of the index file for a variant ("flat" keeps the original name)."""
+    if kind not in INDEX_KINDS:
+        raise ValueError(f"Unknown index kind '{kind}'. Choose from {INDEX_KINDS}")
+    if kind == "flat":
+        return FLAT_INDEX_FILE
+    return DATA_DIR / f"final_rag_index_{kind}.faiss"
+
+
+# ---------------------------
+# Builders
+# ---------------------------
+def build_index(vectors: np.ndarray, kind: str, hnsw_m: int = 32, pq_m: int = 48, nlist: int = None):
+    """
+    Build one FAISS index variant over `vectors` (L2, like the flat index).
+
+    Args:
+        vectors (np.ndarray): (n, dim) float32 corpus embeddings.
+        kind (str): "flat", "fp16", "sq8", "hnsw" or "ivfpq".
+        hnsw_m (int): HNSW graph degree.
+        pq_m (int): PQ sub-quantizers for IVF-PQ (must divide dim).
+        nlist (int, optional): IVF lists; defaults to ~sqrt(n).
+
+    Returns:
+        faiss.Index: Trained index with all vectors added.
+    """
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if kind == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif kind == "fp16":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2)
+    elif kind == "sq8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m)
+        index.hnsw.efConstruction = 80
+    elif kind == "ivfpq":
+        nlist = nlist or max(1, int(math.sqrt(n)))
+        quantizer = faiss.IndexFlatL2(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, 8)
+    else:
+        raise ValueError(f"Unknown index kind '{kind}'. Choose from {INDEX_KINDS}")
+
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def configure_search(index, nprobe: int = 16, ef_search: int = 64):
+    """Apply query-time knobs for IVF (nprobe) and HNSW (efSearch) indexes."""
+    import faiss
+
+    if hasattr(index, "nprobe"):
+        index.nprobe = nprobe
+    hnsw = getattr(faiss.downcast_index(index), "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = ef_search
+    return index
+
+
+def load_vectors(index_file=FLAT_INDEX_FILE) -> np.ndarray:
+    """Recover the corpus vectors stored in the flat index."""
+    import faiss
+
+    index = faiss.read_index(str(index_file))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def index_bytes(index) -> int:
+    """Serialized size of an index (≈ resident memory per worker)."""
+    import faiss
+
+    return int(faiss.serialize_index(index).nbytes)
+
+
+# ---------------------------
+# Recall evaluation
+# ---------------------------
+def recall_at_k(index, reference, queries: np.ndarray, k: int = 10) -> float:
+    """
+    Fraction of the reference (flat) top-k neighbours that `index` also returns.
+
+    Args:
+        index (faiss.Index): Candidate index.
+        reference (faiss.Index): Exact index to compare against.
+        queries (np.ndarray): (q, dim) float32 query vectors.
+        k (int): Neighbours per query.
+
+    Returns:
+        float: Mean recall@k in [0, 1].
+    """
+    _, truth = reference.search(queries, k)
+    _, found = index.search(queries, k)
+    return overlap(truth, found)
+
+
+def overlap(truth: np.ndarray, found: np.ndarray) -> float:
+    """Mean fraction of each row of `truth` ids present in the same row of `found`."""
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return hits / truth.size
+
+
+def sample_queries(vectors: np.ndarray, n: int = 200, noise: float = 0.05, seed: int = 0) -> np.ndarray:
+    """Perturbed corpus vectors to use as queries when no query log is available."""
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.choice(len(vectors), size=min(n, len(vectors)), replace=False)]
+    queries = picks + noise * rng.standard_normal(picks.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries.astype(np.float32)
+
+
+def evaluate(indexes: dict, reference, queries: np.ndarray, k: int = 10) -> list:
+    """Recall@k, size and mean search latency for each built variant."""
+    _, truth = reference.search(queries, k)
+    rows = []
+    for kind, index in indexes.items():
+        start = time.perf_counter()
+        _, found = index.search(queries, k)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = overlap(truth, found)
+        rows.append({
+            "kind": kind,
+            f"recall@{k}": round(recall, 4),
+            "size_mb": round(index_bytes(index) / 1e6, 2),
+            "ms_per_query": round(elapsed_ms, 3),
+        })
+    return rows
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    import faiss
+
+    parser = argparse.ArgumentParser(description="Build compressed FAISS variants of the RAG index.")
+    parser.add_argument("--kinds", nargs="+", default=["sq8", "hnsw", "ivfpq"], choices=INDEX_KINDS[1:])
+    parser.add_argument("--eval", action="store_true", help="Report recall@k against the flat index.")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    reference = faiss.read_index(str(FLAT_INDEX_FILE))
+    vectors = reference.reconstruct_n(0, reference.ntotal)
+    print(f"📦 Flat index: {reference.ntotal} vectors, {index_bytes(reference) / 1e6:.1f} MB")
+
+    built = {}
+    for kind in args.kinds:
+        start = time.perf_counter()
+        index = configure_search(build_index(vectors, kind), nprobe=args.nprobe, ef_search=args.ef_search)
+        faiss.write_index(index, str(index_file_for(kind)))
+        built[kind] = index
+        print(f"✅ {kind}: built in {time.perf_counter() - start:.1f}s -> {index_file_for(kind).name}")
+
+    if args.eval:
+        queries = sample_queries(vectors)
+        for row in evaluate({"flat": reference, **built}, reference, queries, args.k):
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# lexical_index.py
+import re
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Tokenization
+# ---------------------------
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Fields indexed per RAG row (what the `content` string is made of)
+TEXT_FIELDS = ["College", "Branch", "Category", "Exam", "Year"]
+
+STOPWORDS = {"and", "of", "the", "in", "for"}
+
+# Words that carry no lexical signal but still make a query "structured"
+# ("RVCE CSE GM cutoff 2024" needs no semantic understanding)
+STRUCTURAL_WORDS = {
+    "cutoff", "cutoffs", "cut", "off", "rank", "ranks", "closing", "college", "colleges",
+    "branch", "branches", "category", "exam", "year", "round", "with", "seat", "seats",
+}
+
+
+def tokenize(text: str) -> list:
+    """Lower-case alphanumeric tokens without stopwords."""
+    return [t for t in TOKEN_RE.findall(str(text).lower()) if t not in STOPWORDS]
+
+
+def acronym(text: str) -> str:
+    """Initials of a multi-word name ("COMPUTER SCIENCE AND ENGINEERING" -> "cse")."""
+    words = tokenize(text)
+    return "".join(w[0] for w in words) if len(words) > 1 else ""
+
+
+def value_tokens(value) -> list:
+    """Tokens for one field value; multi-word names also index their acronym."""
+    tokens = tokenize(value)
+    short = acronym(value)
+    return tokens + [short] if short else tokens
+
+
+# ---------------------------
+# BM25 inverted index
+# ---------------------------
+class BM25Index:
+    """
+    In-process BM25 over the RAG rows, stored as CSR posting arrays.
+
+    Row ids match the FAISS index, so lexical and dense hits can be fused
+    directly. A query is a handful of postings lookups plus one bincount.
+    """
+
+    def __init__(self, df: pd.DataFrame, fields=TEXT_FIELDS, k1: float = 1.2, b: float = 0.75):
+        self.n_docs = len(df)
+        self.k1 = k1
+        self.b = b
+
+        # Tokenize each distinct field value once, then expand to rows by code
+        vocab = {}
+        doc_parts, term_parts = [], []
+        row_ids = np.arange(self.n_docs)
+        for field in fields:
+            codes, values = pd.factorize(df[field].astype(str))
+            value_terms = [[vocab.setdefault(t, len(vocab)) for t in value_tokens(v)] for v in values]
+            lengths = np.array([len(t) for t in value_terms])
+            flat = np.array([t for terms in value_terms for t in terms], dtype=np.int64)
+            offsets = np.concatenate([[0], np.cumsum(lengths)])
+            repeats = lengths[codes]
+            within = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+            doc_parts.append(np.repeat(row_ids, repeats))
+            term_parts.append(flat[np.repeat(offsets[codes], repeats) + within])
+        self.vocab = vocab
+
+        # (term, doc) pairs sorted by term, with term frequencies
+        docs, terms = np.concatenate(doc_parts), np.concatenate(term_parts)
+        doc_len = np.bincount(docs, minlength=self.n_docs).astype(np.float32)
+        pairs, tfs = np.unique(terms * self.n_docs + docs, return_counts=True)
+        terms, docs, tfs = pairs // self.n_docs, pairs % self.n_docs, tfs.astype(np.float32)
+
+        df_counts = np.bincount(terms, minlength=len(vocab))
+        self.indptr = np.concatenate([[0], np.cumsum(df_counts)])
+        self.postings = docs.astype(np.int32)
+
+        # Precompute each posting's BM25 weight (idf * saturated tf)
+        idf = np.log1p((self.n_docs - df_counts + 0.5) / (df_counts + 0.5)).astype(np.float32)
+        norm = k1 * (1 - b + b * doc_len[docs] / doc_len.mean())
+        self.weights = idf[terms] * tfs * (k1 + 1) / (tfs + norm)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every row for `query` (0 where no term matches)."""
+        term_ids = [self.vocab[t] for t in set(tokenize(query)) if t in self.vocab]
+        if not term_ids:
+            return np.zeros(self.n_docs, dtype=np.float32)
+        spans = [slice(self.indptr[t], self.indptr[t + 1]) for t in term_ids]
+        docs = np.concatenate([self.postings[s] for s in spans])
+        weights = np.concatenate([self.weights[s] for s in spans])
+        return np.bincount(docs, weights=weights, minlength=self.n_docs).astype(np.float32)
+
+    def search(self, query: str, k: int, allowed: np.ndarray = None, tie_break: np.ndarray = None):
+        """
+        Top-k rows by BM25 score.
+
+        Args:
+            query (str): Query text.
+            k (int): Rows to return.
+            allowed (np.ndarray, optional): Boolean row mask; other rows never match.
+            tie_break (np.ndarray, optional): Per-row key, lower first among equal scores
+                (e.g. cutoff rank, so stronger colleges lead).
+
+        Returns:
+            tuple: (scores, row ids), best first; only rows with a match.
+        """
+        scores = self.scores(query)
+        if allowed is not None:
+            scores[~allowed] = 0
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            # Keep everything tied with the k-th score so the tie-break can pick
+            kth = np.partition(-scores[hits], k - 1)[k - 1]
+            hits = hits[-scores[hits] <= kth]
+        if tie_break is not None:
+            order = np.lexsort((tie_break[hits], -scores[hits]))
+        else:
+            order = np.argsort(-scores[hits], kind="stable")
+        hits = hits[order][:k]
+        return scores[hits], hits
+
+    def is_structured(self, query: str, require_match: bool = True) -> bool:
+        """
+        True when every query word is an indexed code/name or a structural word.
+
+        Such queries ("RVCE CSE GM cutoff 2024") are answered from the
+        lexical index alone, without encoding the query. With
+        `require_match=False` a query of only structural words also counts
+        (used for what is left once parsed filters are stripped).
+        """
+        tokens = tokenize(query)
+        matched = any(t in self.vocab for t in tokens)
+        return (matched or not require_match) and all(t in self.vocab or t in STRUCTURAL_WORDS for t in tokens)
+
+
+# ---------------------------
+# Rank fusion
+# ---------------------------
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: list, k: int = RRF_K) -> dict:
+    """
+    Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank).
+
+    Args:
+        rankings (list[list]): Ranked ids, best first, one list per retriever.
+        k (int): RRF damping constant.
+
+    Returns:
+        dict: {id: fused score}, in no particular order.
+    """
+    fused = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    import time
+    from pathlib import Path
+
+    df = pd.read_csv(Path(__file__).resolve().parent / "RAG_data" / "final_rag.csv")
+    start = time.perf_counter()
+    bm25 = BM25Index(df)
+    print(f"✅ BM25 over {bm25.n_docs} rows, {len(bm25.vocab)} terms in {time.perf_counter() - start:.2f}s")
+
+    query = "RVCE CSE GM cutoff 2024"
+    start = time.perf_counter()
+    scores, rows = bm25.search(query, k=5)
+    print(f"🔎 {query!r} structured={bm25.is_structured(query)} in {(time.perf_counter() - start) * 1e6:.0f} µs")
+    print(df.iloc[rows][["College", "Branch", "Category", "Exam", "Year"]].assign(score=scores))
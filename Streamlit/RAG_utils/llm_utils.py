@@ -1,13 +1,228 @@
 import os
+import json
+import sys
+import time
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 import streamlit as st
 
+try:  # optional: async client (HTTP/2 when the `h2` extra is installed)
+    import httpx
+except ImportError:
+    httpx = None
+
+# Make the Streamlit/ packages importable when run as a script
+if str(Path(__file__).resolve().parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from perf_utils.tracing import record, span
+
 # ---------------------------
 # Load environment variables
 # ---------------------------
-OPENROUTER_API_KEY = st.secrets.get("OPENROUTER_API_KEY")
-OPENROUTER_ENDPOINT = "https://openrouter.ai/api/v1/chat/completions"
+load_dotenv()
+
+
+def get_secret(name: str):
+    """st.secrets value, else the environment / .env (no secrets.toml needed)."""
+    try:
+        value = st.secrets.get(name)
+    except FileNotFoundError:  # no secrets.toml (scripts, benchmarks)
+        value = None
+    return value or os.environ.get(name)
+
+
+OPENROUTER_API_KEY = get_secret("OPENROUTER_API_KEY")
+OPENROUTER_ENDPOINT = os.environ.get("OPENROUTER_ENDPOINT", "https://openrouter.ai/api/v1/chat/completions")
+
+DEFAULT_MODEL = "openai/gpt-4o-mini"
+SYSTEM_PROMPT = "You are a helpful assistant. Answer ONLY using the provided context."
+REQUEST_TIMEOUT = 30
+
+
+# ---------------------------
+# Request helpers
+# ---------------------------
+class StreamError(Exception):
+    """The answer stream failed or ended early (server error event, no [DONE])."""
+
+
+def build_payload(query: str, context: str, max_tokens: int = 256, model: str = DEFAULT_MODEL,
+                  temperature: float = 0.0, top_p: float = 0.8, stream: bool = False) -> dict:
+    """Chat-completions payload shared by the sync, streaming and async paths."""
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Context:\n{context}\n\nQuestion:\n{query}\n\nAnswer:"},
+    ]
+    payload = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "top_p": top_p,
+    }
+    if stream:
+        payload["stream"] = True
+    return payload
+
+
+def auth_headers(api_key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+def parse_sse_line(line: str):
+    """
+    Token text from one server-sent-event line, or None.
+
+    Returns the string "[DONE]" at the end of the stream. Comment lines
+    (": OPENROUTER PROCESSING") and blank keep-alives yield None. An error
+    event (`{"error": {...}}`, sent after the HTTP 200) raises StreamError.
+    """
+    if not line or not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return data
+    try:
+        chunk = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    error = chunk.get("error")
+    if error:
+        message = error.get("message") if isinstance(error, dict) else None
+        raise StreamError(message or str(error))
+    choices = chunk.get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content")
+
+
+# ---------------------------
+# Pooled sync client with streaming
+# ---------------------------
+class OpenRouterClient:
+    """
+    Keep-alive HTTP client for OpenRouter chat completions.
+
+    One instance is shared per process (see `get_client`), so requests
+    reuse pooled connections instead of paying a TLS handshake each time.
+    """
+
+    def __init__(self, api_key: str = None, endpoint: str = OPENROUTER_ENDPOINT,
+                 pool_size: int = 16, timeout: float = REQUEST_TIMEOUT):
+        self.api_key = api_key or OPENROUTER_API_KEY
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def complete(self, query: str, context: str, **params) -> str:
+        """Blocking call; returns the full answer text."""
+        response = self.session.post(
+            self.endpoint,
+            headers=auth_headers(self.api_key),
+            json=build_payload(query, context, **params),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        try:
+            return data["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError):
+            raise KeyError(f"Unexpected API response: {response.text}") from None
+
+    def stream(self, query: str, context: str, **params):
+        """
+        Yield answer tokens as the server sends them (SSE).
+
+        Raises StreamError on an error event or when the stream ends
+        without [DONE], so a cut-off answer is never taken as complete.
+        """
+        with self.session.post(
+            self.endpoint,
+            headers=auth_headers(self.api_key),
+            json=build_payload(query, context, stream=True, **params),
+            timeout=self.timeout,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            response.encoding = "utf-8"
+            for line in response.iter_lines(decode_unicode=True):
+                token = parse_sse_line(line)
+                if token == "[DONE]":
+                    return
+                if token:
+                    yield token
+        raise StreamError("The answer stream ended before it was complete.")
+
+
+# ---------------------------
+# Async client (asyncio API)
+# ---------------------------
+class AsyncOpenRouterClient:
+    """
+    asyncio counterpart of OpenRouterClient built on httpx.
+
+    Uses HTTP/2 when the `h2` package is installed, HTTP/1.1 keep-alive
+    otherwise. Create one per event loop and `await client.aclose()`.
+    """
+
+    def __init__(self, api_key: str = None, endpoint: str = OPENROUTER_ENDPOINT,
+                 pool_size: int = 16, timeout: float = REQUEST_TIMEOUT):
+        if httpx is None:
+            raise ImportError("AsyncOpenRouterClient needs httpx: pip install 'httpx[http2]'")
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        self.api_key = api_key or OPENROUTER_API_KEY
+        self.endpoint = endpoint
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def complete(self, query: str, context: str, **params) -> str:
+        response = await self.client.post(
+            self.endpoint,
+            headers=auth_headers(self.api_key),
+            json=build_payload(query, context, **params),
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    async def stream(self, query: str, context: str, **params):
+        async with self.client.stream(
+            "POST",
+            self.endpoint,
+            headers=auth_headers(self.api_key),
+            json=build_payload(query, context, stream=True, **params),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                token = parse_sse_line(line)
+                if token == "[DONE]":
+                    return
+                if token:
+                    yield token
+        raise StreamError("The answer stream ended before it was complete.")
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+@st.cache_resource(show_spinner=False)
+def get_client() -> OpenRouterClient:
+    """One pooled client per process, shared by all sessions."""
+    return OpenRouterClient()
+
 
 # ---------------------------
 # Cached API call wrapper
@@ -17,13 +232,13 @@ def generate_answer_openrouter(
     query: str,
     context: str,
     max_tokens: int = 256,
-    model: str = "openai/gpt-4o-mini",
+    model: str = DEFAULT_MODEL,
     temperature: float = 0.0,
     top_p: float = 0.8,
 ) -> str:
     """
     Generate an answer using OpenRouter API with caching to avoid repeated calls.
-    
+
     Args:
         query (str): User's question.
         context (str): Retrieved context from RAG.
@@ -31,7 +246,7 @@ def generate_answer_openrouter(
         model (str): Model identifier.
         temperature (float): Sampling temperature.
         top_p (float): Nucleus sampling probability.
-    
+
     Returns:
         str: Answer string with emotes or error message.
     """
@@ -41,36 +256,89 @@ def generate_answer_openrouter(
     if not context.strip():
         return "⚠️ No context available to answer the question."
 
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    messages = [
-        {"role": "system", "content": "You are a helpful assistant. Answer ONLY using the provided context."},
-        {"role": "user", "content": f"Context:\n{context}\n\nQuestion:\n{query}\n\nAnswer:"},
-    ]
-
-    payload = {
-        "model": model,
-        "messages": messages,
-        "max_tokens": max_tokens,
-        "temperature": temperature,
-        "top_p": top_p,
-    }
-
     try:
-        response = requests.post(OPENROUTER_ENDPOINT, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        answer = data["choices"][0]["message"]["content"].strip()
+        with span("llm") as info:
+            answer = get_client().complete(
+                query, context, max_tokens=max_tokens, model=model, temperature=temperature, top_p=top_p
+            )
+            info["bytes"] = len(answer.encode("utf-8"))
         return f"💡 Answer:\n{answer}"
     except requests.exceptions.Timeout:
         return "⏰ Request timed out. Try again!"
     except requests.exceptions.RequestException as e:
         return f"❌ Request failed: {e}"
-    except KeyError:
-        return f"⚠️ Unexpected API response: {response.text}"
+    except KeyError as e:
+        return f"⚠️ {e.args[0]}"
+
+
+# ---------------------------
+# Streaming wrapper (for stream_to_placeholder / st.write_stream)
+# ---------------------------
+class AnswerStream:
+    """
+    Answer tokens as they arrive, with the outcome kept out of band.
+
+    Iterate it once. A failure is still shown to the user as a final
+    message token, but it is also stored in `error`, and `completed` is
+    True only when the server finished the answer cleanly. Callers decide
+    whether to keep an answer from these flags, never from its text.
+    """
+
+    def __init__(self, query: str, context: str, **params):
+        self.query = query
+        self.context = context
+        self.params = params
+        self.error = None
+        self.completed = False
+
+    def _fail(self, message: str, received) -> str:
+        self.error = message
+        return f"\n\n{message}" if received else message
+
+    def __iter__(self):
+        if not OPENROUTER_API_KEY:
+            yield self._fail("❌ API key missing! Set OPENROUTER_API_KEY in your .env file.", None)
+            return
+
+        if not self.context.strip():
+            yield self._fail("⚠️ No context available to answer the question.", None)
+            return
+
+        start = time.perf_counter()
+        received = None
+        try:
+            for token in get_client().stream(self.query, self.context, **self.params):
+                if received is None:
+                    received = 0
+                    record("llm_first_token", time.perf_counter() - start)
+                received += len(token.encode("utf-8"))
+                yield token
+            self.completed = True
+        except requests.exceptions.Timeout:
+            yield self._fail("⏰ Request timed out. Try again!", received)
+        except requests.exceptions.RequestException as e:  # incl. ChunkedEncodingError mid-stream
+            yield self._fail(f"❌ Request failed: {e}", received)
+        except StreamError as e:
+            yield self._fail(f"⚠️ {e}", received)
+        finally:
+            record("llm", time.perf_counter() - start, received)
+
+
+def stream_answer_openrouter(
+    query: str,
+    context: str,
+    max_tokens: int = 256,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.0,
+    top_p: float = 0.8,
+) -> AnswerStream:
+    """
+    Stream an answer; iterate the result for tokens, then check `completed`.
+
+    Same arguments as `generate_answer_openrouter`, without result caching.
+    """
+    return AnswerStream(query, context, max_tokens=max_tokens, model=model, temperature=temperature, top_p=top_p)
+
 
 # ---------------------------
 # Optional standalone test
@@ -85,3 +353,8 @@ if __name__ == "__main__":
     print("📄 Context:", test_context)
     print("\n--- Answer ---")
     print(generate_answer_openrouter(test_query, test_context))
+    print("\n--- Streamed ---")
+    streamed = stream_answer_openrouter(test_query, test_context)
+    for token in streamed:
+        print(token, end="", flush=True)
+    print(f"\n(completed: {streamed.completed})")
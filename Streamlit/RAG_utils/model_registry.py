@@ -0,0 +1,178 @@
+# model_registry.py
+import os
+import threading
+from pathlib import Path
+
+# ---------------------------
+# Registry state
+# ---------------------------
+# One encoder per (model, device, precision, backend) for the whole
+# process. The sentence_transformers import is deferred to the first load
+# so importing this module stays cheap.
+DEFAULT_MODEL = "all-mpnet-base-v2"
+PRECISIONS = ("fp32", "fp16", "bf16")
+
+# "torch" (default), "onnx" (ONNX Runtime, fp32) or "onnx-int8" (ONNX
+# Runtime with dynamic int8 quantization; needs `optimum[onnxruntime]`).
+BACKENDS = ("torch", "onnx", "onnx-int8")
+EMBED_BACKEND = os.environ.get("EMBED_BACKEND", "torch")
+
+# Exported ONNX models are written here once and reused on later starts
+ONNX_DIR = Path(__file__).resolve().parent / "RAG_data" / "onnx"
+# Instruction set the int8 kernels target: "avx512_vnni", "avx512", "avx2" or "arm64"
+ONNX_QUANT_CONFIG = os.environ.get("ONNX_QUANT_CONFIG", "avx2")
+
+_encoders = {}
+_model_files = {}
+_key_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _key_lock(key) -> threading.Lock:
+    """Per-key lock so two different models can load concurrently."""
+    with _registry_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def encoder_id(model_name: str = DEFAULT_MODEL, backend: str = None) -> str:
+    """
+    Name that identifies the vectors an encoder produces.
+
+    Quantized backends give slightly different embeddings, so caches keyed
+    on the model name must not mix them with fp32 PyTorch vectors.
+    """
+    backend = backend or EMBED_BACKEND
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def resolve_device(device: str = None, backend: str = "torch") -> str:
+    """
+    Device the model will run on, so `None` (auto-detect) and the device it
+    resolves to share one registry entry.
+    """
+    if backend != "torch":
+        return "cpu"
+    if device is None:
+        from sentence_transformers.util import get_device_name
+
+        device = get_device_name()  # what SentenceTransformer(device=None) picks
+    return device
+
+
+def onnx_model_dir(model_name: str) -> Path:
+    return ONNX_DIR / model_name.replace("/", "__")
+
+
+def _load_onnx(model_name: str, quantize: bool):
+    """Export (first time only) and load an ONNX Runtime encoder on CPU."""
+    from sentence_transformers import SentenceTransformer
+
+    local_dir = onnx_model_dir(model_name)
+    fp32_file = "onnx/model.onnx"
+    file_name = f"onnx/model_qint8_{ONNX_QUANT_CONFIG}.onnx" if quantize else fp32_file
+
+    if not (local_dir / fp32_file).exists():
+        exported = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        exported.save_pretrained(str(local_dir))
+    if quantize and not (local_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        base = SentenceTransformer(str(local_dir), device="cpu", backend="onnx", model_kwargs={"file_name": fp32_file})
+        export_dynamic_quantized_onnx_model(base, ONNX_QUANT_CONFIG, str(local_dir))
+
+    encoder = SentenceTransformer(str(local_dir), device="cpu", backend="onnx", model_kwargs={"file_name": file_name})
+    return encoder, local_dir / file_name
+
+
+def get_encoder(model_name: str = DEFAULT_MODEL, device: str = None, precision: str = "fp32", backend: str = None):
+    """
+    Return the shared SentenceTransformer for this configuration.
+
+    The first caller loads the model; concurrent callers for the same key
+    wait on its lock and receive the same instance.
+
+    Args:
+        model_name (str): sentence-transformers model name or path.
+        device (str, optional): "cpu", "cuda", ... (None = auto-detect).
+        precision (str): One of "fp32", "fp16", "bf16" (PyTorch backend only).
+        backend (str, optional): One of BACKENDS; defaults to EMBED_BACKEND.
+            ONNX backends always run on CPU.
+
+    Returns:
+        SentenceTransformer: Loaded, shared embedding model.
+    """
+    backend = backend or EMBED_BACKEND
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'. Choose from {PRECISIONS}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {BACKENDS}")
+    if backend != "torch" and precision != "fp32":
+        raise ValueError(f"precision='{precision}' only applies to the torch backend")
+
+    device = resolve_device(device, backend)
+    key = (model_name, device, precision, backend)
+    encoder = _encoders.get(key)
+    if encoder is not None:
+        return encoder
+
+    with _key_lock(key):
+        encoder = _encoders.get(key)
+        if encoder is None:
+            if backend == "torch":
+                from sentence_transformers import SentenceTransformer
+
+                encoder = SentenceTransformer(model_name, device=device)
+                if precision == "fp16":
+                    encoder = encoder.half()
+                elif precision == "bf16":
+                    encoder = encoder.bfloat16()
+                encoder.eval()
+            else:
+                encoder, model_file = _load_onnx(model_name, quantize=backend == "onnx-int8")
+                _model_files[key] = model_file
+            _encoders[key] = encoder
+    return encoder
+
+
+# ---------------------------
+# Memory reporting
+# ---------------------------
+def model_memory_bytes(encoder) -> int:
+    """Bytes held by a model's parameters and buffers (PyTorch backend)."""
+    total = 0
+    for tensor in list(encoder.parameters()) + list(encoder.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def encoder_memory() -> dict:
+    """
+    Memory used by every loaded encoder.
+
+    ONNX encoders report the size of their model file, which ONNX Runtime
+    keeps resident.
+
+    Returns:
+        dict: {"model|device|precision|backend": bytes}, plus a "total" entry.
+    """
+    report = {}
+    for key, encoder in list(_encoders.items()):
+        model_name, device, precision, backend = key
+        if key in _model_files:
+            size = _model_files[key].stat().st_size
+        else:
+            size = model_memory_bytes(encoder)
+        report[f"{model_name}|{device}|{precision}|{backend}"] = size
+    report["total"] = sum(report.values())
+    return report
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    first = get_encoder()
+    second = get_encoder(device=resolve_device())
+    print(f"✅ Shared instance: {first is second}")
+    for name, size in encoder_memory().items():
+        print(f"{name}: {size / 1e6:.1f} MB")
@@ -0,0 +1,306 @@
+# query_parser.py
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import sys
+
+# Make the Streamlit/ packages importable when run as a script
+if str(Path(__file__).resolve().parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_utils.branches import BRANCH_ALIASES, BRANCH_CODES, BRANCH_SHORT_MAP
+
+# ---------------------------
+# Vocabularies
+# ---------------------------
+LOC_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "college_list.csv"
+
+EXAMS = ("KCET", "COMEDK")
+
+CATEGORIES = (
+    "GM", "GMK", "OBC", "SC", "ST", "EWS", "1G", "2A", "2B", "3A", "3B",
+    "HKR", "Tulu", "Christian", "Muslim",
+)
+
+CITY_ALIASES = {"bengaluru": "Bangalore", "mysuru": "Mysore", "belagavi": "Belgaum", "mangaluru": "Mangalore",
+                "shivamogga": "Shimoga", "tumakuru": "Tumkur", "hubballi": "Hubli"}
+
+
+def branch_aliases() -> dict:
+    """
+    Upper-case alias (short code, full name, extra spelling) -> full branch
+    name, for aliases matched in any case. See BRANCH_CODES for the rest.
+    """
+    aliases = {name.upper(): name for name in BRANCH_SHORT_MAP}
+    aliases.update({short: name for name, short in BRANCH_SHORT_MAP.items()})
+    aliases.update(BRANCH_ALIASES)
+    return aliases
+
+
+_cities = None
+
+
+def known_cities() -> list:
+    """Cities from data/college_list.csv (read once)."""
+    global _cities
+    if _cities is None:
+        import pandas as pd
+
+        _cities = sorted(pd.read_csv(LOC_FILE)["City"].dropna().unique()) if LOC_FILE.exists() else []
+    return _cities
+
+
+# ---------------------------
+# Typed filters
+# ---------------------------
+@dataclass
+class QueryFilters:
+    """
+    Filters extracted from a free-text question.
+
+    Branch names are the full names (upper-cased, as in the RAG data);
+    empty tuples / None mean "not constrained". `text` is the question
+    with the recognised filter phrases removed.
+    """
+
+    exams: tuple = ()
+    branches: tuple = ()
+    categories: tuple = ()
+    cities: tuple = ()
+    years: tuple = ()
+    min_rank: int = None
+    max_rank: int = None
+    min_package: float = None
+    max_package: float = None
+    text: str = ""
+    matched: list = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not self.matched
+
+    def with_defaults(self, max_rank=None, min_package=None) -> "QueryFilters":
+        """
+        Fill bounds the question did not state from the settings panel.
+
+        A limit written in the question ("under 15k rank") wins over the
+        panel default, since it is the more specific request.
+        """
+        return replace(
+            self,
+            max_rank=self.max_rank if self.max_rank is not None else max_rank,
+            min_package=self.min_package if self.min_package is not None else min_package,
+            matched=list(self.matched),
+        )
+
+    def describe(self) -> str:
+        """Short human-readable summary ("KCET · CSE · rank ≤ 6000")."""
+        short = {name.upper(): code for name, code in BRANCH_SHORT_MAP.items()}
+        parts = list(self.exams)
+        parts += [short.get(b, b.title()) for b in self.branches]
+        parts += list(self.categories)
+        parts += list(self.cities)
+        parts += [str(y) for y in self.years]
+        if self.min_rank is not None:
+            parts.append(f"rank ≥ {self.min_rank}")
+        if self.max_rank is not None:
+            parts.append(f"rank ≤ {self.max_rank}")
+        if self.min_package is not None:
+            parts.append(f"≥ {self.min_package:g} LPA")
+        if self.max_package is not None:
+            parts.append(f"≤ {self.max_package:g} LPA")
+        return " · ".join(parts)
+
+
+# ---------------------------
+# Parser
+# ---------------------------
+NUMBER = r"(\d[\d,]*(?:\.\d+)?)\s*(k|thousand)?"
+RANK_WORDS = r"(?:(?:kcet|comedk)\s+)?(?:rank|ranks|cutoff|cut-off|cut off)?\s*(?:of\s+)?"
+UPPER_WORDS = r"under|below|within|upto|up to|less than|lesser than|at most|<=?|till"
+LOWER_WORDS = r"above|over|more than|greater than|at least|min(?:imum)?|>=?|from"
+RANK_WORD = r"(?:rank|ranks|cutoff|cut-off|cut off)"
+PACKAGE_WORD = r"(?:package|salary|ctc)"
+LPA_UNIT = r"lpa|lakhs?\s+per\s+annum"
+LAKH_UNIT = r"lakhs?\b|lacs?\b|l\b"
+PACKAGE_UNIT = rf"\s*(?:{LPA_UNIT}|{LAKH_UNIT})"
+
+# "1.2 lakh" is a rank next to a rank word (COMEDK ranks are usually written
+# in lakhs) and a package only with LPA / package / salary wording
+RANK_LAKH_RE = re.compile(
+    rf"(\b{RANK_WORD}\s+(?:(?:is|of|was|around|about|{UPPER_WORDS}|{LOWER_WORDS})\s+)?)?"
+    rf"\b(\d+(?:\.\d+)?)\s*(?:{LAKH_UNIT})(?=(\s+(?:(?:kcet|comedk)\s+)?{RANK_WORD}\b)?)", re.I
+)
+RANGE_RE = re.compile(rf"\bbetween\s+{RANK_WORDS}{NUMBER}\s+(?:and|to|-)\s+{NUMBER}\b(?!{PACKAGE_UNIT})", re.I)
+PACKAGE_RE = re.compile(
+    rf"(?:\b({PACKAGE_WORD})\s+)?(?:\b({UPPER_WORDS}|{LOWER_WORDS})\s+)?(?:({PACKAGE_WORD})\s+(?:of\s+)?)?"
+    rf"{NUMBER}\s*({LPA_UNIT}|{LAKH_UNIT})(\s+{PACKAGE_WORD}\b)?", re.I
+)
+RANK_BOUND_RE = re.compile(rf"(?:\b|(?<=\s))({UPPER_WORDS}|{LOWER_WORDS})\s+{RANK_WORDS}{NUMBER}\b(?!{PACKAGE_UNIT})", re.I)
+RANK_PLAIN_RE = re.compile(rf"\brank\s+(?:(?:of|is|was)\s+)?{NUMBER}\b(?!{PACKAGE_UNIT})", re.I)
+# Number first: "15000 rank", "5000th rank in KCET", "10k KCET rank"
+RANK_TRAILING_RE = re.compile(rf"\b{NUMBER}(?:st|nd|rd|th)?\s+(?:(?:kcet|comedk)\s+)?rank\b", re.I)
+YEAR_RE = re.compile(r"\b(20[1-3]\d)\b")
+
+
+def _number(value: str, suffix: str = None) -> float:
+    number = float(value.replace(",", ""))
+    return number * 1000 if suffix else number
+
+
+def _is_upper(word: str) -> bool:
+    return re.fullmatch(UPPER_WORDS, word.lower()) is not None
+
+
+def _word_re(words, flags=re.I) -> re.Pattern:
+    alternatives = sorted((re.escape(w) for w in words), key=len, reverse=True)
+    return re.compile(r"(?<![\w&])(" + "|".join(alternatives) + r")(?![\w&])", flags)
+
+
+_BRANCH_RE = _word_re(branch_aliases())
+_BRANCH_CODE_RE = _word_re(BRANCH_CODES, flags=0)
+_EXAM_RE = _word_re(EXAMS)
+_CATEGORY_RE = re.compile(r"(?<!\w)(" + "|".join(sorted(CATEGORIES, key=len, reverse=True)) + r")(?!\w)")
+
+
+def parse_query(query: str, cities: list = None) -> QueryFilters:
+    """
+    Extract exam, branch, category, city, rank and package filters from text.
+
+    Args:
+        query (str): User question, e.g. "CSE colleges under KCET rank 6000 with 5 LPA".
+        cities (list, optional): Known city names (defaults to data/college_list.csv).
+
+    Returns:
+        QueryFilters: Parsed filters; `text` holds what was not consumed.
+    """
+    filters = QueryFilters()
+    text = query
+
+    def consume(match, label):
+        filters.matched.append(label)
+        return " "
+
+    # Lakh ranks ("1 lakh rank", "rank is 1.2 lakh") become plain numbers first
+    def rank_lakh(m):
+        if not (m.group(1) or m.group(3)):
+            return m.group(0)
+        return f"{m.group(1) or ''}{round(float(m.group(2)) * 100000)}"
+
+    text = RANK_LAKH_RE.sub(rank_lakh, text)
+
+    # Package before rank so "5 LPA" is never read as a rank
+    def package(m):
+        bound, value, suffix, unit = m.group(2), m.group(4), m.group(5), m.group(6)
+        if not re.fullmatch(LPA_UNIT, unit, re.I) and not (m.group(1) or m.group(3) or m.group(7)):
+            return m.group(0)  # bare "5 lakh": neither a package nor a rank
+        amount = _number(value, suffix)
+        if bound and _is_upper(bound):
+            filters.max_package = amount
+        else:
+            filters.min_package = amount
+        return consume(m, "package")
+
+    text = PACKAGE_RE.sub(package, text)
+
+    def rank_range(m):
+        low, high = sorted((int(_number(m.group(1), m.group(2))), int(_number(m.group(3), m.group(4)))))
+        filters.min_rank, filters.max_rank = low, high
+        return consume(m, "rank")
+
+    def rank_bound(m):
+        amount = int(_number(m.group(2), m.group(3)))
+        if _is_upper(m.group(1)):
+            filters.max_rank = amount
+        else:
+            filters.min_rank = amount
+        return consume(m, "rank")
+
+    def rank_plain(m):
+        filters.max_rank = int(_number(m.group(1), m.group(2)))
+        return consume(m, "rank")
+
+    text = RANGE_RE.sub(rank_range, text)
+    text = RANK_BOUND_RE.sub(rank_bound, text)
+    if filters.max_rank is None and filters.min_rank is None:
+        text = RANK_PLAIN_RE.sub(rank_plain, text)
+    if filters.max_rank is None and filters.min_rank is None:
+        text = RANK_TRAILING_RE.sub(rank_plain, text)
+
+    # Years: whatever 20xx numbers are left ("cutoff 2024" is a year, not a rank)
+    years = []
+
+    def year(m):
+        if int(m.group(1)) not in years:
+            years.append(int(m.group(1)))
+        return consume(m, "year")
+
+    text = YEAR_RE.sub(year, text)
+    filters.years = tuple(years)
+
+    # Exams (the rank phrase may already have consumed "KCET rank")
+    exams = {m.upper() for m in _EXAM_RE.findall(query)}
+    filters.exams = tuple(e for e in EXAMS if e in exams)
+    text = _EXAM_RE.sub(lambda m: consume(m, "exam"), text)
+    if filters.exams and "exam" not in filters.matched:
+        filters.matched.append("exam")
+
+    # Branches (short codes, full names and common spellings; two-letter
+    # codes only in capitals so "is" / "me" / "ai" stay ordinary words)
+    aliases = {**branch_aliases(), **BRANCH_CODES}
+    branches = []
+
+    def branch(m):
+        name = aliases[m.group(1).upper()].upper()
+        if name not in branches:
+            branches.append(name)
+        return consume(m, "branch")
+
+    text = _BRANCH_RE.sub(branch, text)
+    text = _BRANCH_CODE_RE.sub(branch, text)
+    filters.branches = tuple(branches)
+
+    # Categories are written in capitals ("GM", "2A"); lower-case "st"/"sc" are ignored
+    categories = []
+
+    def category(m):
+        if m.group(1) not in categories:
+            categories.append(m.group(1))
+        return consume(m, "category")
+
+    text = _CATEGORY_RE.sub(category, text)
+    filters.categories = tuple(categories)
+
+    # Cities
+    known = {c.lower(): c for c in (cities if cities is not None else known_cities())}
+    known.update({alias: city for alias, city in CITY_ALIASES.items() if city.lower() in known})
+    found = []
+    if known:
+        def city(m):
+            name = known[m.group(1).lower()]
+            if name not in found:
+                found.append(name)
+            return consume(m, "city")
+
+        text = _word_re(known).sub(city, text)
+    filters.cities = tuple(found)
+
+    filters.text = re.sub(r"\s+", " ", text).strip()
+    return filters
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    examples = [
+        "CSE colleges under KCET rank 6000 with 5 LPA",
+        "Best ECE or ISE colleges in Bengaluru below 15k rank for GM",
+        "COMEDK colleges between rank 2000 and 8000 with package above 8 LPA",
+        "RVCE CSE 2A cutoff 2024",
+        "Mechanical seats in Mysuru for SC students under rank 40000",
+        "Which colleges have good placements?",
+        "I got 15000 rank in KCET, which college is best for me?",
+    ]
+    for q in examples:
+        f = parse_query(q, cities=["Bangalore", "Mysore"])
+        print(f"🔎 {q}\n   -> {f.describe() or '(no filters)'} | text: {f.text!r}")
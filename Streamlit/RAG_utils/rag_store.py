@@ -0,0 +1,93 @@
+# rag_store.py
+"""
+RAG row metadata as a memory-mapped Arrow IPC file.
+
+Row i of the table describes vector i of the FAISS index. Usage (from the
+Streamlit/ folder), to convert a metadata pickle from the notebook once:
+    python -m RAG_utils.rag_store
+"""
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# ---------------------------
+# Paths
+# ---------------------------
+DATA_DIR = Path(__file__).resolve().parent / "RAG_data"
+RAG_META_FILE = DATA_DIR / "final_rag_meta.arrow"
+LEGACY_PICKLE_FILE = DATA_DIR / "final_rag_df.pkl"
+
+
+# ---------------------------
+# Write
+# ---------------------------
+def to_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Arrow table for a metadata frame, with text columns dictionary-encoded.
+
+    College, branch, category and the rest repeat across thousands of rows,
+    so dictionary columns keep the file (and every mapped page) small and
+    load as pandas categoricals.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    columns = []
+    for column in table.columns:
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            column = column.dictionary_encode()
+        columns.append(column)
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+def write_rag_meta(df: pd.DataFrame, meta_file=RAG_META_FILE) -> Path:
+    """
+    Write metadata as an uncompressed Arrow IPC file (so it can be mapped).
+
+    Written to a temp path and swapped in, so readers never see half a file.
+    """
+    meta_file = Path(meta_file)
+    table = to_table(df)
+    tmp_file = meta_file.with_suffix(meta_file.suffix + ".tmp")
+    with pa.OSFile(str(tmp_file), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_file, meta_file)
+    return meta_file
+
+
+# ---------------------------
+# Read (memory-mapped, zero-copy)
+# ---------------------------
+def read_rag_meta(meta_file=RAG_META_FILE) -> pa.Table:
+    """
+    Open the metadata as a memory-mapped table.
+
+    Buffers point into the OS page cache, so every worker process shares
+    one copy instead of unpickling its own.
+    """
+    meta_file = Path(meta_file)
+    if not meta_file.exists():
+        raise FileNotFoundError(
+            f"{meta_file} not found. Build it with `python -m RAG_utils.embed_corpus`, "
+            f"or convert an existing {LEGACY_PICKLE_FILE.name} with `python -m RAG_utils.rag_store`."
+        )
+    return ipc.open_file(pa.memory_map(str(meta_file), "r")).read_all()
+
+
+# ---------------------------
+# One-off conversion from the notebook pickle
+# ---------------------------
+def convert_pickle(pickle_file=LEGACY_PICKLE_FILE, meta_file=RAG_META_FILE) -> Path:
+    """Convert `final_rag_df.pkl` (offline; the app never unpickles)."""
+    df = pd.read_pickle(pickle_file)
+    return write_rag_meta(df.reset_index(drop=True), meta_file)
+
+
+if __name__ == "__main__":
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else LEGACY_PICKLE_FILE
+    written = convert_pickle(source)
+    table = read_rag_meta(written)
+    print(f"✅ {source.name} -> {written.name}: {table.num_rows} rows, {written.stat().st_size / 1e6:.1f} MB")
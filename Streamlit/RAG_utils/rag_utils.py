@@ -1,12 +1,23 @@
 import pandas as pd
 import numpy as np
-import faiss
-import pickle
+import functools
+import os
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
+import sys
+import threading
+import weakref
 import streamlit as st
 
-from pathlib import Path
+# Make the RAG_utils package importable when run as a script
+if str(Path(__file__).resolve().parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from RAG_utils.model_registry import get_encoder
+from RAG_utils.index_builder import CONTENT_FIELDS, CONTENT_TEMPLATE, configure_search, index_file_for
+from RAG_utils.lexical_index import BM25Index, reciprocal_rank_fusion
+from RAG_utils.query_parser import QueryFilters
+from RAG_utils.rag_store import RAG_META_FILE, read_rag_meta
+from perf_utils.tracing import span, traced
 
 # ---------------------------
 # Paths
@@ -15,127 +26,509 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent  # this file's folder
 DATA_DIR = BASE_DIR.parent / "RAG_utils" / "RAG_data"
 
-RAG_DF_FILE = DATA_DIR / "final_rag_df.pkl"
-RAG_INDEX_FILE = DATA_DIR / "final_rag_index.faiss"
+# Which FAISS variant to serve ("flat", "fp16", "sq8", "hnsw", "ivfpq"),
+# built by `python -m RAG_utils.index_builder`. Streamlit exposes root-level
+# secrets as env vars, so this can also be set in secrets.toml.
+RAG_INDEX_KIND = os.environ.get("RAG_INDEX_KIND", "flat")
+RAG_INDEX_NPROBE = int(os.environ.get("RAG_INDEX_NPROBE", "16"))
+RAG_INDEX_EF_SEARCH = int(os.environ.get("RAG_INDEX_EF_SEARCH", "64"))
 RAW_CSV_FILE = DATA_DIR / "final_rag.csv"
+LOC_FILE = BASE_DIR.parent.parent / "data" / "college_list.csv"
+
+# ---------------------------
+# Lazy data accessors
+# ---------------------------
+# Nothing is read at import time: each artifact (and faiss itself) is
+# loaded on first use and then shared by every session in the process.
+@st.cache_resource(show_spinner=False)
+def get_rag_table():
+    """Row metadata aligned with the FAISS index, memory-mapped (see rag_store)."""
+    return read_rag_meta(RAG_META_FILE)
+
+
+@st.cache_resource(show_spinner=False)
+def get_rag_df() -> pd.DataFrame:
+    """
+    Pandas view of the metadata table.
+
+    Text columns come back as categoricals over the Arrow dictionaries and
+    numeric columns without nulls reference the mapped pages directly.
+    """
+    return get_rag_table().to_pandas(split_blocks=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_rag_index(kind: str = None):
+    """FAISS index over the RAG rows (variant chosen by RAG_INDEX_KIND)."""
+    import faiss
+
+    index = faiss.read_index(str(index_file_for(kind or RAG_INDEX_KIND)))
+    return configure_search(index, nprobe=RAG_INDEX_NPROBE, ef_search=RAG_INDEX_EF_SEARCH)
 
 
+@st.cache_resource(show_spinner=False)
+def get_raw_df() -> pd.DataFrame:
+    """Raw CSV with full info for drill-down and context."""
+    return pd.read_csv(RAW_CSV_FILE)
+
+
+@st.cache_resource(show_spinner=False)
+def get_college_loc_map() -> dict:
+    """College name or code (as used in the RAG data) -> city."""
+    college_loc_df = pd.read_csv(LOC_FILE)
+    loc_map = dict(zip(college_loc_df["Name"], college_loc_df["City"]))
+    loc_map.update(zip(college_loc_df["Code"], college_loc_df["City"]))
+    return loc_map
 
-raw_df = pd.read_csv(RAW_CSV_FILE)
-# Separate 2024 and 2025 rows
-df_2024 = raw_df[raw_df['Year']==2024][['College', 'Branch', 'Avg_Package_LPA']]
-df_2025 = raw_df[raw_df['Year']==2025].drop(columns=['Avg_Package_LPA'])
 
-# Merge to copy 2024 Avg_Package_LPA into 2025
-raw_df.loc[raw_df['Year']==2025, 'Avg_Package_LPA'] = df_2025.merge(
-    df_2024,
-    on=['College', 'Branch'],
-    how='left'
-)['Avg_Package_LPA']
+# Backwards compatible module attributes (`from rag_utils import rag_index`)
+_LAZY_ATTRS = {
+    "rag_df": get_rag_df,
+    "rag_index": get_rag_index,
+    "raw_df": get_raw_df,
+    "college_loc_map": get_college_loc_map,
+}
 
 
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ---------------------------
-# Load main RAG data
+# Per-frame memo
 # ---------------------------
-with open(RAG_DF_FILE, "rb") as f:
-    rag_df = pickle.load(f)
+class FrameMemo:
+    """
+    Value derived from a DataFrame, built once per frame object.
+
+    Entries are keyed by id() and hold only a weak reference to the frame,
+    so the memo never keeps a frame alive, and an entry is dropped as soon
+    as its frame is collected (before the id can be reused).
+    """
+
+    def __init__(self, build):
+        functools.update_wrapper(self, build)
+        self.build = build
+        self._entries = {}  # id(df) -> (weakref to df, value)
+        self._lock = threading.Lock()
 
-rag_index = faiss.read_index(str(RAG_INDEX_FILE))
+    def _lookup(self, df):
+        entry = self._entries.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry
+        return None
+
+    def __call__(self, df: pd.DataFrame):
+        entry = self._lookup(df)
+        if entry is None:
+            with self._lock:  # one build per frame, even with concurrent sessions
+                entry = self._lookup(df)
+                if entry is None:
+                    key = id(df)
+                    ref = weakref.ref(df, lambda dead, key=key: self._forget(key, dead))
+                    entry = (ref, self.build(df))
+                    self._entries[key] = entry
+        return entry[1]
+
+    def _forget(self, key, ref):
+        if self._entries.get(key, (None,))[0] is ref:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def frame_memo(build):
+    """Decorator: memoize a one-argument builder per DataFrame (see FrameMemo)."""
+    return FrameMemo(build)
 
-# Load raw CSV for drill-down (full info)
-raw_df = pd.read_csv(RAW_CSV_FILE)
 
 # ---------------------------
-# Load college locations (for printing)
+# Shared SentenceTransformer model (see model_registry)
 # ---------------------------
-LOC_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "college_list.csv"
-college_loc_df = pd.read_csv(LOC_FILE)
-college_loc_map = dict(zip(college_loc_df["Name"], college_loc_df["City"]))
+def load_model():
+    """Return the process-wide all-mpnet-base-v2 encoder."""
+    return get_encoder("all-mpnet-base-v2")  # high-quality embedding
 
 # ---------------------------
-# Load & cache SentenceTransformer model
+# Columnar views used for filter-aware search
 # ---------------------------
-@st.cache_resource(show_spinner=False)
-def load_model():
-    """Load SentenceTransformer model (cached for efficiency)."""
-    model = SentenceTransformer("all-mpnet-base-v2")  # high-quality embedding
-    return model
+FILTER_FIELDS = ["College", "Branch", "Category", "Exam", "Year"]
+
+
+@frame_memo
+def search_columns(df: pd.DataFrame) -> dict:
+    """
+    NumPy views of the columns search_colleges filters and deduplicates on.
+
+    Computed once per metadata frame (the frames are process-wide cached
+    resources, so this is effectively once per process).
+    """
+    groups, _ = pd.factorize(pd.MultiIndex.from_arrays([df["College"], df["Branch"]]))
+    return {
+        "groups": groups,
+        "cutoff": df["Cutoff_rank"].to_numpy(),
+        "package": df["Avg_Package_LPA"].to_numpy(),
+        # Columns result rows are built from; kept as pandas arrays so a
+        # categorical column is only decoded for the rows actually returned
+        "fields": {c: df[c].array for c in CONTENT_FIELDS + ["content"] if c in df.columns},
+        # (codes, labels) for the columns parsed query filters match on
+        "codes": {c: pd.factorize(df[c]) for c in FILTER_FIELDS},
+    }
+
+
+# Below this fraction of allowed rows a filtered HNSW graph walk tends to
+# strand itself, so the exact flat storage underneath it is searched instead.
+HNSW_FILTER_MIN_FRACTION = 0.2
+
+
+def filtered_search(index, query_vec: np.ndarray, k: int, allowed: np.ndarray):
+    """
+    One FAISS search restricted to rows where `allowed` is True.
+
+    The filter is passed as an ID bitmap selector, so rejected rows are
+    skipped inside FAISS instead of being fetched and dropped afterwards.
+    """
+    import faiss
+
+    bitmap = np.packbits(allowed, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(allowed), faiss.swig_ptr(bitmap))
+    inner = faiss.downcast_index(index)
+    if hasattr(inner, "nprobe"):
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=inner.nprobe)
+    elif hasattr(inner, "hnsw"):
+        if allowed.mean() < HNSW_FILTER_MIN_FRACTION:
+            index = faiss.downcast_index(inner.storage)
+            params = faiss.SearchParameters(sel=selector)
+        else:
+            # The graph walk must see at least k candidates that pass the filter
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(inner.hnsw.efSearch, 2 * k))
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    # `bitmap` stays referenced here until the search returns
+    return index.search(query_vec, k, params=params)
+
 
 # ---------------------------
-# FAISS search function with Colab-style filtering & deduplication
+# Shared search helpers
 # ---------------------------
-def search_colleges(query, model, index, df=rag_df, top_k=10, max_rank=None, min_package=None):
+RESULT_COLUMNS = ["College", "Branch", "content", "faiss_dist"]
+
+
+def allowed_rows(cols: dict, max_rank=None, min_package=None, filters: QueryFilters = None) -> np.ndarray:
     """
-    Search colleges using FAISS embeddings.
-    Deduplicate based on 'College+Branch' and filter by Cutoff_rank / Avg_Package_LPA.
-    Returns top_results DataFrame.
+    Boolean mask of rows that pass the numeric filters and, if given,
+    the filters parsed from the question (see query_parser).
+    """
+    allowed = np.ones(len(cols["groups"]), dtype=bool)
+    if max_rank is not None:
+        allowed &= cols["cutoff"] <= max_rank
+    if min_package is not None:
+        allowed &= cols["package"] >= min_package
+    if filters is None:
+        return allowed
+
+    if filters.min_rank is not None:
+        allowed &= cols["cutoff"] >= filters.min_rank
+    if filters.max_rank is not None:
+        allowed &= cols["cutoff"] <= filters.max_rank
+    if filters.min_package is not None:
+        allowed &= cols["package"] >= filters.min_package
+    if filters.max_package is not None:
+        allowed &= cols["package"] <= filters.max_package
+
+    colleges = ()
+    if filters.cities:
+        colleges = [c for c, city in get_college_loc_map().items() if city in filters.cities]
+    for column, values in (
+        ("Exam", filters.exams),
+        ("Branch", filters.branches),
+        ("Category", filters.categories),
+        ("Year", filters.years),
+        ("College", colleges),
+    ):
+        if values or (column == "College" and filters.cities):
+            codes, labels = cols["codes"][column]
+            wanted = labels.get_indexer(list(values))
+            allowed &= np.isin(codes, wanted[wanted >= 0])
+    return allowed
+
+
+def group_depth(groups: np.ndarray, allowed: np.ndarray, top_k: int) -> int:
+    """
+    Row hits needed so that top_k distinct College+Branch groups are
+    guaranteed even if every group's rows rank ahead of the next group.
+    """
+    largest_group = int(np.bincount(groups[allowed]).max())
+    return int(min(allowed.sum(), top_k * largest_group))
+
+
+def first_per_group(rows: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Positions (into `rows`, best first) of each group's best row."""
+    _, first = np.unique(groups[rows], return_index=True)
+    return np.sort(first)
+
+
+def format_results(df: pd.DataFrame, rows: np.ndarray, faiss_dist) -> pd.DataFrame:
+    """Result frame for the given rows, with a `content` line per row."""
+    fields = {name: np.asarray(values.take(rows)) for name, values in search_columns(df)["fields"].items()}
+
+    # Ensure 'content' is present (a handful of rows: plain f-strings are fastest)
+    content = fields.get("content")
+    if content is None:
+        content = [CONTENT_TEMPLATE.format(*values) for values in zip(*(fields[c] for c in CONTENT_FIELDS))]
+
+    return pd.DataFrame({
+        "College": fields["College"],
+        "Branch": fields["Branch"],
+        "content": content,
+        "faiss_dist": faiss_dist,
+    }, columns=RESULT_COLUMNS)
+
+
+# ---------------------------
+# FAISS search with pre-filtering & deduplication
+# ---------------------------
+def dense_hits(query, model, index, cols: dict, allowed: np.ndarray, top_k: int):
+    """
+    Best row per College+Branch from one filtered FAISS search.
+
+    Returns:
+        tuple: (row ids, distances), best first, at most top_k.
     """
+    groups = cols["groups"]
+
     # Encode query
     query_vec = model.encode([query], normalize_embeddings=True)
     query_vec = np.array(query_vec, dtype=np.float32)
 
-    # Retrieve more than needed for post-filtering
-    k = top_k * 3
-    distances, indices = index.search(query_vec, k)
-    results = df.iloc[indices[0]].copy()
-    results["faiss_dist"] = distances[0]
+    k = group_depth(groups, allowed, top_k)
+    with span("faiss_search"):
+        if allowed.all():
+            distances, indices = index.search(query_vec, k)
+        else:
+            distances, indices = filtered_search(index, query_vec, k, allowed)
+    distances, indices = distances[0], indices[0]
+    found = indices >= 0
+    distances, indices = distances[found], indices[found]
+
+    # Deduplicate: keep best match per College+Branch (lowest distance)
+    keep = first_per_group(indices, groups)[:top_k]
+    return indices[keep], distances[keep]
+
+
+@traced("search")
+def search_colleges(query, model, index=None, df=None, top_k=10, max_rank=None, min_package=None, filters=None):
+    """
+    Search colleges using FAISS embeddings.
+    Rank / package filters (and any parsed `filters`, a QueryFilters) are
+    applied inside the FAISS search (ID bitmap),
+    and exactly `top_k` College+Branch hits are returned whenever that many
+    matching groups exist, from a single search call.
+    `index` and `df` default to the lazily loaded RAG index and metadata.
+    Returns top_results DataFrame.
+    """
+    if index is None:
+        index = get_rag_index()
+    if df is None:
+        df = get_rag_df()
+    cols = search_columns(df)
+
+    # Build the allowed-row bitmap from numeric / parsed filters
+    allowed = allowed_rows(cols, max_rank, min_package, filters)
+    if not allowed.any():
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    rows, distances = dense_hits(query, model, index, cols, allowed, top_k)
+    return format_results(df, rows, distances)
+
+
+# ---------------------------
+# Hybrid lexical (BM25) + dense retrieval
+# ---------------------------
+@frame_memo
+def lexical_index(df: pd.DataFrame) -> BM25Index:
+    """BM25 index for `df`, built once per frame (frames are process-wide cached)."""
+    return BM25Index(df)
+
+
+@traced("search")
+def hybrid_search(query, model, index=None, df=None, top_k=10, max_rank=None, min_package=None,
+                  filters=None, structured_fast_path=True):
+    """
+    Search colleges with BM25 and FAISS, fused by reciprocal rank.
+
+    Exact codes ("RVCE CSE GM 2024") are matched by the lexical index,
+    paraphrases by the embeddings. When every query word is an indexed
+    code/name (see BM25Index.is_structured) the lexical hits are returned
+    directly and the query is never encoded. The same holds when parsed
+    `filters` (QueryFilters) leave nothing but structural words.
+
+    Args and filters are the same as `search_colleges`. `faiss_dist` is
+    NaN for hits that only the lexical index found.
+
+    Returns:
+        pd.DataFrame: College, Branch, content, faiss_dist (best first).
+    """
+    if df is None:
+        df = get_rag_df()
+    cols = search_columns(df)
+    groups = cols["groups"]
+
+    allowed = allowed_rows(cols, max_rank, min_package, filters)
+    if not allowed.any():
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    bm25 = lexical_index(df)
+    with span("bm25_search"):
+        _, lex_rows = bm25.search(query, group_depth(groups, allowed, top_k), allowed, tie_break=cols["cutoff"])
+    lex_rows = lex_rows[first_per_group(lex_rows, groups)][:top_k]
+
+    structured = bm25.is_structured(query) or (
+        filters is not None and not filters.is_empty() and bm25.is_structured(filters.text, require_match=False)
+    )
+    if structured_fast_path and len(lex_rows) and structured:
+        return format_results(df, lex_rows, np.nan)
 
-    # ---------------------------
-    # Apply numeric filters if provided
-    # ---------------------------
+    if index is None:
+        index = get_rag_index()
+    dense_rows, distances = dense_hits(query, model, index, cols, allowed, top_k)
+
+    # Fuse per College+Branch; keep the dense row (and distance) when both found it
+    fused = reciprocal_rank_fusion([groups[dense_rows].tolist(), groups[lex_rows].tolist()])
+    best_row = {**dict(zip(groups[lex_rows].tolist(), lex_rows)), **dict(zip(groups[dense_rows].tolist(), dense_rows))}
+    dist_by_group = dict(zip(groups[dense_rows].tolist(), distances))
+    ranked = sorted(fused, key=fused.get, reverse=True)[:top_k]
+
+    rows = np.array([best_row[g] for g in ranked], dtype=np.int64)
+    faiss_dist = np.array([dist_by_group.get(g, np.nan) for g in ranked], dtype=np.float32)
+    return format_results(df, rows, faiss_dist)
+
+
+# ---------------------------
+# Per College+Branch aggregates for result enrichment
+# ---------------------------
+def build_group_summary(full_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per College+Branch with the figures retrieval results need.
+
+    Columns: Min_Cutoff (best closing rank over all categories, rounds,
+    years and exams), Avg_Package_LPA (mean), Best_Package_LPA (best yearly
+    average), Max_Package_LPA, NIRF_Rank, Total_Annual and Exams.
+    """
+    grouped = full_df.groupby(["College", "Branch"], sort=True)
+    summary = grouped.agg(
+        Min_Cutoff=("Cutoff_rank", "min"),
+        Avg_Package_LPA=("Avg_Package_LPA", "mean"),
+        Best_Package_LPA=("Avg_Package_LPA", "max"),
+        Max_Package_LPA=("Max_Package_LPA", "max"),
+        NIRF_Rank=("NIRF_Rank", "min"),
+        Total_Annual=("Total_Annual", "mean"),
+    )
+    summary["Avg_Package_LPA"] = summary["Avg_Package_LPA"].round(2)
+    exams = full_df[["College", "Branch", "Exam"]].drop_duplicates().sort_values("Exam")
+    summary["Exams"] = exams.groupby(["College", "Branch"])["Exam"].agg("/".join)
+    return summary
+
+
+@frame_memo
+def group_summary(full_df: pd.DataFrame) -> pd.DataFrame:
+    """Summary for `full_df`, built once per frame (frames are process-wide cached)."""
+    return build_group_summary(full_df)
+
+
+@traced("post_filter")
+def enrich_results(results: pd.DataFrame, full_df: pd.DataFrame = None, max_rank=None, min_package=None) -> pd.DataFrame:
+    """
+    Attach College+Branch aggregates to search results and apply filters.
+
+    A keyed lookup into the precomputed summary, so each hit gains exactly
+    one row no matter how many categories, rounds and years are loaded.
+    Filters keep a hit when its best cutoff is within `max_rank` and its
+    best yearly package is at least `min_package`.
+
+    Args:
+        results (pd.DataFrame): search_colleges output.
+        full_df (pd.DataFrame, optional): Raw rows; defaults to the raw CSV.
+        max_rank (int, optional): Highest acceptable cutoff rank.
+        min_package (float, optional): Lowest acceptable average package (LPA).
+
+    Returns:
+        pd.DataFrame: Results with summary columns, in the original order.
+    """
+    summary = group_summary(get_raw_df() if full_df is None else full_df)
+    keys = pd.MultiIndex.from_arrays([results["College"], results["Branch"]])
+    aggregates = summary.reindex(keys).reset_index(drop=True)
+    enriched = pd.concat([results.reset_index(drop=True), aggregates], axis=1)
+
+    keep = enriched["Min_Cutoff"].notna()
     if max_rank is not None:
-        results = results[results["Cutoff_rank"] <= max_rank]
+        keep &= enriched["Min_Cutoff"] <= max_rank
     if min_package is not None:
-        results = results[results["Avg_Package_LPA"] >= min_package]
+        keep &= enriched["Best_Package_LPA"] >= min_package
+    return enriched[keep].reset_index(drop=True)
 
-    # ---------------------------
-    # Deduplicate: keep best match per College+Branch (lowest distance)
-    # ---------------------------
-    results_filtered = results.sort_values("faiss_dist").drop_duplicates(subset=["College", "Branch"], keep="first")
 
-    # Keep top_k final results
-    top_results = results_filtered.head(top_k)
+# ---------------------------
+# Precomputed drill-down cube (raw_df)
+# ---------------------------
+def build_drilldown_cube(full_df: pd.DataFrame) -> dict:
+    """
+    Year x Exam cutoff / package tables for every College+Branch, in one pass.
+
+    Same aggregation as the old per-click pivot tables: cutoffs rounded to
+    int then min, packages rounded to 2 decimals then mean.
 
-    # Ensure 'content' is present
-    if "content" not in top_results.columns:
-        top_results["content"] = top_results.apply(
-            lambda row: f"{row['College']} | {row['Branch']} | {row['Category']} | Cutoff: {row['Cutoff_rank']} | Exam: {row['Exam']} | Year: {row['Year']} | Avg Package: {row['Avg_Package_LPA']}",
-            axis=1
-        )
+    Returns:
+        dict: {college: {branch: {"cutoff": DataFrame, "package": DataFrame}}}
+    """
+    df = full_df[["College", "Branch", "Year", "Exam", "Cutoff_rank", "Avg_Package_LPA"]].assign(
+        Cutoff_rank=full_df["Cutoff_rank"].round(0).astype(int),
+        Avg_Package_LPA=full_df["Avg_Package_LPA"].round(2),
+    )
+    agg = df.groupby(["College", "Branch", "Year", "Exam"], sort=True).agg(
+        cutoff=("Cutoff_rank", "min"), package=("Avg_Package_LPA", "mean")
+    )
+    cutoff = agg["cutoff"].unstack("Exam")
+    package = agg["package"].unstack("Exam")
+
+    cube = {}
+    for (college, branch), rows in cutoff.groupby(level=["College", "Branch"], sort=False).indices.items():
+        # Exams a branch has no rows for are dropped, as pivot_table does
+        branch_cutoff = cutoff.iloc[rows].droplevel(["College", "Branch"]).dropna(axis=1, how="all")
+        branch_package = package.iloc[rows].droplevel(["College", "Branch"]).dropna(axis=1, how="all")
+        if not branch_cutoff.isna().any().any():
+            branch_cutoff = branch_cutoff.astype(int)
+        cube.setdefault(college, {})[branch] = {"cutoff": branch_cutoff, "package": branch_package}
+    return cube
+
+
+@frame_memo
+def drilldown_cube(full_df: pd.DataFrame) -> dict:
+    """Cube for `full_df`, built once per frame (frames are process-wide cached)."""
+    return build_drilldown_cube(full_df)
+
+
+@st.cache_resource(show_spinner=False)
+def get_drilldown_store() -> dict:
+    """Drill-down cube over the raw CSV, shared by all sessions."""
+    return drilldown_cube(get_raw_df())
 
-    return top_results[["College", "Branch", "content", "faiss_dist"]].reset_index(drop=True)
 
 # ---------------------------
 # Drill-down college info by branch (raw_df)
 # ---------------------------
-def drill_down_college(college_name, full_df):
+@traced("drill_down")
+def drill_down_college(college_name, full_df=None):
     """
     Returns branch-aware drill-down info for a selected college.
-    Each branch gets pivot tables for Cutoff and Avg Package per Year and Exam.
-    Handles duplicate Year-Exam entries by aggregating.
-    """
-    df = full_df[full_df["College"] == college_name].copy()
-    df["Cutoff_rank"] = df["Cutoff_rank"].round(0).astype(int)
-    df["Avg_Package_LPA"] = df["Avg_Package_LPA"].round(2)
-
-    branch_dict = {}
-    for branch, branch_df in df.groupby("Branch"):
-        pivot_cutoff = branch_df.pivot_table(
-            index="Year",
-            columns="Exam",
-            values="Cutoff_rank",
-            aggfunc="min"
-        )
-        pivot_package = branch_df.pivot_table(
-            index="Year",
-            columns="Exam",
-            values="Avg_Package_LPA",
-            aggfunc="mean"
-        )
-        branch_dict[branch] = {"cutoff": pivot_cutoff, "package": pivot_package}
-
-    return branch_dict
+    Each branch gets tables for Cutoff and Avg Package per Year and Exam,
+    looked up from the precomputed cube (treat them as read-only).
+    `full_df` defaults to the raw CSV.
+    """
+    cube = get_drilldown_store() if full_df is None else drilldown_cube(full_df)
+    return dict(cube.get(college_name, {}))
 
 # ---------------------------
 # Pretty-print FAISS results with content only
@@ -154,13 +547,13 @@ if __name__ == "__main__":
     model = load_model()
     query = "Best colleges for COMPUTER SCIENCE AND ENGINEERING (CSE) under KCET rank 6000"
 
-    top_results = search_colleges(query, model, rag_index, top_k=20, max_rank=6000, min_package=5.0)
+    top_results = search_colleges(query, model, top_k=20, max_rank=6000, min_package=5.0)
     print_college_preview(top_results)
 
     # Drill-down uses raw CSV for full details
     if not top_results.empty:
         first_college = top_results.iloc[0]["College"]
-        drill_info = drill_down_college(first_college, raw_df)
+        drill_info = drill_down_college(first_college, get_raw_df())
         for branch, data in drill_info.items():
             print(f"\n📊 Drill-down for {first_college} | {branch}")
             print("🔹 Cutoff Table:")
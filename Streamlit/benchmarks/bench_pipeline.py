@@ -0,0 +1,330 @@
+# bench_pipeline.py
+"""
+Benchmark the FAQ retrieval-and-answer pipeline, stage by stage.
+
+Runs a fixed query set through the same calls pages/faq.py makes, with a
+local stub (benchmarks/stub_llm.py) standing in for OpenRouter, and writes
+p50/p95/p99 latency per stage, throughput under N concurrent sessions and
+peak RSS as JSON, so two runs can be compared.
+
+Usage (from the Streamlit/ folder):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --concurrency 1 4 8 --repeats 5
+    python -m benchmarks.bench_pipeline --compare benchmarks/results/before.json
+
+Without a built FAISS index (RAG_data/final_rag_index*.faiss) the search
+runs over random vectors of the right shape: timings stay representative,
+the retrieved colleges do not.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:  # peak RSS (Unix only)
+    import resource
+except ImportError:
+    resource = None
+
+# Make the Streamlit/ packages importable when run as a script
+if str(Path(__file__).resolve().parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_llm import start_stub_server
+from RAG_utils.context_builder import build_context
+from RAG_utils.index_builder import build_index, configure_search, index_file_for
+from RAG_utils.llm_utils import OpenRouterClient
+from RAG_utils.query_parser import parse_query
+from RAG_utils import rag_utils
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (question, settings-panel max rank, settings-panel min package); a mix of
+# exact-code questions (lexical fast path) and free-text ones (FAISS)
+QUERIES = [
+    ("Top CSE colleges in Bangalore under 11000 rank with good placements", 11000, 5.0),
+    ("Best colleges for computer science under KCET rank 6000", 200000, 0.0),
+    ("ECE colleges with average package above 8 LPA", 200000, 0.0),
+    ("Colleges with low fees and good placements for mechanical engineering", 200000, 0.0),
+    ("RVCE CSE GM cutoff 2024", 200000, 0.0),
+    ("Which colleges offer artificial intelligence and data science?", 50000, 3.0),
+    ("COMEDK cutoff for ISE at BMSCE", 200000, 0.0),
+    ("Civil engineering colleges in Mysore", 200000, 0.0),
+    ("Good colleges for SC category under 20000 rank", 200000, 0.0),
+    ("Robotics and automation engineering colleges with high packages", 200000, 6.0),
+    ("Colleges between rank 2000 and 8000 with package above 10 LPA", 200000, 0.0),
+    ("Where can I study biotechnology with a decent placement record?", 100000, 0.0),
+]
+
+STAGES = ["parse", "embed", "search", "post_filter", "drill_down", "context", "llm_first_token", "llm", "total"]
+PERCENTILES = (50, 95, 99)
+
+
+# ---------------------------
+# Timing helpers
+# ---------------------------
+class TimedEncoder:
+    """
+    Wraps the shared encoder and records time spent in `encode` per thread,
+    so query embedding is reported apart from the search around it.
+    """
+
+    def __init__(self, encoder):
+        self.encoder = encoder
+        self._local = threading.local()
+
+    def encode(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.encoder.encode(*args, **kwargs)
+        finally:
+            self._local.seconds = getattr(self._local, "seconds", 0.0) + time.perf_counter() - start
+
+    def take_seconds(self) -> float:
+        """Encode time on this thread since the last call."""
+        seconds = getattr(self._local, "seconds", 0.0)
+        self._local.seconds = 0.0
+        return seconds
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentiles(samples: list) -> dict:
+    values = np.asarray(samples, dtype=np.float64)
+    report = {f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    report["mean"] = round(float(values.mean()), 3)
+    return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------------------
+# Pipeline under test
+# ---------------------------
+def load_index(kind: str, dim: int, raw_df, synthetic: bool):
+    """
+    The served FAISS index with its row metadata, or random vectors over the
+    raw CSV rows. Returns (index, metadata frame aligned with it, source).
+    """
+    if not synthetic and index_file_for(kind).exists():
+        return rag_utils.get_rag_index(kind), rag_utils.get_rag_df(), str(index_file_for(kind).name)
+    vectors = np.random.default_rng(0).standard_normal((len(raw_df), dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = build_index(vectors, kind)
+    index = configure_search(index, nprobe=rag_utils.RAG_INDEX_NPROBE, ef_search=rag_utils.RAG_INDEX_EF_SEARCH)
+    return index, raw_df, "synthetic"
+
+
+def run_request(pipeline: dict, query: str, max_rank, min_package) -> dict:
+    """One FAQ question, as pages/faq.py handles it. Returns {stage: ms}."""
+    model = pipeline["model"]
+    df = pipeline["df"]
+    timings = {}
+    model.take_seconds()
+
+    start = time.perf_counter()
+    filters = parse_query(query).with_defaults(max_rank=max_rank, min_package=min_package)
+    mark = time.perf_counter()
+    timings["parse"] = mark - start
+
+    results = rag_utils.hybrid_search(query, model=model, index=pipeline["index"], df=pipeline["search_df"],
+                                      top_k=pipeline["top_k"], filters=filters)
+    now = time.perf_counter()
+    timings["embed"] = model.take_seconds()
+    timings["search"] = now - mark - timings["embed"]
+    mark = now
+
+    results = rag_utils.enrich_results(results, df, max_rank=filters.max_rank, min_package=filters.min_package)
+    now = time.perf_counter()
+    timings["post_filter"], mark = now - mark, now
+
+    # faq.py fills every result's expander on the same run
+    for college in results["College"]:
+        rag_utils.drill_down_college(college, df)
+    now = time.perf_counter()
+    timings["drill_down"], mark = now - mark, now
+
+    context = build_context(results, max_tokens=pipeline["max_tokens"], cities=pipeline["cities"])
+    now = time.perf_counter()
+    timings["context"], mark = now - mark, now
+
+    first_token = None
+    for _ in pipeline["client"].stream(query, context or "(empty)", max_tokens=pipeline["max_tokens"]):
+        if first_token is None:
+            first_token = time.perf_counter()
+    now = time.perf_counter()
+    timings["llm_first_token"] = (first_token or now) - mark
+    timings["llm"] = now - mark
+
+    timings["total"] = now - start
+    return {stage: seconds * 1000 for stage, seconds in timings.items()}
+
+
+def run_level(pipeline: dict, concurrency: int, repeats: int) -> dict:
+    """Every query `repeats` times, from `concurrency` simulated sessions at once."""
+    workload = QUERIES * repeats
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda q: run_request(pipeline, *q), workload))
+    wall = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(samples) / wall, 2),
+        "stages_ms": {stage: percentiles([s[stage] for s in samples]) for stage in STAGES},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run(concurrency=(1, 4), repeats: int = 3, top_k: int = 5, max_tokens: int = 256, index_kind: str = None,
+        synthetic_index: bool = False, cached_encoder: bool = False, ttft_ms: float = 300.0,
+        token_ms: float = 10.0) -> dict:
+    """
+    Load the pipeline, warm it up once, then measure each concurrency level.
+
+    Returns:
+        dict: JSON-ready report (see the module docstring).
+    """
+    index_kind = index_kind or rag_utils.RAG_INDEX_KIND
+    server, endpoint = start_stub_server(ttft_ms=ttft_ms, token_ms=token_ms)
+    try:
+        start = time.perf_counter()
+        if cached_encoder:
+            from RAG_utils.embedding_utils import CachedEncoder
+
+            encoder = CachedEncoder()
+        else:
+            encoder = rag_utils.load_model()
+        df = rag_utils.get_raw_df()
+        dim = np.asarray(encoder.encode(["warm-up"], normalize_embeddings=True)).shape[1]
+        index, search_df, index_source = load_index(index_kind, dim, df, synthetic_index)
+        pipeline = {
+            "model": TimedEncoder(encoder),
+            "index": index,
+            # Row ids from the index refer to search_df; enrichment and drill-down use the raw CSV
+            "search_df": search_df,
+            "df": df,
+            "cities": rag_utils.get_college_loc_map(),
+            "client": OpenRouterClient(api_key="benchmark", endpoint=endpoint, pool_size=max(concurrency)),
+            "top_k": top_k,
+            "max_tokens": max_tokens,
+        }
+        # First pass builds the lazy per-frame structures (BM25, summary, drill-down cube)
+        for query in QUERIES:
+            run_request(pipeline, *query)
+        warmup_s = time.perf_counter() - start
+
+        levels = []
+        for n in concurrency:
+            print(f"⏱️ {len(QUERIES) * repeats} requests from {n} session(s)...")
+            levels.append(run_level(pipeline, n, repeats))
+    finally:
+        server.shutdown()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "index_kind": index_kind,
+            "index_source": index_source,
+            "encoder": "cached" if cached_encoder else "direct",
+            "queries": len(QUERIES),
+            "repeats": repeats,
+            "top_k": top_k,
+            "max_tokens": max_tokens,
+            "stub_ttft_ms": ttft_ms,
+            "stub_token_ms": token_ms,
+        },
+        "warmup_s": round(warmup_s, 3),
+        "levels": levels,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# ---------------------------
+# Reporting
+# ---------------------------
+def print_report(report: dict):
+    print(f"🚀 Warm-up (model, index, lazy structures): {report['warmup_s']:.2f}s")
+    for level in report["levels"]:
+        print(f"\n👥 {level['concurrency']} session(s): {level['throughput_rps']} req/s, "
+              f"peak RSS {level['peak_rss_mb']} MB")
+        print(f"{'stage':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, stats in level["stages_ms"].items():
+            print(f"{stage:<16}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}")
+
+
+def compare(before: dict, after: dict):
+    """Print p50/p95 changes per stage for concurrency levels both runs have."""
+    old_levels = {level["concurrency"]: level for level in before["levels"]}
+    for level in after["levels"]:
+        old = old_levels.get(level["concurrency"])
+        if old is None:
+            continue
+        change = level["throughput_rps"] / old["throughput_rps"] - 1
+        print(f"\n📈 {level['concurrency']} session(s): throughput {old['throughput_rps']} -> "
+              f"{level['throughput_rps']} req/s ({change:+.0%})")
+        print(f"{'stage':<16}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}")
+        for stage, stats in level["stages_ms"].items():
+            prev = old["stages_ms"].get(stage)
+            if prev is not None:
+                print(f"{stage:<16}{prev['p50']:>12.2f}{stats['p50']:>12.2f}{prev['p95']:>12.2f}{stats['p95']:>12.2f}")
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the FAQ retrieval-and-answer pipeline.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="Concurrent sessions per level.")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the query set per level.")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--index-kind", default=None, help="FAISS variant (default: RAG_INDEX_KIND).")
+    parser.add_argument("--synthetic-index", action="store_true", help="Search random vectors even if an index exists.")
+    parser.add_argument("--cached-encoder", action="store_true", help="Use the disk-cached encoder, as the FAQ page does.")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Stub LLM time to first token.")
+    parser.add_argument("--token-ms", type=float, default=10.0, help="Stub LLM delay per token.")
+    parser.add_argument("--out", type=Path, default=None, help="JSON report path (default: benchmarks/results/).")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier JSON report to compare against.")
+    args = parser.parse_args(argv)
+
+    report = run(args.concurrency, args.repeats, args.top_k, args.max_tokens, args.index_kind,
+                 args.synthetic_index, args.cached_encoder, args.ttft_ms, args.token_ms)
+    print_report(report)
+
+    out = args.out or RESULTS_DIR / f"bench_{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\n💾 Report written to {out}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
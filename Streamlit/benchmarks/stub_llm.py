@@ -0,0 +1,114 @@
+# stub_llm.py
+"""
+Local stand-in for the OpenRouter chat-completions endpoint.
+
+Answers every request with a canned reply after a fixed time-to-first-token
+and per-token delay, streamed as SSE when the payload asks for it. Used by
+the pipeline benchmark so LLM timings are repeatable and need no API key.
+
+Usage (from the Streamlit/ folder), to point the app at it by hand:
+    python -m benchmarks.stub_llm --port 8787
+    OPENROUTER_ENDPOINT=http://127.0.0.1:8787/api/v1/chat/completions streamlit run app.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = "/api/v1/chat/completions"
+REPLY_WORDS = (
+    "Based on the context, these colleges match your rank and placement filters. "
+    "Compare their cutoffs by category and year before choosing a branch."
+).split()
+
+
+def reply_tokens(max_tokens: int) -> list:
+    """Canned answer as `max_tokens` word tokens (the reply text repeats)."""
+    return [REPLY_WORDS[i % len(REPLY_WORDS)] + " " for i in range(max(1, max_tokens))]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        tokens = reply_tokens(min(payload.get("max_tokens", 256), self.server.max_tokens))
+        time.sleep(self.server.ttft_s)
+
+        if not payload.get("stream"):
+            time.sleep(self.server.token_s * len(tokens))
+            body = json.dumps({
+                "model": payload.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}}],
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._chunk(b": OPENROUTER PROCESSING\n\n")
+        for token in tokens:
+            event = {"choices": [{"index": 0, "delta": {"content": token}}]}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            time.sleep(self.server.token_s)
+        # Final event and end of body in one write: clients stop reading at [DONE]
+        self._chunk(b"data: [DONE]\n\n", last=True)
+
+    def _chunk(self, data: bytes, last: bool = False):
+        frame = f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n"
+        self.wfile.write(frame + b"0\r\n\r\n" if last else frame)
+        self.wfile.flush()
+
+    def handle(self):
+        try:
+            super().handle()
+        except (ConnectionResetError, BrokenPipeError):
+            pass  # client hung up mid-stream or dropped the keep-alive connection
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+
+def start_stub_server(port: int = 0, ttft_ms: float = 300.0, token_ms: float = 10.0, max_tokens: int = 64):
+    """
+    Serve the stub on 127.0.0.1 from a daemon thread.
+
+    Args:
+        port (int): Port to bind (0 = any free port).
+        ttft_ms (float): Delay before the first token.
+        token_ms (float): Delay between streamed tokens.
+        max_tokens (int): Cap on the tokens in each reply.
+
+    Returns:
+        tuple: (server, endpoint URL). Call `server.shutdown()` when done.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.ttft_s = ttft_ms / 1000
+    server.token_s = token_ms / 1000
+    server.max_tokens = max_tokens
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{CHAT_PATH}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenRouter stub.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ttft-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--max-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.ttft_ms, args.token_ms, args.max_tokens)
+    print(f"🧪 Stub LLM listening on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,323 @@
+# components/assets.py
+"""
+Static asset layer: loads each asset once per process and serves large
+files over HTTP instead of the websocket.
+
+With `server.enableStaticServing = true`, files copied into Streamlit/static/
+are served from /app/static/. URLs carry a content hash (?v=...), which
+makes Streamlit's file handler send a long-lived Cache-Control header, so
+the browser downloads each animation or plot once. Text assets also get
+.gz / .br siblings for a reverse proxy with gzip_static / brotli_static
+(Streamlit itself gzips JSON on the fly).
+
+Plots also get resized WebP variants (AVIF for the README banner), so
+pages send the smallest width that fits the screen.
+
+Build or refresh the static copies ahead of a deploy (also done lazily on
+first use):
+    python -m components.assets
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+try:  # optional: .br variants
+    import brotli
+except ImportError:
+    brotli = None
+
+# ==============================
+# 📁 Paths & settings
+# ==============================
+APP_DIR = Path(__file__).resolve().parent.parent
+ASSETS_DIR = APP_DIR / "assets"
+STATIC_DIR = APP_DIR / "static"          # Streamlit's static folder (next to app.py)
+STATIC_URL = "/app/static"
+MANIFEST_FILE = STATIC_DIR / "manifest.json"
+
+STATIC_SUBDIRS = ("animations", "plots", "js")
+COMPRESSIBLE = {".json", ".html", ".svg", ".js", ".css", ".xml"}
+
+# Responsive image variants: widths (px) and encoder settings, smallest format first.
+# Streamlit's static handler only types .webp (not .avif) correctly, so the
+# app gets WebP; the README banner, served by GitHub, also gets AVIF.
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+IMAGE_WIDTHS = (480, 960, 1600)
+IMAGE_FORMATS = {"avif": {"quality": 55}, "webp": {"quality": 80, "method": 6}}
+APP_IMAGE_FORMATS = ("webp",)
+IMAGE_SIZES = "(max-width: 768px) 100vw, 80vw"
+
+README_BANNER = APP_DIR.parent / "banner.png"
+README_BANNER_WIDTHS = (768, 1536)
+
+# Lottie player for animations served as static JSON: vendored lottie-web
+# (assets/js), served and cached like the animations, no third-party CDN
+LOTTIE_PLAYER = "js/lottie.min.js"
+
+
+# ==============================
+# 🏗️ Build static copies
+# ==============================
+def file_hash(path) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()[:12]
+
+
+def _write_atomic(path: Path, data: bytes):
+    # Unique temp name: workers building on first use may write the same file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp is owner-only; a reverse proxy may serve these
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def encode_image(image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, fmt.upper(), **IMAGE_FORMATS[fmt])
+    return buffer.getvalue()
+
+
+def image_variants(source: Path, target_dir: Path, widths=IMAGE_WIDTHS, formats=APP_IMAGE_FORMATS) -> list:
+    """
+    Write resized copies of an image as `<stem>-<width>w.<format>`.
+
+    Widths above the original are dropped (the original width is used
+    instead), so nothing is ever upscaled.
+
+    Returns:
+        list: [{"file": name, "width": px, "format": fmt, "hash": content hash}, ...]
+    """
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image.load()
+    steps = sorted({min(w, image.width) for w in widths})
+
+    variants = []
+    for width in steps:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            data = encode_image(resized, fmt)
+            name = f"{source.stem}-{width}w.{fmt}"
+            _write_atomic(target_dir / name, data)
+            variants.append({"file": name, "width": width, "format": fmt, "hash": hashlib.sha1(data).hexdigest()[:12]})
+    return variants
+
+
+def build_static(assets_dir=ASSETS_DIR, static_dir=STATIC_DIR) -> dict:
+    """
+    Copy assets into the static folder with precompressed and resized variants.
+
+    Only new or changed files (by content hash) are rewritten.
+
+    Returns:
+        dict: {"files": {"animations/advisor.json": content hash, ...},
+        "images": {"plots/cutoff.png": [variant, ...], ...}} (see image_variants).
+    """
+    assets_dir, static_dir = Path(assets_dir), Path(static_dir)
+    manifest_file = static_dir / MANIFEST_FILE.name
+    previous = json.loads(manifest_file.read_text()) if manifest_file.exists() else {}
+    previous_files, previous_images = previous.get("files", {}), previous.get("images", {})
+
+    manifest = {"files": {}, "images": {}}
+    for subdir in STATIC_SUBDIRS:
+        for source in sorted((assets_dir / subdir).glob("*")):
+            if not source.is_file():
+                continue
+            rel = f"{subdir}/{source.name}"
+            digest = file_hash(source)
+            manifest["files"][rel] = digest
+            target = static_dir / rel
+            unchanged = previous_files.get(rel) == digest and target.exists()
+
+            if not unchanged:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                data = source.read_bytes()
+                _write_atomic(target, data)
+                if source.suffix in COMPRESSIBLE:
+                    _write_atomic(target.with_name(target.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+                    if brotli is not None:
+                        _write_atomic(target.with_name(target.name + ".br"), brotli.compress(data, quality=11))
+
+            if source.suffix.lower() in IMAGE_SUFFIXES:
+                variants = previous_images.get(rel)
+                if not (unchanged and variants and all((target.parent / v["file"]).exists() for v in variants)):
+                    variants = image_variants(source, target.parent)
+                manifest["images"][rel] = variants
+
+    static_dir.mkdir(parents=True, exist_ok=True)
+    _write_atomic(manifest_file, json.dumps(manifest, indent=2).encode("utf-8"))
+    return manifest
+
+
+def build_readme_banner(banner=README_BANNER) -> list:
+    """
+    AVIF/WebP variants of the README banner, next to it (committed with the
+    README). Returns [] when the banner is missing or the variants are current.
+    """
+    if not banner.exists():
+        return []
+    existing = list(banner.parent.glob(f"{banner.stem}-*w.*"))
+    if existing and min(p.stat().st_mtime for p in existing) >= banner.stat().st_mtime:
+        return []
+    return image_variants(banner, banner.parent, README_BANNER_WIDTHS, formats=tuple(IMAGE_FORMATS))
+
+
+@st.cache_resource(show_spinner=False)
+def get_static_manifest() -> dict:
+    """Static copies for this process (built on first use), {} when serving is off."""
+    if not st.get_option("server.enableStaticServing"):
+        return {"files": {}, "images": {}}
+    try:
+        return build_static()
+    except OSError as e:  # read-only deploy: fall back to inline assets
+        print(f"⚠️ Static assets not built: {e}")
+        return {"files": {}, "images": {}}
+
+
+def static_url(rel: str):
+    """Cache-busted /app/static URL for an asset ("plots/cutoff.png"), or None."""
+    digest = get_static_manifest()["files"].get(rel)
+    return f"{STATIC_URL}/{rel}?v={digest}" if digest else None
+
+
+def srcset(rel: str, fmt: str) -> str:
+    """`srcset` of an image's resized variants in one format ("" if none)."""
+    folder = rel.rsplit("/", 1)[0]
+    variants = get_static_manifest()["images"].get(rel, [])
+    return ", ".join(
+        f"{STATIC_URL}/{folder}/{v['file']}?v={v['hash']} {v['width']}w" for v in variants if v["format"] == fmt
+    )
+
+
+# ==============================
+# 📦 Cached loaders (once per process)
+# ==============================
+@st.cache_resource(show_spinner=False)
+def load_json(rel: str):
+    """Parsed JSON asset ("animations/college.json"), or None if missing/invalid."""
+    try:
+        with open(ASSETS_DIR / rel, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def load_image(rel: str, width: int = 960):
+    """
+    Image resized to at most `width` px and encoded as WebP, once per
+    process (for when static serving is off). None if missing.
+    """
+    from PIL import Image
+
+    path = ASSETS_DIR / rel
+    if not path.exists():
+        return None
+    with Image.open(path) as image:
+        image.load()
+    if image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    return encode_image(image, "webp")
+
+
+@st.cache_resource(show_spinner=False)
+def load_text(rel: str):
+    """Text asset ("plots/karnataka_colleges_map.html"), or None if missing."""
+    path = ASSETS_DIR / rel
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+# ==============================
+# 🎨 Renderers
+# ==============================
+def render_lottie(rel: str, height: int = 200) -> bool:
+    """
+    Play a Lottie animation. Served statically, the page only receives a
+    small player snippet and the browser fetches (and caches) the JSON;
+    otherwise the cached parsed JSON is sent through streamlit_lottie.
+
+    Returns:
+        bool: False if the animation file is missing.
+    """
+    url = static_url(rel)
+    player_url = static_url(LOTTIE_PLAYER)
+    if url and player_url:
+        components.html(f"""
+        <div id="lottie" style="height:{height}px"></div>
+        <script>
+            // /app/static sends .js as text/plain (nosniff), so the browser-cached
+            // player is fetched as text and run from a blob URL
+            fetch("{player_url}").then(r => r.text()).then(code => {{
+                const player = document.createElement("script");
+                player.src = URL.createObjectURL(new Blob([code], {{type: "text/javascript"}}));
+                player.onload = () => lottie.loadAnimation({{container: document.getElementById("lottie"),
+                    renderer: "svg", loop: true, autoplay: true, path: "{url}"}});
+                document.head.appendChild(player);
+            }});
+        </script>
+        """, height=height)
+        return True
+
+    data = load_json(rel)
+    if data is None:
+        return False
+    from streamlit_lottie import st_lottie
+
+    st_lottie(data, height=height)
+    return True
+
+
+def render_image(rel: str, caption: str = None, sizes: str = IMAGE_SIZES) -> bool:
+    """
+    Full-width image from assets/. Served statically, the browser picks the
+    smallest WebP variant that fits (`sizes`) and caches it, with the PNG as
+    a fallback; otherwise a resized WebP encoded once per process is sent.
+
+    Returns:
+        bool: False if the image file is missing.
+    """
+    url = static_url(rel)
+    if url:
+        sources = "".join(
+            f'<source type="image/{fmt}" srcset="{candidates}" sizes="{sizes}">'
+            for fmt in APP_IMAGE_FORMATS if (candidates := srcset(rel, fmt))
+        )
+        caption_html = f'<div style="text-align:center; color:#555; font-size:0.9em;">{caption}</div>' if caption else ""
+        st.markdown(f'<picture>{sources}<img src="{url}" style="width:100%; height:auto;" loading="lazy"></picture>'
+                    f'{caption_html}', unsafe_allow_html=True)
+        return True
+
+    data = load_image(rel)
+    if data is None:
+        return False
+    st.image(data, use_container_width=True, caption=caption)
+    return True
+
+
+# ==============================
+# 🧪 CLI
+# ==============================
+if __name__ == "__main__":
+    built = build_static()
+    total = sum((STATIC_DIR / rel).stat().st_size for rel in built["files"])
+    print(f"✅ {len(built['files'])} assets in {STATIC_DIR} ({total / 1e6:.1f} MB), brotli: {'yes' if brotli else 'no'}")
+    for rel, variants in built["images"].items():
+        folder = STATIC_DIR / rel.rsplit("/", 1)[0]
+        smallest = min((folder / v["file"]).stat().st_size for v in variants)
+        print(f"🖼️ {rel}: {(STATIC_DIR / rel).stat().st_size / 1e3:.0f} KB -> {len(variants)} variants from {smallest / 1e3:.0f} KB")
+    banner = build_readme_banner()
+    if banner:
+        print(f"🖼️ {README_BANNER.name}: {', '.join(v['file'] for v in banner)}")
@@ -67,42 +67,19 @@ def render_user_message(msg, timestamp=None):
 
 
 # ==============================
-# 🤖 Render Bot Message with Typing Effect
+# 🤖 Render Bot Message (streamed, time-batched)
 # ==============================
-def render_bot_message(msg, typing_delay=0.005, timestamp=None):
-    """
-    Renders a chat bubble for the bot response with typing animation.
-    Args:
-        msg (str): Bot's response text
-        typing_delay (float): Delay between typing each chunk
-        timestamp (datetime, optional): Custom timestamp (default: current time)
-    """
-    ts = format_timestamp(timestamp)
-    placeholder = st.empty()  # Container for typing effect
-    typed = ""                # Stores progressively typed characters
-    
-    # Split message into chunks to optimize rendering
-    chunk_size = 2
-    for i in range(0, len(msg), chunk_size):
-        typed += msg[i:i+chunk_size]
-        placeholder.markdown(f"""
-        <div style="
-            background: linear-gradient(135deg, #fff3e0, #ffe8c3);
-            padding: 12px 15px;
-            border-radius: 12px;
-            margin-bottom: 12px;
-            box-shadow: 2px 2px 10px rgba(0,0,0,0.08);
-            font-size: 1.05rem;
-            font-family: 'Segoe UI', sans-serif;
-        " class="chat-container">
-            🤖 <strong>Smart Counsel AI:</strong> {typed}<span class="blinker">|</span>
-            <div style="text-align: right; font-size: 0.75rem; color: #666;">{ts}</div>
-        </div>
-        """, unsafe_allow_html=True)
-        time.sleep(typing_delay)
-    
-    # Final render without blinking cursor
-    placeholder.markdown(f"""
+FLUSH_INTERVAL_S = 0.05   # at most one websocket update per 50 ms
+MAX_FLUSH_INTERVAL_S = 0.4  # backoff stops here; long answers keep updating at this pace
+BACKOFF_EVERY = 25        # the flush interval doubles after this many frames
+MAX_FRAMES = 100          # frames for the typing effect of a complete answer
+MAX_TYPING_S = 1.5        # longest typing effect for an already complete answer
+
+
+def _bot_bubble(text, ts, cursor=False):
+    """HTML for one bot bubble (with a blinking cursor while typing)."""
+    cursor_html = '<span class="blinker">|</span>' if cursor else ""
+    return f"""
     <div style="
         background: linear-gradient(135deg, #fff3e0, #ffe8c3);
         padding: 12px 15px;
@@ -112,7 +89,83 @@ def render_bot_message(msg, typing_delay=0.005, timestamp=None):
         font-size: 1.05rem;
         font-family: 'Segoe UI', sans-serif;
     " class="chat-container">
-        🤖 <strong>Smart Counsel AI:</strong> {typed}
+        🤖 <strong>Smart Counsel AI:</strong> {text}{cursor_html}
         <div style="text-align: right; font-size: 0.75rem; color: #666;">{ts}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def _typed_chunks(msg, typing_delay, flush_interval):
+    """
+    Replay a complete answer as a short typing effect: the old per-2-chars
+    pacing, capped at MAX_TYPING_S and cut into one chunk per flush.
+    """
+    duration = min(len(msg) / 2 * typing_delay, MAX_TYPING_S)
+    frames = max(1, min(MAX_FRAMES, int(duration / flush_interval)))
+    step = -(-len(msg) // frames)  # ceil
+    for i in range(0, len(msg), step):
+        yield msg[i:i + step]
+        time.sleep(flush_interval)
+
+
+def stream_to_placeholder(placeholder, tokens, to_html, flush_interval=FLUSH_INTERVAL_S):
+    """
+    Render a token stream into one placeholder, batched by time.
+    Args:
+        placeholder: st.empty() slot to (re)draw
+        tokens (iterable[str]): Text chunks, e.g. from stream_answer_openrouter
+        to_html (callable): (text so far, typing) -> HTML for the slot
+        flush_interval (float): Minimum seconds between slot updates
+    Returns:
+        str: The full text.
+
+    Tokens are buffered and the slot is re-sent at most once per
+    `flush_interval`, with the interval doubling every BACKOFF_EVERY frames
+    up to MAX_FLUSH_INTERVAL_S, so long answers cost a few websocket deltas
+    per second instead of one per chunk, and never stop updating.
+    """
+    placeholder.markdown(to_html("", True), unsafe_allow_html=True)
+    parts = []
+    frames = 0
+    interval = flush_interval
+    max_interval = max(flush_interval, MAX_FLUSH_INTERVAL_S)
+    last_flush = time.monotonic()
+    for token in tokens:
+        parts.append(token)
+        now = time.monotonic()
+        if now - last_flush >= interval:
+            placeholder.markdown(to_html("".join(parts), True), unsafe_allow_html=True)
+            frames += 1
+            last_flush = now
+            if frames % BACKOFF_EVERY == 0:
+                interval = min(interval * 2, max_interval)
+
+    # Final render without the typing indicator
+    text = "".join(parts)
+    placeholder.markdown(to_html(text, False), unsafe_allow_html=True)
+    return text
+
+
+def render_bot_message(msg, typing_delay=0.005, timestamp=None, flush_interval=FLUSH_INTERVAL_S):
+    """
+    Renders a chat bubble for the bot response as it is produced.
+    Args:
+        msg (str | iterable[str]): Bot's response text, or a token stream
+            (e.g. stream_answer_openrouter) rendered as tokens arrive
+        typing_delay (float): Pacing of the typing effect for a complete
+            string (0 renders it at once); ignored for streams
+        timestamp (datetime, optional): Custom timestamp (default: current time)
+        flush_interval (float): Minimum seconds between bubble updates
+    Returns:
+        str: The full message text.
+    """
+    ts = format_timestamp(timestamp)
+    placeholder = st.empty()  # Container for the streamed bubble
+
+    if isinstance(msg, str):
+        if typing_delay <= 0 or not msg:
+            placeholder.markdown(_bot_bubble(msg, ts), unsafe_allow_html=True)
+            return msg
+        msg = _typed_chunks(msg, typing_delay, flush_interval)
+
+    return stream_to_placeholder(placeholder, msg, lambda text, typing: _bot_bubble(text, ts, typing), flush_interval)
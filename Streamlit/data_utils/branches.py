@@ -0,0 +1,45 @@
+# branches.py
+# ---------------------------
+# Branch names shared by the pages, the explorer index and the query parser
+# ---------------------------
+
+# Full branch name -> short code shown across the app
+BRANCH_SHORT_MAP = {
+    "Computer Science and Engineering": "CSE",
+    "Information Science and Engineering": "ISE",
+    "Electronics and Communication Engineering": "ECE",
+    "Electrical and Electronics Engineering": "EEE",
+    "Mechanical Engineering": "MECH",
+    "Civil Engineering": "CIVIL",
+    "Artificial Intelligence and Data Science": "AIML"
+}
+
+# Extra spellings users type, mapped to the full branch name (any case)
+BRANCH_ALIASES = {
+    "COMPUTER SCIENCE": "Computer Science and Engineering",
+    "ELECTRONICS": "Electronics and Communication Engineering",
+    "ELECTRICAL": "Electrical and Electronics Engineering",
+    "MECHANICAL": "Mechanical Engineering",
+    "CIVIL": "Civil Engineering",
+    "AI&DS": "Artificial Intelligence and Data Science",
+    "AI & DS": "Artificial Intelligence and Data Science",
+    "DATA SCIENCE": "Data Science",
+    "BIOTECH": "Biotechnology",
+    "BIOTECHNOLOGY": "Biotechnology",
+    "ROBOTICS": "Robotics and Automation Engineering",
+    "RAE": "Robotics and Automation Engineering",
+}
+
+# Short codes that are also English words ("is", "me", "ai"...); these only
+# count as a branch when written in capitals, like categories
+BRANCH_CODES = {
+    "CS": "Computer Science and Engineering",
+    "IS": "Information Science and Engineering",
+    "EC": "Electronics and Communication Engineering",
+    "EE": "Electrical and Electronics Engineering",
+    "ME": "Mechanical Engineering",
+    "AI": "Artificial Intelligence and Data Science",
+    "AIDS": "Artificial Intelligence and Data Science",
+    "DS": "Data Science",
+    "BT": "Biotechnology",
+}
@@ -0,0 +1,172 @@
+# cutoff_store.py
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import streamlit as st
+
+# ---------------------------
+# Paths
+# ---------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent  # repo root
+DATA_DIR = BASE_DIR / "data"
+CUTOFF_DIR = DATA_DIR / "cut_off_data"
+STORE_FILE = DATA_DIR / "cutoffs.arrow"
+
+# ---------------------------
+# Schema
+# ---------------------------
+# Low-cardinality text columns are dictionary-encoded (pandas Categorical),
+# ranks and years use the narrowest integer type that fits.
+CATEGORY_COLUMNS = ["college", "branch", "category", "exam", "round"]
+COLUMN_ORDER = ["college", "branch", "category", "cutoff_rank", "exam", "year", "round"]
+
+COLUMN_RENAMES = {
+    "College": "college",
+    "Branch": "branch",
+    "Category": "category",
+    "Cutoff_Rank": "cutoff_rank",
+    "Cutoff_rank": "cutoff_rank",
+    "Exam": "exam",
+    "Year": "year",
+    "Round": "round",
+}
+
+
+# ---------------------------
+# CSV -> normalized frame
+# ---------------------------
+def read_cutoff_csv(path) -> pd.DataFrame:
+    """
+    Read one `<exam>_<year>.csv` cutoff file into the normalized store schema.
+
+    Args:
+        path (str | Path): Path to a file in `data/cut_off_data`.
+
+    Returns:
+        pd.DataFrame: Rows with lowercase columns and compact dtypes.
+    """
+    path = Path(path)
+    exam, year = path.stem.split("_")[:2]
+
+    df = pd.read_csv(path)
+    df.columns = [col.strip() for col in df.columns]
+    df = df.rename(columns=COLUMN_RENAMES)
+    df["exam"] = exam.upper()
+    if "year" not in df.columns:
+        df["year"] = int(year)
+    if "round" not in df.columns:
+        df["round"] = "Round 1"
+
+    df = df.dropna(subset=["college", "branch", "cutoff_rank"])
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype(str).str.strip()
+    df["cutoff_rank"] = pd.to_numeric(df["cutoff_rank"], errors="coerce")
+    df = df.dropna(subset=["cutoff_rank"])
+
+    return df[COLUMN_ORDER]
+
+
+def normalize_cutoffs(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the store dtypes (categoricals + narrow ints) to a merged frame."""
+    df = df.reset_index(drop=True)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    df["cutoff_rank"] = df["cutoff_rank"].astype("int32")
+    df["year"] = df["year"].astype("int16")
+    return df[COLUMN_ORDER]
+
+
+def source_files(cutoff_dir=CUTOFF_DIR) -> list:
+    """List the per-exam, per-year cutoff CSVs in a stable order."""
+    return sorted(Path(cutoff_dir).glob("*_*.csv"))
+
+
+# ---------------------------
+# Build / write store
+# ---------------------------
+def write_store(df: pd.DataFrame, store_file=STORE_FILE) -> Path:
+    """
+    Write a normalized cutoff frame as an uncompressed Arrow IPC file.
+
+    Uncompressed IPC can be memory-mapped, so every worker process reading
+    the store shares the same OS page-cache copy. The file is written to a
+    unique temp path and swapped in, so readers never see a half-written
+    store and workers refreshing at the same time never share a temp file.
+    """
+    store_file = Path(store_file)
+    table = pa.Table.from_pandas(normalize_cutoffs(df), preserve_index=False)
+
+    fd, tmp_file = tempfile.mkstemp(dir=store_file.parent, prefix=f".{store_file.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_file, store_file)
+    except BaseException:
+        Path(tmp_file).unlink(missing_ok=True)
+        raise
+    return store_file
+
+
+def build_store(cutoff_dir=CUTOFF_DIR, store_file=STORE_FILE) -> Path:
+    """
+    Merge every CSV in `data/cut_off_data` into the columnar store.
+
+    Args:
+        cutoff_dir (str | Path): Folder with `<exam>_<year>.csv` files.
+        store_file (str | Path): Destination `.arrow` file.
+
+    Returns:
+        Path: Path of the written store.
+    """
+    files = source_files(cutoff_dir)
+    if not files:
+        raise FileNotFoundError(f"No cutoff CSVs found in {cutoff_dir}")
+
+    df = pd.concat([read_cutoff_csv(f) for f in files], ignore_index=True)
+    return write_store(df, store_file)
+
+
+# ---------------------------
+# Read store (memory-mapped)
+# ---------------------------
+def read_store(store_file=STORE_FILE) -> pa.Table:
+    """Open the Arrow store as a memory-mapped, zero-copy table."""
+    source = pa.memory_map(str(store_file), "r")
+    return ipc.open_file(source).read_all()
+
+
+@st.cache_resource(show_spinner=False)
+def load_cutoffs() -> pd.DataFrame:
+    """
+    Load all KCET/COMEDK cutoffs, refreshing the store first if needed.
+
+    The incremental ETL only re-parses source CSVs whose content hash
+    changed, so this is a cheap no-op when the store is current.
+
+    Cached once per process and shared by every page and session, so
+    callers must treat the returned frame as read-only.
+
+    Returns:
+        pd.DataFrame: Columns college, branch, category, cutoff_rank, exam,
+        year, round.
+    """
+    from data_utils.etl import run_etl
+
+    run_etl(write_csv=False)
+    return read_store().to_pandas(split_blocks=True)
+
+
+# ---------------------------
+# Standalone build
+# ---------------------------
+if __name__ == "__main__":
+    path = build_store()
+    df = read_store(path).to_pandas()
+    print(f"✅ Cutoff store written: {path}")
+    print(f"Rows: {len(df)} | Size: {path.stat().st_size / 1e6:.1f} MB")
+    print(df.dtypes)
@@ -0,0 +1,187 @@
+# etl.py
+"""
+Incremental cutoff ETL.
+
+Merges `data/cut_off_data/<exam>_<year>.csv` into the columnar cutoff store
+and `data/merged_cutoffs.csv`. Each source file becomes one Arrow partition;
+a manifest of content hashes decides which partitions need rebuilding, so a
+new round file only re-parses that one CSV.
+
+Usage (from the Streamlit/ folder):
+    python -m data_utils.etl            # incremental
+    python -m data_utils.etl --force    # rebuild every partition
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# ---------------------------
+# Path setup when run as a script
+# ---------------------------
+PARENT_DIR = str(Path(__file__).resolve().parent.parent)
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from data_utils.cutoff_store import (
+    CUTOFF_DIR,
+    DATA_DIR,
+    STORE_FILE,
+    read_cutoff_csv,
+    read_store,
+    source_files,
+    write_store,
+)
+
+# ---------------------------
+# Paths
+# ---------------------------
+PARTITION_DIR = DATA_DIR / "cutoff_partitions"
+MANIFEST_FILE = PARTITION_DIR / "manifest.json"
+MERGED_CSV_FILE = DATA_DIR / "merged_cutoffs.csv"
+
+
+# ---------------------------
+# Change detection
+# ---------------------------
+def file_hash(path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_file=MANIFEST_FILE) -> dict:
+    """Read the {source file name: {sha256, rows}} manifest, or {} if missing."""
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest: dict, manifest_file=MANIFEST_FILE):
+    """Write the manifest atomically (through a unique temp file)."""
+    manifest_file = Path(manifest_file)
+    fd, tmp_file = tempfile.mkstemp(dir=manifest_file.parent, prefix=f".{manifest_file.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, manifest_file)
+    except BaseException:
+        Path(tmp_file).unlink(missing_ok=True)
+        raise
+
+
+def csv_is_current(merged_csv, store_file) -> bool:
+    """True if the merged CSV exists and was written after the store."""
+    merged_csv, store_file = Path(merged_csv), Path(store_file)
+    return merged_csv.exists() and merged_csv.stat().st_mtime_ns >= store_file.stat().st_mtime_ns
+
+
+def partition_path(source, partition_dir=PARTITION_DIR) -> Path:
+    """Arrow partition file for one source CSV."""
+    return Path(partition_dir) / f"{Path(source).stem}.arrow"
+
+
+# ---------------------------
+# ETL
+# ---------------------------
+def run_etl(cutoff_dir=CUTOFF_DIR, partition_dir=PARTITION_DIR, store_file=STORE_FILE,
+            merged_csv=MERGED_CSV_FILE, force: bool = False, write_csv: bool = True) -> dict:
+    """
+    Rebuild changed partitions, then the merged store (and CSV).
+
+    Args:
+        cutoff_dir (str | Path): Folder with the source cutoff CSVs.
+        partition_dir (str | Path): Folder for per-source Arrow partitions.
+        store_file (str | Path): Merged Arrow store read by the pages.
+        merged_csv (str | Path): Merged CSV output (lowercase columns).
+        force (bool): Rebuild every partition regardless of hashes.
+        write_csv (bool): Also write `merged_cutoffs.csv` (when older than the store).
+
+    Returns:
+        dict: Summary with rebuilt, unchanged and removed source names.
+    """
+    partition_dir = Path(partition_dir)
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = partition_dir / MANIFEST_FILE.name
+
+    files = source_files(cutoff_dir)
+    if not files:
+        raise FileNotFoundError(f"No cutoff CSVs found in {cutoff_dir}")
+
+    manifest = load_manifest(manifest_file)
+    summary = {"rebuilt": [], "unchanged": [], "removed": []}
+
+    # Rebuild partitions whose source hash changed (or whose file vanished)
+    for source in files:
+        digest = file_hash(source)
+        entry = manifest.get(source.name)
+        part = partition_path(source, partition_dir)
+        if not force and entry and entry["sha256"] == digest and part.exists():
+            summary["unchanged"].append(source.name)
+            continue
+
+        df = read_cutoff_csv(source)
+        write_store(df, part)
+        manifest[source.name] = {"sha256": digest, "rows": len(df)}
+        summary["rebuilt"].append(source.name)
+
+    # Drop partitions whose source CSV was deleted
+    current = {f.name for f in files}
+    for name in sorted(set(manifest) - current):
+        partition_path(name, partition_dir).unlink(missing_ok=True)
+        del manifest[name]
+        summary["removed"].append(name)
+
+    store_file, merged_csv = Path(store_file), Path(merged_csv)
+    merged = None
+    if summary["rebuilt"] or summary["removed"] or not store_file.exists():
+        merged = pd.concat(
+            [read_store(partition_path(f, partition_dir)).to_pandas() for f in files],
+            ignore_index=True,
+        )
+        write_store(merged, store_file)
+
+    # The app refreshes the store without the CSV (write_csv=False), so the
+    # CSV is rewritten whenever it is older than the store
+    if write_csv and not csv_is_current(merged_csv, store_file):
+        merged = merged if merged is not None else read_store(store_file).to_pandas()
+        merged.to_csv(merged_csv, index=False)
+
+    save_manifest(manifest, manifest_file)
+    return summary
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge KCET/COMEDK cutoff CSVs incrementally.")
+    parser.add_argument("--force", action="store_true", help="Rebuild every partition.")
+    parser.add_argument("--no-csv", action="store_true", help="Skip writing merged_cutoffs.csv.")
+    parser.add_argument("--cutoff-dir", default=str(CUTOFF_DIR), help="Folder with <exam>_<year>.csv files.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = run_etl(cutoff_dir=args.cutoff_dir, force=args.force, write_csv=not args.no_csv)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Cutoff ETL finished in {elapsed:.2f}s")
+    print(f"🔄 Rebuilt: {len(summary['rebuilt'])} {summary['rebuilt']}")
+    print(f"⏭️ Unchanged: {len(summary['unchanged'])}")
+    if summary["removed"]:
+        print(f"🗑️ Removed: {summary['removed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# explorer_index.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ---------------------------
+# Path setup when run as a script
+# ---------------------------
+PARENT_DIR = str(Path(__file__).resolve().parent.parent)
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from data_utils.cutoff_store import load_cutoffs
+
+PLACEMENTS_FILE = Path(PARENT_DIR).parent / "data" / "placements.csv"
+
+# ---------------------------
+# Index layout
+# ---------------------------
+# Placements: one boolean bitmap per City / Branch_Short value and, per
+# numeric column, row positions sorted by value, so a range filter is two
+# binary searches. A filter combination is the AND of the bitmaps.
+# Cutoffs: sorted row positions per city / branch, intersected on demand.
+BITMAP_COLUMNS = ["City", "Branch_Short"]
+RANGE_COLUMNS = ["NIRF_Rank", "Avg_Package_LPA", "Max_Package_LPA"]
+DISPLAY_COLUMNS = ["college", "Branch_Short", "Avg_Package_LPA", "Max_Package_LPA", "NIRF_Rank", "City", "Highlights"]
+
+TOP_RANKED_NIRF = 100
+GREAT_PLACEMENTS_LPA = 6
+
+
+def highlight_badges(nirf: np.ndarray, avg_package: np.ndarray) -> np.ndarray:
+    """Highlights column ("🥇 Top Ranked | 🧑‍💼 Great Placements") for all rows at once."""
+    top = nirf <= TOP_RANKED_NIRF
+    great = avg_package >= GREAT_PLACEMENTS_LPA
+    badges = np.char.add(np.where(top, "🥇 Top Ranked", ""), np.where(top & great, " | ", ""))
+    return np.char.add(badges, np.where(great, "🧑‍💼 Great Placements", ""))
+
+
+class ExplorerIndex:
+    """
+    Precomputed College Explorer table with filter indexes.
+
+    Badges and formatted package columns are computed once, so a widget
+    change only resolves row positions from the indexes and takes them
+    from the ready-made display table.
+    """
+
+    def __init__(self, placements: pd.DataFrame, cutoffs: pd.DataFrame, city_map: dict, branch_map: dict):
+        table = placements.rename(columns={"College": "college"}).dropna(subset=["college", "Branch"])
+        table = table.reset_index(drop=True)
+        table["City"] = table["college"].map(city_map)
+        table["Branch_Short"] = table["Branch"].map(branch_map).fillna(table["Branch"])
+        self.table = table
+        self.branches = sorted(table["Branch_Short"].dropna().unique())
+
+        display = table[DISPLAY_COLUMNS[:-1]].copy()
+        display["Highlights"] = highlight_badges(table["NIRF_Rank"].to_numpy(), table["Avg_Package_LPA"].to_numpy())
+        for col in ("Avg_Package_LPA", "Max_Package_LPA"):
+            display[col] = np.char.mod("%.2f LPA", table[col].to_numpy())
+        self.display = display
+
+        self.bitmaps = {
+            col: {value: (table[col] == value).to_numpy() for value in table[col].dropna().unique()}
+            for col in BITMAP_COLUMNS
+        }
+        self.sorted = {}
+        for col in RANGE_COLUMNS:
+            values = table[col].to_numpy()
+            order = np.argsort(values, kind="stable")
+            self.sorted[col] = (values[order], order)
+
+        # Cutoffs: row positions grouped by city / short branch, from the categorical codes
+        self.cutoffs = cutoffs.assign(
+            Branch_Short=cutoffs["branch"].cat.rename_categories(lambda b: branch_map.get(b, b))
+        )
+        college = self.cutoffs["college"]
+        branch = self.cutoffs["Branch_Short"]
+        self.cutoff_rows = {
+            "City": self._positions(college.cat.codes, [city_map.get(c) for c in college.cat.categories]),
+            "Branch_Short": self._positions(branch.cat.codes, list(branch.cat.categories)),
+        }
+
+    @staticmethod
+    def _positions(codes: pd.Series, labels: list) -> dict:
+        """
+        {label: sorted row positions} from categorical codes, where
+        `labels[code]` is the label of each category (None to skip).
+        Several categories may share a label (e.g. colleges in one city).
+        """
+        codes = codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        parts = {}
+        for code, label in enumerate(labels):
+            if label is not None and bounds[code] < bounds[code + 1]:
+                parts.setdefault(label, []).append(order[bounds[code]:bounds[code + 1]])
+        return {label: np.sort(np.concatenate(chunks)) for label, chunks in parts.items()}
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _range_bitmap(self, col: str, low=None, high=None) -> np.ndarray:
+        """Rows with low <= col <= high (either bound optional)."""
+        values, order = self.sorted[col]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        end = len(values) if high is None else np.searchsorted(values, high, side="right")
+        mask = np.zeros(len(values), dtype=bool)
+        mask[order[start:end]] = True
+        return mask
+
+    def query(self, city=None, branch=None, min_avg_package=None, min_max_package=None,
+              min_nirf=None, max_nirf=None) -> np.ndarray:
+        """
+        Row positions of placements matching every given filter.
+
+        Args:
+            city, branch: Exact City / Branch_Short value, or None for "any".
+            min_avg_package, min_max_package (float, optional): Lower bounds (LPA).
+            min_nirf, max_nirf (int, optional): Inclusive NIRF rank range.
+
+        Returns:
+            np.ndarray: Row positions usable with `display.take(...)` / `table.take(...)`.
+        """
+        mask = np.ones(len(self.table), dtype=bool)
+        for col, wanted in (("City", city), ("Branch_Short", branch)):
+            if wanted is not None:
+                bitmap = self.bitmaps[col].get(wanted)
+                if bitmap is None:
+                    return np.empty(0, dtype=np.int64)
+                mask &= bitmap
+        if min_avg_package is not None:
+            mask &= self._range_bitmap("Avg_Package_LPA", low=min_avg_package)
+        if min_max_package is not None:
+            mask &= self._range_bitmap("Max_Package_LPA", low=min_max_package)
+        if min_nirf is not None or max_nirf is not None:
+            mask &= self._range_bitmap("NIRF_Rank", min_nirf, max_nirf)
+        return np.flatnonzero(mask)
+
+    def cutoffs_for(self, city=None, branch=None) -> pd.DataFrame:
+        """Cutoff rows for a city and/or short branch name (the shared frame when unfiltered)."""
+        rows = None
+        for col, wanted in (("City", city), ("Branch_Short", branch)):
+            if wanted is None:
+                continue
+            positions = self.cutoff_rows[col].get(wanted, np.empty(0, dtype=np.int64))
+            rows = positions if rows is None else np.intersect1d(rows, positions, assume_unique=True)
+        return self.cutoffs if rows is None else self.cutoffs.take(rows)
+
+
+# ---------------------------
+# Cached per-process instance
+# ---------------------------
+@st.cache_resource(show_spinner=False)
+def load_explorer_index(city_map: dict, branch_map: dict) -> ExplorerIndex:
+    """
+    Build the explorer index once per process over placements.csv and the
+    shared cutoff store. Callers must treat its frames as read-only.
+    """
+    if not PLACEMENTS_FILE.exists():
+        raise FileNotFoundError(f"Required file not found: {PLACEMENTS_FILE}")
+    return ExplorerIndex(pd.read_csv(PLACEMENTS_FILE), load_cutoffs(), city_map, branch_map)
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    import time
+
+    from data_utils.branches import BRANCH_SHORT_MAP
+
+    placements = pd.read_csv(PLACEMENTS_FILE)
+    city_map = {"RVCE": "Bangalore", "NIE": "Mysore", "JSSSTU": "Mysore", "VVCE": "Mysore"}
+    index = ExplorerIndex(placements, load_cutoffs(), city_map, BRANCH_SHORT_MAP)
+    print(f"✅ Indexed {len(index.table)} placements and {len(index.cutoffs)} cutoffs")
+
+    start = time.perf_counter()
+    rows = index.query(city="Mysore", min_avg_package=4.0, min_max_package=6.0, min_nirf=1, max_nirf=200)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Mysore, avg >= 4, max >= 6, NIRF 1-200: {len(rows)} rows in {elapsed_ms:.3f} ms")
+    print(index.display.take(rows).head())
+    print(f"Mysore cutoffs: {len(index.cutoffs_for(city='Mysore'))}")
@@ -0,0 +1,138 @@
+# rank_index.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ---------------------------
+# Path setup when run as a script
+# ---------------------------
+PARENT_DIR = str(Path(__file__).resolve().parent.parent)
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from data_utils.cutoff_store import load_cutoffs
+
+# ---------------------------
+# Index layout
+# ---------------------------
+# Rows are sorted by (exam, category, branch, year, round, cutoff_rank), so
+# each key owns one contiguous span of the sorted arrays with its cutoffs
+# in ascending order. `composite` packs (span id, cutoff) into one int64 so
+# a single vectorized searchsorted finds the rank boundary in every span.
+KEY_COLUMNS = ["exam", "category", "branch", "year", "round"]
+
+
+class RankIndex:
+    """
+    Sorted cutoff arrays keyed by (exam, category, branch, year, round).
+
+    Queries touch only the per-key span table (a few thousand entries) and
+    binary-search inside the selected spans, so their cost does not grow
+    with the number of rows in the cutoff table.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        codes, self.vocab = [], []
+        for col in KEY_COLUMNS:
+            c, u = pd.factorize(df[col], sort=True)
+            codes.append(c)
+            self.vocab.append({value: code for code, value in enumerate(np.asarray(u).tolist())})
+
+        cutoffs = df["cutoff_rank"].to_numpy().astype(np.int64)
+        order = np.lexsort([cutoffs] + codes[::-1])
+
+        self.cutoffs = cutoffs[order]
+        self.rows = order.astype(np.int64)
+
+        sorted_codes = np.column_stack([c[order] for c in codes])
+        change = np.flatnonzero(np.any(sorted_codes[1:] != sorted_codes[:-1], axis=1)) + 1
+        self.span_starts = np.r_[0, change].astype(np.int64)
+        self.span_ends = np.r_[change, n].astype(np.int64)
+        self.key_codes = sorted_codes[self.span_starts]
+
+        span_ids = np.repeat(np.arange(len(self.span_starts), dtype=np.int64), self.span_ends - self.span_starts)
+        self.composite = (span_ids << 32) | self.cutoffs
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _select_spans(self, filters) -> np.ndarray:
+        """Ids of spans whose key matches every non-empty filter."""
+        mask = np.ones(len(self.span_starts), dtype=bool)
+        for dim, wanted in enumerate(filters):
+            if wanted is None or (not isinstance(wanted, str) and np.ndim(wanted) and len(wanted) == 0):
+                continue
+            if isinstance(wanted, (str, int, np.integer)):
+                wanted = [wanted]
+            vocab = self.vocab[dim]
+            wanted_codes = [vocab[v] for v in wanted if v in vocab]
+            mask &= np.isin(self.key_codes[:, dim], wanted_codes)
+        return np.flatnonzero(mask)
+
+    def query(self, exam=None, categories=None, branches=None, years=None, rounds=None,
+              min_rank=None, limit=None) -> np.ndarray:
+        """
+        Row positions (into the source frame) matching the key filters.
+
+        Args:
+            exam, categories, branches, years, rounds: A value, a list of
+                values, or None/empty for "any".
+            min_rank (int, optional): Only keep seats whose cutoff is at or
+                above this rank, i.e. seats reachable at that rank.
+            limit (int, optional): Keep at most this many rows per key,
+                lowest cutoff first.
+
+        Returns:
+            np.ndarray: Row positions usable with `df.take(...)`.
+        """
+        spans = self._select_spans([exam, categories, branches, years, rounds])
+        starts = self.span_starts[spans]
+        ends = self.span_ends[spans]
+
+        if min_rank is not None:
+            starts = np.searchsorted(self.composite, (spans << 32) | int(min_rank), side="left")
+        if limit is not None:
+            ends = np.minimum(ends, starts + limit)
+
+        lengths = np.maximum(ends - starts, 0)
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Expand every [start, end) into positions without a Python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.rows[offsets + np.arange(total)]
+
+    def reachable(self, rank: int, **filters) -> np.ndarray:
+        """All seats whose cutoff rank is >= `rank` (see `query` for filters)."""
+        return self.query(min_rank=rank, **filters)
+
+
+# ---------------------------
+# Cached per-process instance
+# ---------------------------
+@st.cache_resource(show_spinner=False)
+def load_rank_index() -> RankIndex:
+    """Build the rank index once per process over the shared cutoff store."""
+    return RankIndex(load_cutoffs())
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    import time
+
+    df = load_cutoffs()
+    index = RankIndex(df)
+    print(f"✅ Indexed {len(df)} rows into {len(index.span_starts)} keys")
+
+    start = time.perf_counter()
+    rows = index.reachable(15000, exam="KCET", categories=["GM"], years=range(2020, 2026))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Reachable at 15000 (KCET, GM): {len(rows)} seats in {elapsed_ms:.3f} ms")
+    print(df.take(rows).sort_values("cutoff_rank").head())
@@ -0,0 +1,82 @@
+# scoring.py
+import numpy as np
+
+# ---------------------------
+# Chance models (vectorized over cutoff arrays)
+# ---------------------------
+def chance_ratio(rank, cutoffs, floor: int = 5, ceiling: int = 100) -> np.ndarray:
+    """
+    Predictor-style chance: 100 / (1 + |rank - cutoff| / cutoff).
+
+    Args:
+        rank (int): Student's rank.
+        cutoffs (array-like): Closing ranks to score against.
+        floor (int): Lowest chance reported.
+        ceiling (int): Highest chance reported.
+
+    Returns:
+        np.ndarray: Integer chance percentages, one per cutoff.
+    """
+    cutoffs = np.asarray(cutoffs, dtype=np.float64)
+    diff = np.abs(rank - cutoffs)
+    chance = 100.0 / (1.0 + diff / cutoffs)
+    return np.clip(np.floor(chance), floor, ceiling).astype(np.int16)
+
+
+def chance_linear(rank, cutoffs, window: int = 5000) -> np.ndarray:
+    """
+    Simulator-style chance: 100% at or under the cutoff, then falling
+    linearly to 0% once the rank is `window` places past it.
+
+    Args:
+        rank (int): Student's rank.
+        cutoffs (array-like): Closing ranks to score against.
+        window (int): Ranks past the cutoff at which the chance hits 0.
+
+    Returns:
+        np.ndarray: Integer chance percentages, one per cutoff.
+    """
+    cutoffs = np.asarray(cutoffs, dtype=np.float64)
+    over = np.maximum(rank - cutoffs, 0.0)
+    chance = np.maximum(0.0, 100.0 - (over / window) * 100.0)
+    return np.floor(chance).astype(np.int16)
+
+
+CHANCE_MODELS = {
+    "ratio": chance_ratio,
+    "linear": chance_linear,
+}
+
+
+def score_chances(rank, cutoffs, model: str = "ratio", **params) -> np.ndarray:
+    """
+    Score a whole array of cutoffs for one rank in a single pass.
+
+    Args:
+        rank (int): Student's rank.
+        cutoffs (array-like | pd.Series): Closing ranks to score against.
+        model (str): Key in CHANCE_MODELS ("ratio" or "linear").
+        **params: Model parameters, e.g. window=5000 or floor=5.
+
+    Returns:
+        np.ndarray: Integer chance percentages aligned with `cutoffs`.
+    """
+    try:
+        scorer = CHANCE_MODELS[model]
+    except KeyError:
+        raise ValueError(f"Unknown chance model '{model}'. Choose from {sorted(CHANCE_MODELS)}") from None
+    return scorer(rank, cutoffs, **params)
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    import time
+
+    cutoffs = np.random.default_rng(0).integers(500, 100_000, size=250_000)
+    start = time.perf_counter()
+    chances = score_chances(15000, cutoffs, model="ratio")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"✅ Scored {len(cutoffs)} rows in {elapsed_ms:.1f} ms")
+    print(f"Linear model sample: {score_chances(15000, [14000, 17500, 30000], model='linear')}")
@@ -3,10 +3,7 @@ import sys
 import asyncio
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-from streamlit_lottie import st_lottie
-import json
 import os
-from PIL import Image
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -22,193 +19,191 @@ if PARENT_DIR not in sys.path:
 # ---------------------------
 # Import RAG & LLM utils
 # ---------------------------
-from RAG_utils.embedding_utils import get_embedding
-from RAG_utils.llm_utils import generate_answer_openrouter
-from RAG_utils.rag_utils import search_colleges, drill_down_college, rag_index
+from RAG_utils.embedding_utils import CachedEncoder
+from RAG_utils.llm_utils import stream_answer_openrouter
+from RAG_utils.answer_cache import answer_scope, get_answer_cache
+from RAG_utils.context_builder import build_context
+from RAG_utils.query_parser import parse_query
+from RAG_utils.rag_utils import hybrid_search, enrich_results, drill_down_college, get_raw_df, get_college_loc_map, RAW_CSV_FILE
+from perf_utils.tracing import PageTrace, count_cache, span
+from components.assets import render_image, render_lottie
+from components.chatbot_ui import stream_to_placeholder
 
-# ---------------------------
-# Load raw CSV for full info (for context + drill-down)
-# ---------------------------
-BASE_DIR = Path(__file__).resolve().parent  # folder of faq.py
-DATA_DIR = BASE_DIR.parent / "RAG_utils" / "RAG_data"
-RAW_FILE = DATA_DIR / "final_rag.csv"
+# Answers kept per session for reruns (e.g. opening an expander); oldest dropped first
+MAX_SESSION_ANSWERS = 20
 
-if RAW_FILE.exists():
-    raw_df = pd.read_csv(RAW_FILE)
-else:
-    st.error(f"❌ File not found: {RAW_FILE}")
 
+def remember_answer(answers: dict, key, response: str):
+    """Keep an answer for this session, dropping the oldest beyond MAX_SESSION_ANSWERS."""
+    answers[key] = response
+    while len(answers) > MAX_SESSION_ANSWERS:
+        answers.pop(next(iter(answers)))
 
-# ---------------------------
-# DummyModel to wrap embedding
-# ---------------------------
-class DummyModel:
-    def encode(self, texts, **kwargs):
-        if isinstance(texts, list):
-            return np.array([get_embedding(t) for t in texts], dtype="float32")
-        else:
-            return np.array([get_embedding(texts)], dtype="float32")
 
-model = DummyModel()
-
-# ---------------------------
-# Streamlit Page Setup
-# ---------------------------
-st.set_page_config(page_title="Smart Q&A", layout="wide", page_icon="💬")
+with PageTrace("faq"):
+    # ---------------------------
+    # Raw CSV for full info (for context + drill-down), loaded once per process
+    # ---------------------------
+    if RAW_CSV_FILE.exists():
+        raw_df = get_raw_df()
+    else:
+        st.error(f"❌ File not found: {RAW_CSV_FILE}")
 
-st.markdown("""
-    <style>
-    .stApp { background: linear-gradient(120deg, #fceabb, #f8b500, #e97777); background-attachment: fixed; font-family: 'Segoe UI', sans-serif; }
-    .big-title { font-size: 2.5em; font-weight: 800; background: linear-gradient(to right, #1e3c72, #2a5298); -webkit-background-clip: text; -webkit-text-fill-color: transparent; margin-bottom: 1rem; }
-    hr.fancy { border: none; height: 2px; background: linear-gradient(to right, #00c6ff, #0072ff); margin: 2rem 0; }
-    .card { background-color: #f0f4f8; padding: 15px; border-radius: 12px; margin-bottom: 12px; box-shadow: 2px 2px 12px rgba(0,0,0,0.1); font-family: 'Segoe UI', sans-serif; font-size: 1.05em; line-height: 1.4em; }
-    .smart-answer { background-color: #e0f7fa; padding: 18px; border-radius: 12px; margin-bottom: 12px; box-shadow: 2px 2px 10px rgba(0,0,0,0.15); font-size: 1.1em; line-height: 1.4em; }
-    </style>
-""", unsafe_allow_html=True)
 
-st.markdown('<div class="big-title">💬 Ask Smart Counsel AI</div>', unsafe_allow_html=True)
-st.markdown("Ask about **KCET/COMEDK colleges, branches, cutoffs, placements**, and more.")
+    # ---------------------------
+    # Batched, disk-cached encoder
+    # ---------------------------
+    model = CachedEncoder()
 
-# ---------------------------
-# Load Lottie Animation
-# ---------------------------
-def load_lottie(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        st.warning(f"⚠️ Could not load animation: {e}")
-        return None
-
-lottie_path = os.path.join(PARENT_DIR, "assets", "animations", "college.json")
-lottie_data = load_lottie(lottie_path)
-if lottie_data:
-    st_lottie(lottie_data, height=200)
+    # ---------------------------
+    # Streamlit Page Setup
+    # ---------------------------
+    st.set_page_config(page_title="Smart Q&A", layout="wide", page_icon="💬")
 
-# ---------------------------
-# Settings
-# ---------------------------
-with st.expander("⚙️ Settings"):
-    top_k = st.slider("📄 Number of retrieved colleges", 1, 10, 5)
-    max_tokens = st.slider("✏️ Max tokens to generate", 32, 512, 256, step=32)
-    min_cutoff = st.number_input("📝 Max KCET/COMEDK rank", min_value=1, max_value=30000, value=6000, step=500)
-    min_package = st.number_input("💰 Min Avg Package (LPA)", min_value=0.0, max_value=50.0, value=5.0, step=0.5)
+    st.markdown("""
+        <style>
+        .stApp { background: linear-gradient(120deg, #fceabb, #f8b500, #e97777); background-attachment: fixed; font-family: 'Segoe UI', sans-serif; }
+        .big-title { font-size: 2.5em; font-weight: 800; background: linear-gradient(to right, #1e3c72, #2a5298); -webkit-background-clip: text; -webkit-text-fill-color: transparent; margin-bottom: 1rem; }
+        hr.fancy { border: none; height: 2px; background: linear-gradient(to right, #00c6ff, #0072ff); margin: 2rem 0; }
+        .card { background-color: #f0f4f8; padding: 15px; border-radius: 12px; margin-bottom: 12px; box-shadow: 2px 2px 12px rgba(0,0,0,0.1); font-family: 'Segoe UI', sans-serif; font-size: 1.05em; line-height: 1.4em; }
+        .smart-answer { background-color: #e0f7fa; padding: 18px; border-radius: 12px; margin-bottom: 12px; box-shadow: 2px 2px 10px rgba(0,0,0,0.15); font-size: 1.1em; line-height: 1.4em; }
+        </style>
+    """, unsafe_allow_html=True)
 
-# ---------------------------
-# User Question Input
-# ---------------------------
-st.markdown('<hr class="fancy">', unsafe_allow_html=True)
-query = st.text_input("🔍 Ask your question (e.g., Best CSE colleges under 10k rank?)")
-context = ""
-filtered_results = pd.DataFrame()
-
-if query:
-    with st.spinner("🤖 Thinking..."):
-        try:
-            # ---------------------------
-            # Step 1: FAISS search (retrieve extra for filtering)
-            # ---------------------------
-            results = search_colleges(
-                query,
-                model=model,
-                index=rag_index,
-                df=raw_df,
-                top_k=top_k*2  # retrieve extra to allow filtering
-            )
-
-            # ---------------------------
-            # Step 2: Merge with cutoff & package info
-            # ---------------------------
-            filtered_results = results.merge(
-                raw_df[['College','Branch','Cutoff_rank','Avg_Package_LPA']],
-                on=['College','Branch'],
-                how='left'
-            )
-
-            # ---------------------------
-            # Step 3: Apply user filters
-            # ---------------------------
-            filtered_results = filtered_results[
-                (filtered_results['Cutoff_rank'] <= min_cutoff) &
-                (filtered_results['Avg_Package_LPA'] >= min_package)
-            ]
-
-            # ---------------------------
-            # Step 4: Deduplicate & sort by FAISS distance
-            # ---------------------------
-            filtered_results = filtered_results.sort_values('faiss_dist').drop_duplicates(subset=['College','Branch'], keep='first')
-
-            # ---------------------------
-            # Step 5: Pick top_k results
-            # ---------------------------
-            filtered_results = filtered_results.head(top_k)
-
-            # ---------------------------
-            # Build bullet-point context for LLM from raw_df
-            # ---------------------------
-            context_lines = []
-            college_names = filtered_results['College'].unique()
-            context = "\n".join([f"- 🏫 {cname}" for cname in college_names])
-
-            # ---------------------------
-            # Generate LLM answer
-            # ---------------------------
-            if context.strip():
-                prompt = f"""
-You are a helpful assistant. Based on the context below, answer the question concisely.
-
-Question: {query}
-
-Context:
-{context}
-
-Answer precisely, focusing on the most relevant colleges.
-"""
-                response = generate_answer_openrouter(prompt,context=context, max_tokens=max_tokens)
-            else:
-                response = "⚠️ No relevant information found."
+    st.markdown('<div class="big-title">💬 Ask Smart Counsel AI</div>', unsafe_allow_html=True)
+    st.markdown("Ask about **KCET/COMEDK colleges, branches, cutoffs, placements**, and more.")
 
-        except Exception as e:
-            response = f"❌ [Error during processing]: {e}"
+    # ---------------------------
+    # Lottie Animation (parsed once per process / browser-cached)
+    # ---------------------------
+    if not render_lottie("animations/college.json", height=200):
+        st.warning("⚠️ Could not load animation: assets/animations/college.json")
 
     # ---------------------------
-    # Display Smart Answer
+    # Settings
     # ---------------------------
-    st.markdown("### ✅ Smart Answer")
-    if not context.strip():
-        st.warning("⚠️ No relevant information found.")
-    else:
-        st.markdown(f'<div class="smart-answer">{response}</div>', unsafe_allow_html=True)
+    with st.expander("⚙️ Settings"):
+        top_k = st.slider("📄 Number of retrieved colleges", 1, 10, 5)
+        max_tokens = st.slider("✏️ Max tokens to generate", 32, 512, 256, step=32)
+        min_cutoff = st.number_input("📝 Max KCET/COMEDK rank", min_value=1, max_value=30000, value=6000, step=500)
+        min_package = st.number_input("💰 Min Avg Package (LPA)", min_value=0.0, max_value=50.0, value=5.0, step=0.5)
 
     # ---------------------------
-    # Drill-down per college
+    # User Question Input
     # ---------------------------
     st.markdown('<hr class="fancy">', unsafe_allow_html=True)
-    st.markdown("### 📄 Retrieved Supporting Colleges (Click to expand for details)")
-    for _, row in filtered_results.iterrows():
-        cname = row['College']
-        with st.expander(f"🏫 {cname}"):
-            branch_info = drill_down_college(cname, raw_df)
-            for branch, data in branch_info.items():
-                st.markdown(f"**Branch:** {branch}")
-                st.markdown("**Cutoff Table:**")
-                st.dataframe(data["cutoff"])
-                st.markdown("**Avg Package Table:**")
-                st.dataframe(data["package"])
+    query = st.text_input("🔍 Ask your question (e.g., Best CSE colleges under 10k rank?)")
+    context = ""
+    filtered_results = pd.DataFrame()
+    query_filters = None
+
+    if query:
+        with st.spinner("🤖 Thinking..."):
+            try:
+                # ---------------------------
+                # Hybrid BM25 + FAISS search with user filters applied inside the indexes
+                # (returns top_k deduplicated College+Branch hits)
+                # ---------------------------
+                # Exam, branch, category, city, rank and package stated in the
+                # question narrow the candidates; the settings fill in the rest
+                query_filters = parse_query(query).with_defaults(max_rank=min_cutoff, min_package=min_package)
+                # Searched rows come from the metadata store aligned with the FAISS index
+                filtered_results = hybrid_search(
+                    query,
+                    model=model,
+                    top_k=top_k,
+                    filters=query_filters,
+                )
+                # One aggregate row per hit (best cutoff, packages, exams)
+                filtered_results = enrich_results(
+                    filtered_results, raw_df, max_rank=query_filters.max_rank, min_package=query_filters.min_package
+                )
+
+                # ---------------------------
+                # Build a token-budgeted summary context (one line per College+Branch)
+                # ---------------------------
+                with span("context") as info:
+                    context = build_context(filtered_results, max_tokens=max_tokens, cities=get_college_loc_map())
+                    info["bytes"] = len(context.encode("utf-8"))
+
+                # ---------------------------
+                # Generate LLM answer
+                # ---------------------------
+                if context.strip():
+                    response = None  # streamed below as tokens arrive
+                else:
+                    response = "⚠️ No relevant information found."
+
+            except Exception as e:
+                response = f"❌ [Error during processing]: {e}"
+
+        # ---------------------------
+        # Display Smart Answer
+        # ---------------------------
+        st.markdown("### ✅ Smart Answer")
+        if query_filters is not None and query_filters.describe():
+            st.caption(f"🧭 Searching with: {query_filters.describe()}")
+        if not context.strip():
+            st.warning("⚠️ No relevant information found.")
+        elif response is not None:
+            st.markdown(f'<div class="smart-answer">{response}</div>', unsafe_allow_html=True)
+        else:
+            # Stream tokens on first ask; reruns (e.g. opening an expander) reuse the answer
+            answers = st.session_state.setdefault("faq_answers", {})
+            answer_key = (query, context, max_tokens)
+            if answer_key not in answers:
+                # Paraphrases of an earlier question over the same retrieved
+                # colleges and filters reuse its answer (semantic cache)
+                answer_cache = get_answer_cache()
+                scope = answer_scope(filtered_results, filters=query_filters.describe(), max_tokens=max_tokens)
+                query_vec = model.encode([query])[0]
+                cached_answer = answer_cache.lookup(query_vec, scope)
+                count_cache("answer", hits=int(cached_answer is not None), misses=int(cached_answer is None))
+                if cached_answer is not None:
+                    remember_answer(answers, answer_key, cached_answer)
+            if answer_key not in answers:
+                # Tokens are drawn in time-batched frames (not one delta per token)
+                answer_stream = stream_answer_openrouter(query, context=context, max_tokens=max_tokens)
+                streamed = stream_to_placeholder(
+                    st.empty(),
+                    answer_stream,
+                    lambda text, typing: f'<div class="smart-answer">💡 Answer:\n{text}{"▌" if typing else ""}</div>',
+                )
+                response = f"💡 Answer:\n{streamed}"
+                # Failed or cut-off answers are shown once and asked again on the
+                # next run; only complete ones reach the cache shared by all users
+                if answer_stream.completed:
+                    remember_answer(answers, answer_key, response)
+                    answer_cache.put(query, query_vec, scope, response)
+            else:
+                st.markdown(f'<div class="smart-answer">{answers[answer_key]}</div>', unsafe_allow_html=True)
+
+        # ---------------------------
+        # Drill-down per college
+        # ---------------------------
+        st.markdown('<hr class="fancy">', unsafe_allow_html=True)
+        st.markdown("### 📄 Retrieved Supporting Colleges (Click to expand for details)")
+        for _, row in filtered_results.iterrows():
+            cname = row['College']
+            with st.expander(f"🏫 {cname}"):
+                branch_info = drill_down_college(cname, raw_df)
+                for branch, data in branch_info.items():
+                    st.markdown(f"**Branch:** {branch}")
+                    st.markdown("**Cutoff Table:**")
+                    st.dataframe(data["cutoff"])
+                    st.markdown("**Avg Package Table:**")
+                    st.dataframe(data["package"])
 
-# ---------------------------
-# Optional Plot
-# ---------------------------
-st.markdown('<hr class="fancy">', unsafe_allow_html=True)
-st.markdown("### 📊 Placement vs Fee Snapshot")
-plot_path = os.path.join(PARENT_DIR, "assets", "plots", "feevpack.png")
-if os.path.exists(plot_path):
-    st.image(Image.open(plot_path), use_container_width=True, caption="Fees vs Placements - Overview")
-else:
-    st.warning(f"⚠️ Could not find plot: {plot_path}")
+    # ---------------------------
+    # Optional Plot
+    # ---------------------------
+    st.markdown('<hr class="fancy">', unsafe_allow_html=True)
+    st.markdown("### 📊 Placement vs Fee Snapshot")
+    if not render_image("plots/feevpack.png", caption="Fees vs Placements - Overview"):
+        st.warning("⚠️ Could not find plot: assets/plots/feevpack.png")
 
-# ---------------------------
-# Footer
-# ---------------------------
-st.markdown("---")
-st.markdown("✨ Powered by OpenRouter + FAISS | Smart Counsel AI – 2025")
+    # ---------------------------
+    # Footer
+    # ---------------------------
+    st.markdown("---")
+    st.markdown("✨ Powered by OpenRouter + FAISS | Smart Counsel AI – 2025")
@@ -0,0 +1,113 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import hmac
+import os
+import sys
+from datetime import datetime
+
+# ==============================
+# Path setup for shared utils
+# ==============================
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from perf_utils.tracing import TRACE_BUFFER_SIZE, TRACE_EXPORT_FILE, TRACE_METRICS_PORT, tracer
+
+# ==============================
+# ⚙️ Page Config
+# ==============================
+st.set_page_config(page_title="📈 Latency Metrics", layout="wide", page_icon="📈")
+
+
+# ==============================
+# 🔐 Admin gate
+# ==============================
+# Not linked from the navigation; set METRICS_ADMIN_TOKEN in secrets.toml
+# (or the environment) to enable the page.
+def admin_token():
+    try:
+        token = st.secrets.get("METRICS_ADMIN_TOKEN")
+    except FileNotFoundError:
+        token = None
+    return token or os.environ.get("METRICS_ADMIN_TOKEN")
+
+
+token = admin_token()
+if not token:
+    st.error("🔒 Metrics page is disabled. Set METRICS_ADMIN_TOKEN to enable it.")
+    st.stop()
+
+if not st.session_state.get("metrics_admin"):
+    entered = st.text_input("🔑 Admin token", type="password")
+    if not entered:
+        st.stop()
+    if not hmac.compare_digest(entered, token):
+        st.error("❌ Wrong token.")
+        st.stop()
+    st.session_state["metrics_admin"] = True
+    st.rerun()
+
+# ==============================
+# 📈 Dashboard
+# ==============================
+st.title("📈 Pipeline Latency")
+st.caption(
+    f"In-process trace buffer (last {TRACE_BUFFER_SIZE:,} stage timings, all sessions), "
+    f"collecting since {datetime.fromtimestamp(tracer.started):%Y-%m-%d %H:%M:%S}."
+)
+
+windows = {"Last 5 minutes": 300, "Last hour": 3600, "Whole buffer": None}
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    window_label = st.radio("⏱️ Window", list(windows), index=2, horizontal=True)
+with col2:
+    st.button("🔄 Refresh")
+with col3:
+    if st.button("🧹 Clear buffer"):
+        tracer.clear()
+
+stats = tracer.stage_stats(windows[window_label])
+if not stats:
+    st.info("ℹ️ No timings recorded in this window yet. Use the other pages, then refresh.")
+else:
+    table = pd.DataFrame.from_dict(stats, orient="index").rename_axis("Stage").reset_index()
+    # Hot paths first: where the most wall-clock time went in the window
+    table = table.sort_values("total_ms", ascending=False)
+    table["share_%"] = (100 * table["total_ms"] / table["total_ms"].sum()).round(1)
+
+    st.markdown("### 🔥 Stages by total time")
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    fig = px.bar(
+        table.melt(id_vars="Stage", value_vars=["p50_ms", "p95_ms", "p99_ms"], var_name="Percentile", value_name="ms"),
+        x="Stage", y="ms", color="Percentile", barmode="group", title="Latency percentiles by stage",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### 🐢 Slowest recent events")
+    events = pd.DataFrame(tracer.recent(windows[window_label]), columns=["time", "page", "stage", "ms", "bytes"])
+    events["time"] = pd.to_datetime(events["time"], unit="s")
+    st.dataframe(events.nlargest(25, "ms"), use_container_width=True, hide_index=True)
+
+st.markdown("### 🗃️ Cache hit rates (since start)")
+caches = tracer.cache_stats()
+if caches:
+    st.dataframe(pd.DataFrame.from_dict(caches, orient="index").rename_axis("Cache"), use_container_width=True)
+else:
+    st.info("ℹ️ No cache lookups recorded yet.")
+
+# ==============================
+# 📤 Export
+# ==============================
+st.markdown("### 📤 Export")
+col1, col2 = st.columns(2)
+with col1:
+    st.download_button("⬇️ Prometheus text", tracer.to_prometheus(), file_name="metrics.prom", mime="text/plain")
+with col2:
+    st.download_button("⬇️ JSON", tracer.to_json(), file_name="metrics.json", mime="application/json")
+if TRACE_EXPORT_FILE:
+    st.caption(f"📝 Also written to `{TRACE_EXPORT_FILE}` periodically.")
+if TRACE_METRICS_PORT:
+    st.caption(f"🌐 Scrape endpoint: http://127.0.0.1:{TRACE_METRICS_PORT}/metrics")
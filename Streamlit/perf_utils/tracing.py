@@ -0,0 +1,368 @@
+# tracing.py
+"""
+Lightweight in-process tracing for the Streamlit pages and RAG pipeline.
+
+Stage durations, payload sizes and cache hit/miss counts go into a bounded
+ring buffer shared by every session of the process. `pages/metrics.py`
+shows them; they can also be exported as Prometheus text or JSON to a file
+(TRACE_EXPORT_FILE) or served on http://127.0.0.1:TRACE_METRICS_PORT/metrics.
+
+    with span("faiss_search") as info:
+        ...
+        info["bytes"] = len(payload)
+
+    @traced("post_filter")
+    def enrich_results(...): ...
+
+Standard library only, so importing it costs nothing on the import budget.
+"""
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+# ---------------------------
+# Settings (env vars / Streamlit root-level secrets)
+# ---------------------------
+TRACING_ENABLED = os.environ.get("TRACING", "1") != "0"
+TRACE_BUFFER_SIZE = int(os.environ.get("TRACE_BUFFER_SIZE", "20000"))
+# ".json" is written as JSON, anything else as Prometheus text
+TRACE_EXPORT_FILE = os.environ.get("TRACE_EXPORT_FILE")
+TRACE_EXPORT_INTERVAL_S = float(os.environ.get("TRACE_EXPORT_INTERVAL_S", "15"))
+TRACE_METRICS_PORT = os.environ.get("TRACE_METRICS_PORT")
+
+METRIC_PREFIX = "smart_counsel"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ---------------------------
+# Ring buffer
+# ---------------------------
+class Tracer:
+    """
+    Recent stage timings plus lifetime totals and cache counters.
+
+    Percentiles come from the buffered events (the last `size` stage
+    timings); counts, sums and cache counters cover the process lifetime,
+    as Prometheus expects counters to only grow.
+    """
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE):
+        self.events = deque(maxlen=size)  # (unix time, page, stage, ms, bytes)
+        self.totals = defaultdict(lambda: [0, 0.0, 0])  # stage -> [count, seconds, bytes]
+        self.cache_counts = defaultdict(int)  # (cache, "hit" | "miss") -> n
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def record(self, stage: str, seconds: float, nbytes: int = None, page: str = None):
+        page = page or current_page()
+        with self._lock:
+            self.events.append((time.time(), page, stage, seconds * 1000, nbytes))
+            total = self.totals[stage]
+            total[0] += 1
+            total[1] += seconds
+            total[2] += nbytes or 0
+            # Claimed under the lock so only one thread exports per interval
+            export_due = bool(TRACE_EXPORT_FILE) and time.monotonic() - self._last_export >= TRACE_EXPORT_INTERVAL_S
+            if export_due:
+                self._last_export = time.monotonic()
+        if export_due:
+            self.try_export(TRACE_EXPORT_FILE)
+
+    def count(self, cache: str, hits: int = 0, misses: int = 0):
+        with self._lock:
+            if hits:
+                self.cache_counts[(cache, "hit")] += hits
+            if misses:
+                self.cache_counts[(cache, "miss")] += misses
+
+    def recent(self, window_s: float = None) -> list:
+        """Buffered events, optionally only the last `window_s` seconds."""
+        with self._lock:
+            events = list(self.events)
+        if window_s is not None:
+            since = time.time() - window_s
+            events = [e for e in events if e[0] >= since]
+        return events
+
+    def stage_stats(self, window_s: float = None) -> dict:
+        """
+        Latency summary per stage over the buffered events.
+
+        Returns:
+            dict: {stage: {"count", "p50_ms", "p95_ms", "p99_ms", "max_ms",
+            "mean_ms", "total_ms", "bytes"}}.
+        """
+        by_stage = defaultdict(list)
+        sizes = defaultdict(int)
+        for _, _, stage, ms, nbytes in self.recent(window_s):
+            by_stage[stage].append(ms)
+            sizes[stage] += nbytes or 0
+
+        stats = {}
+        for stage, values in by_stage.items():
+            values.sort()
+            stats[stage] = {
+                "count": len(values),
+                **{f"p{int(q * 100)}_ms": round(_quantile(values, q), 3) for q in QUANTILES},
+                "max_ms": round(values[-1], 3),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "total_ms": round(sum(values), 3),
+                "bytes": sizes[stage],
+            }
+        return stats
+
+    def cache_stats(self) -> dict:
+        """{cache: {"hit": n, "miss": n, "hit_ratio": r}} over the process lifetime."""
+        with self._lock:
+            counts = dict(self.cache_counts)
+        stats = {}
+        for (cache, outcome), n in counts.items():
+            stats.setdefault(cache, {"hit": 0, "miss": 0})[outcome] = n
+        for entry in stats.values():
+            looked_up = entry["hit"] + entry["miss"]
+            entry["hit_ratio"] = round(entry["hit"] / looked_up, 4) if looked_up else None
+        return stats
+
+    # ---------------------------
+    # Export
+    # ---------------------------
+    def to_json(self) -> str:
+        with self._lock:
+            totals = {stage: {"count": c, "seconds": round(s, 6), "bytes": b} for stage, (c, s, b) in self.totals.items()}
+        return json.dumps({
+            "generated": time.time(),
+            "started": self.started,
+            "stages": self.stage_stats(),
+            "totals": totals,
+            "caches": self.cache_stats(),
+        }, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (summaries plus counters)."""
+        stats = self.stage_stats()
+        with self._lock:
+            totals = {stage: tuple(t) for stage, t in self.totals.items()}
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {name} Stage latency (quantiles over the recent trace buffer).",
+            f"# TYPE {name} summary",
+        ]
+        for stage, (count, seconds, _) in sorted(totals.items()):
+            label = _escape(stage)
+            for q in QUANTILES:
+                if stage in stats:
+                    value = stats[stage][f"p{int(q * 100)}_ms"] / 1000
+                    lines.append(f'{name}{{stage="{label}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {seconds:.6f}')
+            lines.append(f'{name}_count{{stage="{label}"}} {count}')
+
+        name = f"{METRIC_PREFIX}_stage_bytes_total"
+        lines += [f"# HELP {name} Payload bytes recorded per stage.", f"# TYPE {name} counter"]
+        lines += [f'{name}{{stage="{_escape(stage)}"}} {nbytes}' for stage, (_, _, nbytes) in sorted(totals.items())]
+
+        name = f"{METRIC_PREFIX}_cache_requests_total"
+        lines += [f"# HELP {name} Cache lookups by outcome.", f"# TYPE {name} counter"]
+        for cache, entry in sorted(self.cache_stats().items()):
+            for outcome in ("hit", "miss"):
+                lines.append(f'{name}{{cache="{_escape(cache)}",outcome="{outcome}"}} {entry[outcome]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        Write Prometheus text, or JSON for a .json path (atomically).
+
+        Each call writes its own temp file next to `path` and swaps it in,
+        so concurrent exports (threads or worker processes) never interleave.
+        """
+        path = Path(path)
+        text = self.to_json() if path.suffix == ".json" else self.to_prometheus()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def try_export(self, path) -> bool:
+        """`export` for the recording path: a failed write is reported, never raised into the traced code."""
+        try:
+            self.export(path)
+            return True
+        except Exception as e:
+            print(f"⚠️ Trace export to {path} failed: {e}")
+            return False
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.totals.clear()
+            self.cache_counts.clear()
+            self.started = time.time()
+
+
+def _quantile(sorted_values: list, q: float) -> float:
+    """Linear-interpolated quantile of an already sorted list."""
+    position = (len(sorted_values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# One buffer per process, shared by every session (Streamlit runs sessions as threads)
+tracer = Tracer()
+
+
+# ---------------------------
+# Recording API
+# ---------------------------
+_page = threading.local()
+
+
+def current_page():
+    """Page whose script run is executing on this thread (None outside pages)."""
+    return getattr(_page, "name", None)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    Time a block as `stage`. The yielded dict takes an optional "bytes"
+    entry (payload size) that is stored with the timing.
+    """
+    info = {}
+    if not TRACING_ENABLED:
+        yield info
+        return
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        tracer.record(stage, time.perf_counter() - start, info.get("bytes"))
+
+
+def traced(stage: str):
+    """Decorator form of `span` for plain (non-generator) functions."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(stage: str, seconds: float, nbytes: int = None):
+    """Record a duration measured elsewhere (e.g. time to first token)."""
+    if TRACING_ENABLED:
+        tracer.record(stage, seconds, nbytes)
+
+
+def count_cache(cache: str, hits: int = 0, misses: int = 0):
+    """Add cache hit / miss counts (e.g. per batch lookup)."""
+    if TRACING_ENABLED:
+        tracer.count(cache, hits, misses)
+
+
+class PageTrace:
+    """
+    Whole-script timing for one page run, wrapped around the page body:
+
+        with PageTrace("explorer"):
+            ...
+
+    Stages recorded inside are attributed to the page. `page.<name>` is
+    recorded however the run ends, so runs cut short by st.stop(), a
+    rerun or an exception are timed too.
+    """
+
+    def __init__(self, page: str):
+        self.page = page
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        _page.name = self.page
+        start_metrics_server()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(f"page.{self.page}", time.perf_counter() - self.start)
+        _page.name = None
+        return False
+
+
+# ---------------------------
+# Optional /metrics endpoint
+# ---------------------------
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=TRACE_METRICS_PORT):
+    """
+    Serve /metrics (Prometheus) and /metrics.json on 127.0.0.1:`port` from a
+    daemon thread, once per process. No-op when no port is configured.
+    """
+    global _server
+    if not port or _server is not None:
+        return _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body, content_type = tracer.to_json(), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, content_type = tracer.to_prometheus(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+        except OSError as e:  # e.g. another worker already holds the port
+            print(f"⚠️ Metrics endpoint not started on port {port}: {e}")
+            _server = False
+            return _server
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _server = server
+    return _server
+
+
+# ---------------------------
+# Standalone test
+# ---------------------------
+if __name__ == "__main__":
+    for ms in (3, 5, 8, 40):
+        with span("demo") as info:
+            time.sleep(ms / 1000)
+            info["bytes"] = 100
+    count_cache("demo_cache", hits=3, misses=1)
+    print(tracer.to_prometheus())
@@ -0,0 +1,59 @@
+# test_answer_cache.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from RAG_utils.answer_cache import SemanticAnswerCache, answer_scope
+
+RESULTS = pd.DataFrame({"College": ["RVCE", "BMSCE"], "Branch": ["CSE", "CSE"]})
+
+
+def unit(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SemanticAnswerCache(tmp_path / "answers.sqlite", threshold=0.9, max_entries=2)
+
+
+def test_scope_ignores_result_order_but_not_settings():
+    scope = answer_scope(RESULTS, max_rank=10000)
+    assert scope == answer_scope(RESULTS.iloc[::-1], max_rank=10000)
+    assert scope != answer_scope(RESULTS, max_rank=5000)
+    assert scope != answer_scope(RESULTS.head(1), max_rank=10000)
+
+
+def test_paraphrase_hits_and_other_queries_miss(cache):
+    scope = answer_scope(RESULTS, max_rank=10000)
+    vec = unit([1, 0, 0, 0])
+    cache.put("best CSE colleges", vec, scope, "RVCE, BMSCE")
+
+    assert cache.lookup(unit([1, 0.1, 0, 0]), scope) == "RVCE, BMSCE"
+    assert cache.lookup(unit([0, 1, 0, 0]), scope) is None
+    assert cache.lookup(vec, answer_scope(RESULTS, max_rank=5000)) is None
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    scope = answer_scope(RESULTS)
+    vectors = [unit(np.eye(4)[i]) for i in range(3)]
+    for i, vec in enumerate(vectors):
+        cache.put(f"q{i}", vec, scope, f"a{i}")
+    assert len(cache) == 2
+    assert cache.lookup(vectors[0], scope) is None
+    assert cache.lookup(vectors[2], scope) == "a2"
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite", threshold=0.9, ttl_s=-1)
+    scope = answer_scope(RESULTS)
+    cache.put("q", unit([1, 0]), scope, "a")
+    assert cache.lookup(unit([1, 0]), scope) is None
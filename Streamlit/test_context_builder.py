@@ -0,0 +1,59 @@
+# test_context_builder.py
+import os
+import sys
+
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from RAG_utils.context_builder import (
+    PROMPT_RESERVE_TOKENS,
+    build_context,
+    context_budget,
+    count_tokens,
+    summary_lines,
+)
+
+RESULTS = pd.DataFrame({
+    "College": ["RVCE", "BMSCE", "NIE"],
+    "Branch": ["COMPUTER SCIENCE AND ENGINEERING"] * 3,
+    "Exams": ["COMEDK/KCET", "KCET", "KCET"],
+    "Min_Cutoff": [312.4, 1450.0, 8000.0],
+    "Avg_Package_LPA": [11.253, 8.4, 6.0],
+    "Max_Package_LPA": [45.0, 32.5, 20.0],
+    "Total_Annual": [164009.0, 151000.0, 120000.0],
+    "NIRF_Rank": [92.0, float("nan"), 0.0],
+})
+
+
+def test_summary_lines():
+    lines = summary_lines(RESULTS, cities={"RVCE": "Bangalore"})
+    assert lines[0] == (
+        "- 🏫 RVCE (Bangalore) | COMPUTER SCIENCE AND ENGINEERING | Exams: COMEDK/KCET | Best cutoff: 312"
+        " | Avg package: 11.25 LPA | Max package: 45.0 LPA | Annual fee: ₹1.64L | NIRF: 92"
+    )
+    # No city, no NIRF (missing or 0 = not ranked)
+    assert lines[1].startswith("- 🏫 BMSCE | ")
+    assert "NIRF" not in lines[1] and "NIRF" not in lines[2]
+
+
+def test_context_keeps_retrieval_order_within_budget():
+    lines = summary_lines(RESULTS)
+    full = build_context(RESULTS)
+    assert full.splitlines() == lines.tolist()
+
+    first_two = sum(count_tokens(lines[:2])) + 2
+    tight = build_context(RESULTS, budget=first_two)
+    assert tight.splitlines() == lines[:2].tolist()
+
+
+def test_budget_reserves_answer_and_prompt():
+    assert context_budget(256, budget=1200) == 1200
+    assert context_budget(256, model="unknown/model", budget=10**6) == 8192 - 256 - PROMPT_RESERVE_TOKENS
+    assert context_budget(10**6) == 0
+
+
+def test_empty_results():
+    assert build_context(RESULTS.iloc[0:0]) == ""
@@ -0,0 +1,68 @@
+# test_drilldown.py
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from RAG_utils.rag_utils import RAW_CSV_FILE, build_drilldown_cube, drill_down_college
+
+
+def pivot_drill_down(college_name, full_df):
+    """Per-click pivot tables the cube replaced (reference implementation)."""
+    df = full_df[full_df["College"] == college_name].copy()
+    df["Cutoff_rank"] = df["Cutoff_rank"].round(0).astype(int)
+    df["Avg_Package_LPA"] = df["Avg_Package_LPA"].round(2)
+    branch_dict = {}
+    for branch, branch_df in df.groupby("Branch"):
+        branch_dict[branch] = {
+            "cutoff": branch_df.pivot_table(index="Year", columns="Exam", values="Cutoff_rank", aggfunc="min"),
+            "package": branch_df.pivot_table(index="Year", columns="Exam", values="Avg_Package_LPA", aggfunc="mean"),
+        }
+    return branch_dict
+
+
+@pytest.fixture(scope="module")
+def raw_df():
+    if not RAW_CSV_FILE.exists():
+        pytest.skip(f"{RAW_CSV_FILE} not found")
+    return pd.read_csv(RAW_CSV_FILE)
+
+
+@pytest.fixture(scope="module")
+def cube(raw_df):
+    return build_drilldown_cube(raw_df)
+
+
+def assert_same_tables(got: dict, expected: dict):
+    assert list(got) == list(expected)
+    for branch in expected:
+        for table in ("cutoff", "package"):
+            pd.testing.assert_frame_equal(got[branch][table], expected[branch][table], check_names=False)
+
+
+def test_cube_matches_pivot_tables_for_every_college(raw_df, cube):
+    for college in raw_df["College"].unique():
+        assert_same_tables(cube[college], pivot_drill_down(college, raw_df))
+
+
+def test_missing_exam_columns_and_duplicates():
+    df = pd.DataFrame({
+        "College": ["X"] * 5,
+        "Branch": ["CSE", "CSE", "CSE", "ECE", "ECE"],
+        "Year": [2023, 2023, 2024, 2023, 2024],
+        "Exam": ["KCET", "KCET", "COMEDK", "KCET", "KCET"],
+        "Cutoff_rank": [1000.4, 900.6, 2000.0, 5000.0, 5100.0],
+        "Avg_Package_LPA": [6.004, 7.0, 8.0, 5.0, 5.5],
+    })
+    assert_same_tables(build_drilldown_cube(df)["X"], pivot_drill_down("X", df))
+
+
+def test_drill_down_college_uses_the_given_frame(raw_df):
+    college = raw_df["College"].iloc[0]
+    assert_same_tables(drill_down_college(college, raw_df), pivot_drill_down(college, raw_df))
+    assert drill_down_college("No Such College", raw_df) == {}
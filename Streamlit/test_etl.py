@@ -0,0 +1,102 @@
+# test_etl.py
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from data_utils.cutoff_store import read_cutoff_csv, read_store, write_store
+from data_utils.etl import load_manifest, run_etl
+
+
+def write_source(folder, name, rows):
+    pd.DataFrame(rows, columns=["College", "Branch", "Category", "Cutoff_Rank"]).to_csv(folder / name, index=False)
+
+
+@pytest.fixture
+def layout(tmp_path):
+    sources = tmp_path / "cut_off_data"
+    sources.mkdir()
+    write_source(sources, "kcet_2023.csv", [["RVCE", "CSE", "GM", 300], ["NIE", "ECE", "2A", 9000]])
+    write_source(sources, "comedk_2024.csv", [["BMSCE", "ISE", "GM", 4200]])
+    paths = {
+        "cutoff_dir": sources,
+        "partition_dir": tmp_path / "partitions",
+        "store_file": tmp_path / "cutoffs.arrow",
+        "merged_csv": tmp_path / "merged.csv",
+    }
+    return paths
+
+
+def test_first_run_builds_every_partition(layout):
+    summary = run_etl(**layout)
+    assert sorted(summary["rebuilt"]) == ["comedk_2024.csv", "kcet_2023.csv"]
+
+    merged = read_store(layout["store_file"]).to_pandas()
+    assert len(merged) == 3
+    assert set(merged["exam"]) == {"KCET", "COMEDK"}
+    assert sorted(merged["year"].tolist()) == [2023, 2023, 2024]
+    assert len(pd.read_csv(layout["merged_csv"])) == 3
+
+
+def test_unchanged_sources_are_skipped(layout):
+    run_etl(**layout)
+    store_mtime = layout["store_file"].stat().st_mtime_ns
+
+    summary = run_etl(**layout)
+    assert summary["rebuilt"] == []
+    assert sorted(summary["unchanged"]) == ["comedk_2024.csv", "kcet_2023.csv"]
+    assert layout["store_file"].stat().st_mtime_ns == store_mtime
+
+
+def test_only_changed_and_removed_sources_are_rebuilt(layout):
+    run_etl(**layout)
+    sources = layout["cutoff_dir"]
+    write_source(sources, "kcet_2023.csv", [["RVCE", "CSE", "GM", 310]])
+    (sources / "comedk_2024.csv").unlink()
+    write_source(sources, "kcet_2024.csv", [["SIT", "MECH", "SC", 20000]])
+
+    summary = run_etl(**layout)
+    assert sorted(summary["rebuilt"]) == ["kcet_2023.csv", "kcet_2024.csv"]
+    assert summary["removed"] == ["comedk_2024.csv"]
+    assert not (layout["partition_dir"] / "comedk_2024.arrow").exists()
+
+    merged = read_store(layout["store_file"]).to_pandas()
+    assert sorted(merged["cutoff_rank"].tolist()) == [310, 20000]
+    assert set(load_manifest(layout["partition_dir"] / "manifest.json")) == {"kcet_2023.csv", "kcet_2024.csv"}
+
+
+def test_csv_skipped_by_the_app_is_refreshed_by_the_cli(layout):
+    run_etl(**layout)
+    write_source(layout["cutoff_dir"], "kcet_2023.csv", [["RVCE", "CSE", "GM", 310]])
+
+    # The app's refresh (load_cutoffs) updates the store but not the CSV
+    run_etl(**layout, write_csv=False)
+    assert 310 not in pd.read_csv(layout["merged_csv"])["cutoff_rank"].tolist()
+
+    summary = run_etl(**layout)
+    assert summary["rebuilt"] == []
+    assert sorted(pd.read_csv(layout["merged_csv"])["cutoff_rank"].tolist()) == [310, 4200]
+
+
+def test_concurrent_store_writes_do_not_collide(layout):
+    # Every worker's load_cutoffs() may refresh the store at the same time
+    df = read_cutoff_csv(layout["cutoff_dir"] / "kcet_2023.csv")
+    store_file = layout["store_file"]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: write_store(df, store_file), range(32)))
+
+    assert len(read_store(store_file)) == 2
+    assert [p.name for p in store_file.parent.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_missing_sources_raise(tmp_path):
+    (tmp_path / "empty").mkdir()
+    with pytest.raises(FileNotFoundError):
+        run_etl(cutoff_dir=tmp_path / "empty", partition_dir=tmp_path / "p", store_file=tmp_path / "s.arrow",
+                merged_csv=tmp_path / "m.csv")
@@ -0,0 +1,107 @@
+# test_explorer_index.py
+import itertools
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from data_utils.branches import BRANCH_SHORT_MAP
+from data_utils.cutoff_store import CUTOFF_DIR, normalize_cutoffs, read_cutoff_csv
+from data_utils.explorer_index import PLACEMENTS_FILE, ExplorerIndex
+
+CITIES = [None, "Bangalore", "Mysore", "Hubli", "Nowhere"]
+BRANCHES = [None, "CSE", "ISE", "Biotechnology"]
+# (min avg package, min max package, min NIRF, max NIRF); the first is the page default
+SLIDERS = [(4.0, 6.0, 1, 100), (0.0, 0.0, 1, 500), (8.5, 20.0, 50, 300)]
+COMBOS = list(itertools.product(CITIES, BRANCHES, SLIDERS))
+
+
+@pytest.fixture(scope="module")
+def data():
+    sources = [CUTOFF_DIR / "kcet_2024.csv", CUTOFF_DIR / "comedk_2024.csv"]
+    if not PLACEMENTS_FILE.exists() or not all(f.exists() for f in sources):
+        pytest.skip("placements / cutoff CSVs not found")
+    placements = pd.read_csv(PLACEMENTS_FILE)
+    cutoffs = normalize_cutoffs(pd.concat([read_cutoff_csv(f) for f in sources], ignore_index=True))
+    # Every fifth college has no city, like colleges missing from the page's map
+    colleges = sorted(set(placements["College"]) | set(cutoffs["college"]))
+    city_map = {c: CITIES[1 + i % 3] for i, c in enumerate(colleges) if i % 5}
+    return placements, cutoffs, city_map
+
+
+@pytest.fixture(scope="module")
+def index(data):
+    placements, cutoffs, city_map = data
+    return ExplorerIndex(placements, cutoffs, city_map, BRANCH_SHORT_MAP)
+
+
+def old_filter(placements, city_map, city, branch, sliders):
+    """Row-wise filtering the page did before the index (reference implementation)."""
+    min_avg, min_max, min_nirf, max_nirf = sliders
+    df = placements.rename(columns={"College": "college"})
+    df["City"] = df["college"].map(city_map)
+    df["Branch_Short"] = df["Branch"].map(BRANCH_SHORT_MAP).fillna(df["Branch"])
+    if city is not None:
+        df = df[df["City"] == city]
+    if branch is not None:
+        df = df[df["Branch_Short"] == branch]
+    df = df[(df["Avg_Package_LPA"] >= min_avg) & (df["Max_Package_LPA"] >= min_max)
+            & (df["NIRF_Rank"] >= min_nirf) & (df["NIRF_Rank"] <= max_nirf)].copy()
+
+    def add_badges(row):
+        badges = []
+        if row["NIRF_Rank"] <= 100:
+            badges.append("🥇 Top Ranked")
+        if row["Avg_Package_LPA"] >= 6:
+            badges.append("🧑‍💼 Great Placements")
+        return " | ".join(badges)
+
+    df["Highlights"] = df.apply(add_badges, axis=1) if not df.empty else pd.Series(dtype=str)
+    display = df[["college", "Branch_Short", "Avg_Package_LPA", "Max_Package_LPA", "NIRF_Rank", "City",
+                  "Highlights"]].copy()
+    for col in ("Avg_Package_LPA", "Max_Package_LPA"):
+        display[col] = display[col].apply(lambda v: f"{v:.2f} LPA")
+    return display.reset_index(drop=True)
+
+
+def old_cutoffs(cutoffs, city_map, city, branch):
+    df = cutoffs.copy()
+    df["Branch_Short"] = df["branch"].map(BRANCH_SHORT_MAP).fillna(df["branch"])
+    if city is not None:
+        df = df[df["college"].map(city_map) == city]
+    if branch is not None:
+        df = df[df["Branch_Short"] == branch]
+    return df
+
+
+@pytest.mark.parametrize("city, branch, sliders", COMBOS)
+def test_query_matches_row_filtering(data, index, city, branch, sliders):
+    placements, _, city_map = data
+    min_avg, min_max, min_nirf, max_nirf = sliders
+    rows = index.query(city=city, branch=branch, min_avg_package=min_avg, min_max_package=min_max,
+                       min_nirf=min_nirf, max_nirf=max_nirf)
+    expected = old_filter(placements, city_map, city, branch, sliders)
+    got = index.display.take(rows).reset_index(drop=True)
+    if expected.empty:
+        assert got.empty
+    else:
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("city, branch", list(itertools.product(CITIES, BRANCHES)))
+def test_cutoffs_for_matches_row_filtering(data, index, city, branch):
+    _, cutoffs, city_map = data
+    got = index.cutoffs_for(city, branch)
+    expected = old_cutoffs(cutoffs, city_map, city, branch)
+    assert got.index.tolist() == expected.index.tolist()
+    assert got["Branch_Short"].astype(str).tolist() == expected["Branch_Short"].astype(str).tolist()
+
+
+def test_branches_are_the_short_names(index):
+    assert "CSE" in index.branches
+    assert "Computer Science and Engineering" not in index.branches
@@ -0,0 +1,53 @@
+# test_import_budget.py
+import os
+import subprocess
+import sys
+
+# ---------------------------
+# Budget
+# ---------------------------
+# Importing the RAG modules must not read data files or pull in the heavy
+# ML stack; those load on first use. Streamlit is imported first so the
+# measurement only covers our own modules.
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_S = float(os.environ.get("RAG_IMPORT_BUDGET_S", "0.5"))
+HEAVY_MODULES = ["faiss", "sentence_transformers", "torch", "transformers"]
+
+PROBE = f"""
+import sys, time
+sys.path.insert(0, {CURRENT_DIR!r})
+import streamlit, pandas, numpy
+start = time.perf_counter()
+import RAG_utils.rag_utils
+import RAG_utils.embedding_utils
+elapsed = time.perf_counter() - start
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print("ELAPSED", elapsed)
+print("HEAVY", ",".join(heavy))
+"""
+
+
+def measure_import():
+    """Import the RAG modules in a fresh interpreter; return (seconds, heavy modules loaded)."""
+    stdout = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True, text=True, check=True, cwd=CURRENT_DIR,
+    ).stdout
+    fields = dict(line.split(" ", 1) for line in stdout.splitlines() if line.startswith(("ELAPSED ", "HEAVY ")))
+    elapsed = float(fields["ELAPSED"])
+    heavy = [m for m in fields["HEAVY"].split(",") if m]
+    return elapsed, heavy
+
+
+def test_rag_import_budget():
+    elapsed, heavy = measure_import()
+    assert not heavy, f"Heavy modules imported eagerly: {heavy}"
+    assert elapsed < IMPORT_BUDGET_S, f"RAG import took {elapsed:.3f}s (budget {IMPORT_BUDGET_S}s)"
+
+
+if __name__ == "__main__":
+    elapsed, heavy = measure_import()
+    print(f"⏱️ RAG_utils import: {elapsed * 1000:.1f} ms (budget {IMPORT_BUDGET_S * 1000:.0f} ms)")
+    print(f"📦 Heavy modules loaded: {heavy or 'none'}")
+    test_rag_import_budget()
+    print("✅ Import budget respected")
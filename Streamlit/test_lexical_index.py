@@ -0,0 +1,70 @@
+# test_lexical_index.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from RAG_utils.lexical_index import BM25Index, acronym, reciprocal_rank_fusion, tokenize
+
+ROWS = pd.DataFrame({
+    "College": ["RVCE", "RVCE", "BMSCE", "NIE"],
+    "Branch": ["COMPUTER SCIENCE AND ENGINEERING", "MECHANICAL ENGINEERING",
+               "COMPUTER SCIENCE AND ENGINEERING", "CIVIL ENGINEERING"],
+    "Category": ["GM", "GM", "2A", "GM"],
+    "Exam": ["KCET", "KCET", "COMEDK", "KCET"],
+    "Year": [2024, 2024, 2023, 2024],
+})
+
+
+@pytest.fixture(scope="module")
+def bm25():
+    return BM25Index(ROWS)
+
+
+def test_tokenize_and_acronym():
+    assert tokenize("Computer Science and Engineering") == ["computer", "science", "engineering"]
+    assert acronym("COMPUTER SCIENCE AND ENGINEERING") == "cse"
+    assert acronym("RVCE") == ""
+
+
+def test_search_ranks_the_most_specific_row_first(bm25):
+    scores, rows = bm25.search("RVCE CSE", k=4)
+    assert rows[0] == 0
+    assert list(scores) == sorted(scores, reverse=True)
+    assert 3 not in rows  # no term matches NIE civil
+
+
+def test_search_respects_allowed_mask_and_tie_break(bm25):
+    allowed = np.array([False, True, True, True])
+    _, rows = bm25.search("RVCE CSE", k=4, allowed=allowed)
+    assert 0 not in rows
+
+    # Rows 0 and 1 tie on "rvce"; the lower tie-break key wins
+    _, rows = bm25.search("rvce", k=1, tie_break=np.array([5, 1, 0, 0]))
+    assert list(rows) == [1]
+
+
+def test_unknown_terms_score_zero(bm25):
+    assert not bm25.scores("hogwarts").any()
+    assert len(bm25.search("hogwarts", k=3)[1]) == 0
+
+
+def test_is_structured(bm25):
+    assert bm25.is_structured("RVCE CSE GM cutoff 2024")
+    assert not bm25.is_structured("which college has the best campus life")
+    assert not bm25.is_structured("cutoff rank")
+    assert bm25.is_structured("cutoff rank", require_match=False)
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], k=60)
+    assert fused[1] == pytest.approx(1 / 61 + 1 / 62)
+    assert fused[3] == pytest.approx(1 / 63 + 1 / 61)
+    assert fused[2] == pytest.approx(1 / 62)
+    assert max(fused, key=fused.get) == 1
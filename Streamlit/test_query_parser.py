@@ -0,0 +1,99 @@
+# test_query_parser.py
+import os
+import sys
+
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from RAG_utils.query_parser import parse_query
+
+CSE = "COMPUTER SCIENCE AND ENGINEERING"
+CITIES = ["Bangalore", "Mysore"]
+
+# ---------------------------
+# Question -> expected filters
+# ---------------------------
+# (question, branches, exams, max_rank); anything not listed must stay unset
+CASES = [
+    ("Which college is best for CSE?", (CSE,), (), None),
+    ("What is the cutoff for RVCE CSE?", (CSE,), (), None),
+    ("Suggest me good colleges under 10k rank", (), (), 10000),
+    ("show me 3 colleges", (), (), None),
+    ("I got 15000 rank in KCET", (), ("KCET",), 15000),
+    ("CSE at 5000 rank", (CSE,), (), 5000),
+    ("CSE colleges under KCET rank 6000", (CSE,), ("KCET",), 6000),
+    ("Is ME or IS better at COMEDK rank 9000?", ("MECHANICAL ENGINEERING", "INFORMATION SCIENCE AND ENGINEERING"),
+     ("COMEDK",), 9000),
+    ("colleges for AI & DS", ("ARTIFICIAL INTELLIGENCE AND DATA SCIENCE",), (), None),
+]
+
+
+@pytest.mark.parametrize("question, branches, exams, max_rank", CASES)
+def test_parse_query(question, branches, exams, max_rank):
+    filters = parse_query(question, cities=CITIES)
+    assert filters.branches == branches
+    assert filters.exams == exams
+    assert filters.max_rank == max_rank
+    assert filters.min_rank is None
+    assert filters.categories == ()
+    assert filters.cities == ()
+
+
+def test_lower_case_words_are_not_branch_codes():
+    filters = parse_query("is it ok for me to pick ai or cs or ee or ds or bt", cities=CITIES)
+    assert filters.branches == ()
+    assert filters.is_empty()
+
+
+def test_package_is_not_read_as_rank():
+    filters = parse_query("CSE with 5 LPA at 8000 rank", cities=CITIES)
+    assert filters.min_package == 5
+    assert filters.max_rank == 8000
+
+
+def test_year_is_not_read_as_rank():
+    filters = parse_query("RVCE CSE 2A cutoff 2024", cities=CITIES)
+    assert filters.years == (2024,)
+    assert filters.max_rank is None
+    assert filters.categories == ("2A",)
+
+
+def test_city_alias():
+    filters = parse_query("Mechanical seats in Mysuru under rank 40000", cities=CITIES)
+    assert filters.cities == ("Mysore",)
+    assert filters.max_rank == 40000
+
+
+@pytest.mark.parametrize("question, max_rank", [
+    ("colleges under 1 lakh rank", 100000),
+    ("my rank is 1.2 lakh", 120000),
+    ("COMEDK rank under 1.5 lakh", 150000),
+    ("1 lakh rank in COMEDK", 100000),
+])
+def test_lakh_next_to_rank_is_a_rank(question, max_rank):
+    filters = parse_query(question, cities=CITIES)
+    assert filters.max_rank == max_rank
+    assert filters.min_package is None
+    assert filters.max_package is None
+
+
+@pytest.mark.parametrize("question, min_package, max_package", [
+    ("CSE with 5 lakh package", 5, None),
+    ("salary above 6 lakhs", 6, None),
+    ("under 8 lakh per annum", None, 8),
+    ("package of 7 lakh and 1 lakh rank", 7, None),
+])
+def test_lakh_with_package_words_is_a_package(question, min_package, max_package):
+    filters = parse_query(question, cities=CITIES)
+    assert filters.min_package == min_package
+    assert filters.max_package == max_package
+
+
+def test_bare_lakh_is_neither_rank_nor_package():
+    filters = parse_query("colleges under 5 lakh", cities=CITIES)
+    assert filters.max_rank is None
+    assert filters.max_package is None
+    assert filters.is_empty()
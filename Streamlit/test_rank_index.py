@@ -0,0 +1,82 @@
+# test_rank_index.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from data_utils.cutoff_store import normalize_cutoffs
+from data_utils.rank_index import RankIndex
+
+
+@pytest.fixture(scope="module")
+def cutoffs():
+    rng = np.random.default_rng(7)
+    n = 5000
+    return normalize_cutoffs(pd.DataFrame({
+        "college": rng.choice(["RVCE", "BMSCE", "NIE", "SIT"], n),
+        "branch": rng.choice(["CSE", "ISE", "ECE"], n),
+        "category": rng.choice(["GM", "2A", "SC"], n),
+        "cutoff_rank": rng.integers(100, 60000, n),
+        "exam": rng.choice(["KCET", "COMEDK"], n),
+        "year": rng.choice([2022, 2023, 2024], n),
+        "round": rng.choice(["Round 1", "Round 2"], n),
+    }))
+
+
+@pytest.fixture(scope="module")
+def index(cutoffs):
+    return RankIndex(cutoffs)
+
+
+def brute_force(df, exam=None, categories=None, branches=None, years=None, min_rank=None):
+    mask = pd.Series(True, index=df.index)
+    if exam is not None:
+        mask &= df["exam"] == exam
+    if categories:
+        mask &= df["category"].isin(categories)
+    if branches:
+        mask &= df["branch"].isin(branches)
+    if years:
+        mask &= df["year"].isin(years)
+    if min_rank is not None:
+        mask &= df["cutoff_rank"] >= min_rank
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"exam": "KCET"},
+    {"exam": "COMEDK", "categories": ["GM", "SC"], "years": [2023, 2024]},
+    {"branches": ["CSE"], "min_rank": 15000},
+    {"exam": "KCET", "categories": ["2A"], "branches": ["ISE", "ECE"], "min_rank": 59000},
+    {"exam": "NEET"},
+])
+def test_query_matches_brute_force(cutoffs, index, filters):
+    assert np.array_equal(np.sort(index.query(**filters)), brute_force(cutoffs, **filters))
+
+
+def test_spans_are_sorted_by_cutoff(cutoffs, index):
+    rows = index.query(exam="KCET", categories=["GM"], branches=["CSE"], years=[2024], rounds=["Round 1"])
+    ranks = cutoffs["cutoff_rank"].to_numpy()[rows]
+    assert np.all(np.diff(ranks) >= 0)
+
+
+def test_limit_keeps_lowest_cutoffs_per_key(cutoffs, index):
+    rows = index.query(exam="KCET", limit=2)
+    keys = cutoffs.take(rows).groupby(["category", "branch", "year", "round"], observed=True).size()
+    assert keys.max() <= 2
+
+    full = cutoffs.iloc[index.query(exam="KCET", categories="GM", branches="CSE", years=2024, rounds="Round 1")]
+    limited = cutoffs.iloc[index.query(exam="KCET", categories="GM", branches="CSE", years=2024, rounds="Round 1", limit=2)]
+    assert limited["cutoff_rank"].tolist() == sorted(full["cutoff_rank"])[:2]
+
+
+def test_reachable(cutoffs, index):
+    assert np.array_equal(np.sort(index.reachable(20000, exam="COMEDK")),
+                          brute_force(cutoffs, exam="COMEDK", min_rank=20000))
@@ -0,0 +1,44 @@
+# test_scoring.py
+import os
+import sys
+
+import numpy as np
+import pytest
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from data_utils.scoring import chance_linear, chance_ratio, score_chances
+
+CUTOFFS = [500, 5000, 14000, 15000, 17500, 30000, 99000]
+
+
+def old_ratio(rank, cutoff):
+    """Per-row predictor formula the vectorized model replaced."""
+    chance = 100 * (1 / (1 + abs(rank - cutoff) / cutoff))
+    return max(5, min(100, int(chance)))
+
+
+def old_linear(rank, cutoff, window=5000):
+    """Per-row simulator formula the vectorized model replaced."""
+    if rank <= cutoff:
+        return 100
+    return int(max(0, 100 - ((rank - cutoff) / window) * 100))
+
+
+@pytest.mark.parametrize("rank", [1, 4999, 15000, 60000])
+def test_ratio_matches_per_row_formula(rank):
+    assert chance_ratio(rank, CUTOFFS).tolist() == [old_ratio(rank, c) for c in CUTOFFS]
+
+
+@pytest.mark.parametrize("rank", [1, 4999, 15000, 60000])
+def test_linear_matches_per_row_formula(rank):
+    assert chance_linear(rank, CUTOFFS).tolist() == [old_linear(rank, c) for c in CUTOFFS]
+
+
+def test_score_chances_dispatch():
+    assert np.array_equal(score_chances(15000, CUTOFFS, model="linear", window=1000),
+                          chance_linear(15000, CUTOFFS, window=1000))
+    with pytest.raises(ValueError):
+        score_chances(15000, CUTOFFS, model="logistic")